@@ -1,3 +1,5 @@
+import json
+
 from config import settings
 from openai import OpenAI
 from models.llm_request import LLMRequest
@@ -34,3 +36,111 @@ class LLMClient:
             "latency_ms": metrics.latency_ms(),
             "model": request.model,
         }
+
+    def execute_n(self, request: LLMRequest, n: int):
+        """Draw n completions for one request in a single call via the `n` parameter.
+
+        The prompt is billed once, so this is much cheaper than n separate calls.
+        """
+        metrics = Metrics()
+
+        response = self.client.chat.completions.create(
+            model=request.model,
+            messages=[
+                {"role": "system", "content": request.system_prompt},
+                {"role": "user", "content": request.user_prompt},
+            ],
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            n=n,
+        )
+
+        metrics.stop()
+
+        return {
+            "outputs": [choice.message.content for choice in response.choices],
+            "usage": response.usage,
+            "latency_ms": metrics.latency_ms(),
+            "model": request.model,
+        }
+
+    def chat(
+        self,
+        messages: list,
+        tools: list | None = None,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+    ):
+        """One turn of a conversation with native tool calling.
+
+        `messages` is the full history in chat format and `tools` a list of
+        function definitions (JSON schemas). The model may answer, or request one
+        or more tool calls in the same turn; each call's `arguments` are parsed
+        from JSON, or None if the model produced invalid JSON. Append `message`
+        to the history, then one {"role": "tool"} message per call.
+        """
+        metrics = Metrics()
+
+        kwargs = {"tools": tools} if tools else {}
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+        metrics.stop()
+
+        message = response.choices[0].message
+        tool_calls = []
+        for call in message.tool_calls or []:
+            try:
+                arguments = json.loads(call.function.arguments or "{}")
+            except json.JSONDecodeError:
+                arguments = None
+            tool_calls.append({"id": call.id, "name": call.function.name, "arguments": arguments})
+
+        history_entry = {"role": "assistant", "content": message.content}
+        if message.tool_calls:
+            history_entry["tool_calls"] = [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {"name": call.function.name, "arguments": call.function.arguments},
+                }
+                for call in message.tool_calls
+            ]
+
+        return {
+            "output": message.content,
+            "tool_calls": tool_calls,
+            "message": history_entry,
+            "usage": response.usage,
+            "latency_ms": metrics.latency_ms(),
+            "model": model,
+        }
+
+    def stream(self, request: LLMRequest):
+        """Yield the completion text chunk by chunk as it is generated.
+
+        Closing the generator closes the HTTP stream, which cancels generation
+        upstream; guards use this to stop paying for tokens they will discard.
+        """
+        response = self.client.chat.completions.create(
+            model=request.model,
+            messages=[
+                {"role": "system", "content": request.system_prompt},
+                {"role": "user", "content": request.user_prompt},
+            ],
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            stream=True,
+        )
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
@@ -166,3 +166,97 @@ class TestLLMClient:
 
         # Verify API was called 3 times
         assert mock_client_instance.chat.completions.create.call_count == 3
+
+    @patch("client.llm_client.OpenAI")
+    def test_execute_n_returns_every_choice(self, mock_openai_class, mock_openai_response):
+        """Test that execute_n requests n choices in one call and returns all of them."""
+        mock_openai_response.choices = [
+            MagicMock(message=MagicMock(content=f"Sample {i}")) for i in range(3)
+        ]
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.completions.create.return_value = mock_openai_response
+        mock_openai_class.return_value = mock_client_instance
+
+        client = LLMClient()
+        result = client.execute_n(LLMRequest(system_prompt="Test", user_prompt="Test"), n=3)
+
+        mock_client_instance.chat.completions.create.assert_called_once()
+        assert mock_client_instance.chat.completions.create.call_args.kwargs["n"] == 3
+        assert result["outputs"] == ["Sample 0", "Sample 1", "Sample 2"]
+        assert result["usage"].total_tokens == 70
+
+    @patch("client.llm_client.OpenAI")
+    def test_chat_passes_tools_and_parses_parallel_tool_calls(
+        self, mock_openai_class, mock_openai_response
+    ):
+        """Test that chat sends tool schemas and returns every requested tool call."""
+        calls = [
+            MagicMock(id="call_1", function=MagicMock(arguments='{"expression": "6*7"}')),
+            MagicMock(id="call_2", function=MagicMock(arguments="{not json")),
+        ]
+        calls[0].function.name = "calculator"
+        calls[1].function.name = "knowledge_base"
+        mock_openai_response.choices = [
+            MagicMock(message=MagicMock(content=None, tool_calls=calls))
+        ]
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.completions.create.return_value = mock_openai_response
+        mock_openai_class.return_value = mock_client_instance
+        tools = [{"type": "function", "function": {"name": "calculator", "parameters": {}}}]
+        messages = [{"role": "user", "content": "What is 6*7?"}]
+
+        client = LLMClient()
+        result = client.chat(messages, tools=tools)
+
+        call_args = mock_client_instance.chat.completions.create.call_args
+        assert call_args.kwargs["tools"] == tools
+        assert call_args.kwargs["messages"] == messages
+        assert result["output"] is None
+        assert result["tool_calls"] == [
+            {"id": "call_1", "name": "calculator", "arguments": {"expression": "6*7"}},
+            {"id": "call_2", "name": "knowledge_base", "arguments": None},
+        ]
+        assert result["message"]["role"] == "assistant"
+        assert [call["id"] for call in result["message"]["tool_calls"]] == ["call_1", "call_2"]
+        assert result["message"]["tool_calls"][0]["function"]["arguments"] == (
+            '{"expression": "6*7"}'
+        )
+
+    @patch("client.llm_client.OpenAI")
+    def test_chat_final_answer_has_no_tool_calls(self, mock_openai_class, mock_openai_response):
+        """Test that a plain answer comes back as output with no tool calls."""
+        mock_openai_response.choices = [MagicMock(message=MagicMock(content="42", tool_calls=None))]
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.completions.create.return_value = mock_openai_response
+        mock_openai_class.return_value = mock_client_instance
+
+        client = LLMClient()
+        result = client.chat([{"role": "user", "content": "What is 6*7?"}])
+
+        assert "tools" not in mock_client_instance.chat.completions.create.call_args.kwargs
+        assert result["output"] == "42"
+        assert result["tool_calls"] == []
+        assert result["message"] == {"role": "assistant", "content": "42"}
+
+    @patch("client.llm_client.OpenAI")
+    def test_stream_yields_deltas_and_closes_on_early_exit(self, mock_openai_class):
+        """Test that stream yields text deltas and closing it closes the HTTP stream."""
+        chunks = [
+            MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+            for text in ["Hel", None, "lo", " world"]
+        ]
+        response = MagicMock()
+        response.__iter__.return_value = iter(chunks)
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.completions.create.return_value = response
+        mock_openai_class.return_value = mock_client_instance
+
+        client = LLMClient()
+        stream = client.stream(LLMRequest(system_prompt="Test", user_prompt="Test"))
+
+        assert next(stream) == "Hel"
+        assert next(stream) == "lo"
+        stream.close()
+
+        assert mock_client_instance.chat.completions.create.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
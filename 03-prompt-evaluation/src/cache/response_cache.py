@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from store.results_store import json_default
+
+
+class ResponseCache:
+    """Content-addressed LLM response cache on a (possibly shared) directory.
+
+    Entries are keyed by a hash of the full request, written to a temp file and
+    renamed into place, so many worker processes or hosts on a shared
+    filesystem can read and fill the same cache without locking.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(request) -> str:
+        payload = json.dumps(asdict(request), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, response: dict):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(response, f, default=json_default)
+        os.replace(tmp_path, path)
+
+
+class CachingClient:
+    """Wraps an LLM client so identical requests are only paid for once.
+
+    Note that sampled (temperature > 0) requests also replay the first stored
+    sample; point at a fresh cache_dir to draw new samples.
+    """
+
+    def __init__(self, client, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def execute(self, request):
+        key = self.cache.key(request)
+        cached = self.cache.get(key)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return {**cached, "cached": True}
+        response = self.client.execute(request)
+        self.cache.put(key, response)
+        return response
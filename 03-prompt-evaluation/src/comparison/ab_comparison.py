@@ -0,0 +1,244 @@
+import math
+import random
+import statistics
+from dataclasses import dataclass, field
+
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def percentile(values, q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def bootstrap_ci(values, stat=statistics.fmean, n_resamples=2000, confidence=0.95, seed=0):
+    """Percentile bootstrap confidence interval for `stat` over `values`."""
+    if not values:
+        return float("nan"), float("nan")
+    if len(values) == 1:
+        return values[0], values[0]
+    rng = random.Random(seed)
+    estimates = sorted(stat(rng.choices(values, k=len(values))) for _ in range(n_resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def usage_value(usage, name: str) -> float:
+    # Live runs carry OpenAI usage objects, stored/mocked runs carry dicts
+    if usage is None:
+        return 0.0
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return float(value or 0)
+
+
+def describe(values, n_resamples=2000, confidence=0.95) -> dict:
+    low, high = bootstrap_ci(values, n_resamples=n_resamples, confidence=confidence)
+    return {
+        "mean": statistics.fmean(values) if values else float("nan"),
+        "ci": (low, high),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+    }
+
+
+def histogram(values, bins: int = 10) -> list:
+    """Equal-width bucket counts over [min, max] as (bucket_start, count) pairs."""
+    if not values:
+        return []
+    low, high = min(values), max(values)
+    width = (high - low) / bins or 1.0
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return [(low + i * width, count) for i, count in enumerate(counts)]
+
+
+def summarize_version(outputs, scores=None, n_resamples=2000, confidence=0.95) -> dict:
+    latencies = [float(output["latency_ms"]) for output in outputs]
+    summary = {
+        "n": len(outputs),
+        "latency_ms": describe(latencies, n_resamples, confidence),
+        "tokens": {
+            name: describe(
+                [usage_value(output.get("usage"), name) for output in outputs],
+                n_resamples,
+                confidence,
+            )
+            for name in USAGE_FIELDS
+        },
+    }
+    if scores is not None:
+        summary["score"] = describe(scores, n_resamples, confidence)
+        summary["score"]["histogram"] = histogram(scores)
+    return summary
+
+
+def compare_versions(result: dict, dataset=None, score_fn=None, baseline=None, **kwargs) -> dict:
+    """Per-version summaries plus paired score differences against `baseline`.
+
+    `result` is the runner's {version: [outputs]} shape. `score_fn(case, output)`
+    returns a float where higher is better; without it only latency and token
+    usage are compared.
+    """
+    versions = list(result)
+    baseline = baseline or versions[0]
+    cases = list(dataset["cases"]) if dataset is not None else None
+    scores = {}
+    if score_fn is not None:
+        scores = {
+            version: [score_fn(case, output) for case, output in zip(cases, outputs)]
+            for version, outputs in result.items()
+        }
+    report = {
+        "baseline": baseline,
+        "versions": {
+            version: summarize_version(outputs, scores.get(version), **kwargs)
+            for version, outputs in result.items()
+        },
+        "differences": {},
+    }
+    for version in versions:
+        if version == baseline or not scores:
+            continue
+        diffs = [c - b for b, c in zip(scores[baseline], scores[version])]
+        report["differences"][version] = describe(diffs, **kwargs)
+    return report
+
+
+@dataclass
+class SequentialResult:
+    decision: str
+    baseline: str
+    candidate: str
+    cases_used: int
+    total_cases: int
+    mean_difference: float
+    ci: tuple
+    looks: int
+    differences: list = field(default_factory=list, repr=False)
+
+    @property
+    def calls_saved(self) -> int:
+        return 2 * (self.total_cases - self.cases_used)
+
+
+class SequentialComparison:
+    """Paired A/B test that stops drawing cases once the answer is clear.
+
+    Cases are evaluated in batches against both versions. After each batch the
+    paired score difference (candidate - baseline) gets a bootstrap CI:
+      - CI entirely above 0            -> "candidate_better"
+      - CI entirely below 0            -> "baseline_better"
+      - CI inside [-margin, +margin]   -> "equivalent"
+    Each look uses alpha / planned_looks (Bonferroni), so peeking after every
+    batch does not inflate the overall false-positive rate.
+    """
+
+    def __init__(
+        self,
+        runner,
+        score_fn,
+        alpha: float = 0.05,
+        margin: float = 0.05,
+        batch_size: int = 20,
+        min_cases: int = 20,
+        n_resamples: int = 2000,
+        seed: int = 0,
+    ):
+        self.runner = runner
+        self.score_fn = score_fn
+        self.alpha = alpha
+        self.margin = margin
+        self.batch_size = max(1, batch_size)
+        self.min_cases = min_cases
+        self.n_resamples = n_resamples
+        self.seed = seed
+
+    def run(self, prompt_name: str, baseline: str, candidate: str, dataset) -> SequentialResult:
+        cases = list(dataset["cases"])
+        # Shuffle so an early stop is not biased by how the dataset happens to be sorted
+        random.Random(self.seed).shuffle(cases)
+        planned_looks = max(1, math.ceil(len(cases) / self.batch_size))
+        confidence = 1 - self.alpha / planned_looks
+        differences = []
+        decision, ci, looks = "inconclusive", (float("nan"), float("nan")), 0
+
+        for start in range(0, len(cases), self.batch_size):
+            batch = cases[start : start + self.batch_size]
+            outputs = {baseline: [None] * len(batch), candidate: [None] * len(batch)}
+            for version, index, output in self.runner.iter_results(
+                prompt_name, [baseline, candidate], batch
+            ):
+                outputs[version][index] = output
+            for case, base, cand in zip(batch, outputs[baseline], outputs[candidate]):
+                differences.append(self.score_fn(case, cand) - self.score_fn(case, base))
+
+            if len(differences) < self.min_cases and start + self.batch_size < len(cases):
+                continue
+            looks += 1
+            ci = bootstrap_ci(
+                differences,
+                n_resamples=self.n_resamples,
+                confidence=confidence,
+                seed=self.seed + looks,
+            )
+            decision = self._decide(ci)
+            if decision != "inconclusive":
+                break
+
+        return SequentialResult(
+            decision=decision,
+            baseline=baseline,
+            candidate=candidate,
+            cases_used=len(differences),
+            total_cases=len(cases),
+            mean_difference=statistics.fmean(differences) if differences else float("nan"),
+            ci=ci,
+            looks=looks,
+            differences=differences,
+        )
+
+    def _decide(self, ci) -> str:
+        low, high = ci
+        if low > 0:
+            return "candidate_better"
+        if high < 0:
+            return "baseline_better"
+        if -self.margin <= low and high <= self.margin:
+            return "equivalent"
+        return "inconclusive"
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    for version, summary in report["versions"].items():
+        latency = summary["latency_ms"]
+        tokens = summary["tokens"]["total_tokens"]
+        lines.append(f"{version} (n={summary['n']})")
+        lines.append(
+            f"  latency_ms p50={latency['p50']:.1f} p90={latency['p90']:.1f} "
+            f"p99={latency['p99']:.1f} mean={latency['mean']:.1f} "
+            f"CI=[{latency['ci'][0]:.1f}, {latency['ci'][1]:.1f}]"
+        )
+        lines.append(
+            f"  total_tokens mean={tokens['mean']:.1f} "
+            f"CI=[{tokens['ci'][0]:.1f}, {tokens['ci'][1]:.1f}]"
+        )
+        if "score" in summary:
+            score = summary["score"]
+            lines.append(
+                f"  score mean={score['mean']:.3f} "
+                f"CI=[{score['ci'][0]:.3f}, {score['ci'][1]:.3f}]"
+            )
+    for version, diff in report["differences"].items():
+        lines.append(
+            f"{version} - {report['baseline']}: mean={diff['mean']:+.3f} "
+            f"CI=[{diff['ci'][0]:+.3f}, {diff['ci'][1]:+.3f}]"
+        )
+    return "\n".join(lines)
@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     openai_api_key: str
     prompt_registry_path: str = "prompts"
     dataset_path: str = "datasets"
+    max_concurrency: int = 8
+    results_path: str = "results"
+    cache_path: str = ".cache/responses"
 
     model_config = SettingsConfigDict(
         # Search for .env in project dir, then parent dir (like load_env)
@@ -1,14 +1,27 @@
-import yaml
+import argparse
+
 from client.llm_client import LLMClient
 from pathlib import Path
 
+from common.dataset_loader import Dataset
+
 from registry.prompt_registry import PromptRegistry
 from renderer.prompt_renderer import PromptRenderer
 from runner.evaluation_runner import EvaluationRunner
+from store.results_store import ResultsStore
+from runner.matrix_runner import MatrixRunner, cheapest_meeting, format_table, write_table
+from runner.sharded_runner import MERGED_DIR, ShardedEvaluation, merge_partitions, run_shard
+from comparison.ab_comparison import SequentialComparison, compare_versions, format_report
+from scoring.trait_scorer import TraitScorer, pass_rates
+from scoring.llm_judge import LLMJudgeScorer
 
 # Pydantic settings auto-loads .env
 from config import settings
 
+PROMPT_NAME = "cap_theorem_explainer"
+VERSIONS = ["v1", "v2"]
+REGISTRY_PATH = "../02-prompt-registry/prompts"
+
 
 def console(result):
     for version, outputs in result.items():
@@ -18,11 +31,182 @@ def console(result):
             print(output["latency_ms"])
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evaluate prompt versions against a dataset")
+    parser.add_argument(
+        "--run-dir",
+        help=f"stream results into an append-only store (e.g. {settings.results_path}/run-1)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip (version, case) pairs already stored in --run-dir",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="print latency/token percentiles with bootstrap confidence intervals",
+    )
+    parser.add_argument(
+        "--score",
+        action="store_true",
+        help="score outputs against each case's expected_traits",
+    )
+    parser.add_argument(
+        "--judge",
+        action="store_true",
+        help="send traits without a deterministic rule to a batched LLM judge",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="A/B test v1 vs v2 on trait scores, stopping once the result is significant",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        help="evaluate a deterministic fraction of the dataset, e.g. 0.1",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --sample")
+    parser.add_argument("--limit", type=int, help="evaluate at most N cases")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        help="split the dataset into N shards, one worker process each (needs --run-dir)",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        help="run only this shard of --num-shards, e.g. one per host (needs --run-dir)",
+    )
+    parser.add_argument("--num-shards", type=int, help="total shards for --shard-index")
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="merge the shard partitions under --run-dir into one report",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="sweep versions x --models x --temperatures x --max-tokens concurrently",
+    )
+    parser.add_argument("--models", nargs="+", default=[None], help="models for --matrix")
+    parser.add_argument(
+        "--temperatures", nargs="+", type=float, default=[None], help="temperatures for --matrix"
+    )
+    parser.add_argument(
+        "--max-tokens", nargs="+", type=int, default=[None], help="max_tokens for --matrix"
+    )
+    parser.add_argument(
+        "--quality-bar",
+        type=float,
+        default=1.0,
+        help="report the cheapest --matrix cell whose mean trait score reaches this",
+    )
+    parser.add_argument("--table", help="write the --matrix results table to this CSV file")
+    parser.add_argument(
+        "--cache-dir",
+        default=settings.cache_path,
+        help="response cache shared by shards; identical requests are replayed for free",
+    )
+    args = parser.parse_args()
+    for flag, used in (
+        ("--shards", args.shards),
+        ("--shard-index", args.shard_index is not None),
+        ("--merge", args.merge),
+    ):
+        if used and not args.run_dir:
+            parser.error(f"{flag} needs --run-dir")
+    if args.shard_index is not None and not args.num_shards:
+        parser.error("--shard-index needs --num-shards")
+    return args
+
+
+def console_scores(scorer, result, dataset):
+    for version, rates in pass_rates(scorer.score_results(result, dataset)).items():
+        print(f"Trait pass rates for {version}")
+        for trait, rate in rates.items():
+            print(f"  {trait}: {rate:.0%}")
+
+
 if __name__ == "__main__":
-    with open("datasets/cap_theorem.yaml", "r") as f:
-        dataset = yaml.safe_load(f)
-    registry = PromptRegistry(registry_path="../02-prompt-registry/prompts")
+    args = parse_args()
+    dataset = Dataset(Path(settings.dataset_path) / "cap_theorem.yaml")
+    if args.sample:
+        dataset = dataset.sample(args.sample, seed=args.seed)
+    if args.limit:
+        dataset = dataset.take(args.limit)
+    registry = PromptRegistry(registry_path=REGISTRY_PATH)
     renderer = PromptRenderer(registry)
-    runner = EvaluationRunner(registry, renderer)
-    result = runner.run(prompt_name="cap_theorem_explainer", versions=["v1", "v2"], dataset=dataset)
-    console(result)
+    runner = EvaluationRunner(registry, renderer, max_concurrency=settings.max_concurrency)
+    judge = LLMJudgeScorer(runner.llm_client) if args.judge else None
+    scorer = TraitScorer.from_dataset(dataset, judge=judge)
+    result = None
+    if args.sequential:
+        outcome = SequentialComparison(runner, scorer.case_score).run(
+            PROMPT_NAME, "v1", "v2", dataset
+        )
+        print(
+            f"{outcome.decision}: v2 - v1 = {outcome.mean_difference:+.3f} "
+            f"CI=[{outcome.ci[0]:+.3f}, {outcome.ci[1]:+.3f}] after {outcome.cases_used}/"
+            f"{outcome.total_cases} cases ({outcome.calls_saved} calls saved)"
+        )
+    elif args.matrix:
+        matrix = MatrixRunner(runner, scorer=scorer)
+        cells = matrix.cells(VERSIONS, args.models, args.temperatures, args.max_tokens)
+        rows = matrix.run(PROMPT_NAME, dataset, cells)
+        print(format_table(rows))
+        if args.table:
+            write_table(rows, args.table)
+        best = cheapest_meeting(rows, args.quality_bar)
+        if best is None:
+            print(f"No cell reaches quality {args.quality_bar}")
+        else:
+            print(
+                f"Cheapest at quality >= {args.quality_bar}: {best['version']} {best['model']} "
+                f"temperature={best['temperature']} max_tokens={best['max_tokens']}"
+            )
+    elif args.shard_index is not None:
+        manifest = run_shard(
+            args.shard_index,
+            args.num_shards,
+            PROMPT_NAME,
+            VERSIONS,
+            dataset,
+            args.run_dir,
+            REGISTRY_PATH,
+            cache_dir=args.cache_dir,
+            resume=args.resume,
+            max_concurrency=settings.max_concurrency,
+            client=runner.llm_client,
+        )
+        print(f"Shard {args.shard_index}/{args.num_shards}: {manifest['completed']} results")
+    elif args.shards or args.merge:
+        if args.shards:
+            sharded = ShardedEvaluation(
+                REGISTRY_PATH, args.shards, args.cache_dir, settings.max_concurrency
+            )
+            manifest = sharded.run(PROMPT_NAME, VERSIONS, dataset, args.run_dir, args.resume)
+        else:
+            manifest = merge_partitions(args.run_dir)
+        print(f"Merged {manifest['num_shards']} shards: {manifest['completed']} results")
+        result = ResultsStore(f"{args.run_dir}/{MERGED_DIR}").load_results()
+    elif args.run_dir:
+        store = ResultsStore(args.run_dir)
+        manifest = runner.run_to_store(
+            prompt_name=PROMPT_NAME,
+            versions=VERSIONS,
+            dataset=dataset,
+            store=store,
+            resume=args.resume,
+        )
+        print(f"Run {manifest['run_id']}: {manifest['completed']} results in {store.results_path}")
+        result = store.load_results()
+    else:
+        result = runner.run(prompt_name=PROMPT_NAME, versions=VERSIONS, dataset=dataset)
+        console(result)
+    if result is not None and args.score:
+        console_scores(scorer, result, dataset)
+    if result is not None and args.compare:
+        score_fn = scorer.case_score if args.score else None
+        print(format_report(compare_versions(result, dataset, score_fn=score_fn)))
@@ -1,28 +1,176 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from models.llm_request import LLMRequest
 from client.llm_client import LLMClient
 
 
+def case_id(case: dict, index: int) -> str:
+    """Stable identity of a dataset case; falls back to its position."""
+    return str(case.get("id", index))
+
+
 class EvaluationRunner:
-    def __init__(self, registry, renderer, client: LLMClient = None):
+    def __init__(
+        self,
+        registry,
+        renderer,
+        client: LLMClient = None,
+        max_concurrency: int = 8,
+        version_concurrency: dict | None = None,
+    ):
 
         self.llm_client = client if client is not None else LLMClient()
         self.registry = registry
         self.renderer = renderer
+        # Upper bound on in-flight LLM calls across the whole versions x cases matrix
+        self.max_concurrency = max(1, max_concurrency)
+        # Optional per-version cap, e.g. {"v2": 2} to keep a candidate from hogging the pool
+        self.version_concurrency = version_concurrency or {}
 
     def run(self, prompt_name: str, versions, dataset):
-        result = {}
-        for version in versions:
-            prompt = self.registry.load(prompt_name, version)
-            version_result = []
-            for case in dataset["cases"]:
-                user_prompt = self.renderer.render(prompt.get("user_prompt"), case["input"])
-                request = LLMRequest(
-                    system_prompt=prompt.get("system_prompt"),
-                    user_prompt=user_prompt,
-                    temperature=prompt.get("temperature"),
-                    max_tokens=prompt.get("max_tokens"),
-                )
-                output = self.llm_client.execute(request)
-                version_result.append(output)
-            result[version] = version_result
+        cases = list(dataset["cases"])
+        result = {version: [None] * len(cases) for version in versions}
+        for version, index, output in self.iter_results(prompt_name, versions, cases):
+            result[version][index] = output
         return result
+
+    def iter_results(self, prompt_name: str, versions, cases):
+        """Yield (version, case_index, output) as each cell of the matrix completes.
+
+        Completion order is not deterministic; callers re-key by case_index.
+        """
+        queues = {version: self._version_tasks(prompt_name, version, cases) for version in versions}
+        for (version, (index, _)), output in self.dispatch(queues):
+            yield version, index, output
+
+    def run_to_store(
+        self,
+        prompt_name: str,
+        versions,
+        dataset,
+        store,
+        resume: bool = False,
+        case_filter=None,
+        metadata: dict | None = None,
+    ):
+        """Stream results into a ResultsStore as each case finishes.
+
+        With resume=True, (version, case_id) pairs already in the store are skipped.
+        `case_filter(case_id)` restricts the run to a subset, e.g. one shard, and
+        `metadata` is recorded in the run manifest.
+        Nothing is accumulated in memory; returns the final run manifest.
+        """
+        cases = dataset["cases"]
+        done = store.completed() if resume else set()
+        selected = sum(
+            1
+            for index, case in enumerate(cases)
+            if case_filter is None or case_filter(case_id(case, index))
+        )
+        store.start(
+            prompt_name,
+            versions,
+            dataset_name=dataset.get("task", ""),
+            total_cases=selected,
+            resume=resume,
+            metadata=metadata,
+        )
+        queues = {
+            version: self._version_tasks(
+                prompt_name,
+                version,
+                cases,
+                skip={case_id for done_version, case_id in done if done_version == version},
+                case_filter=case_filter,
+            )
+            for version in versions
+        }
+        status = "failed"
+        try:
+            for (version, (index, identity)), output in self.dispatch(queues):
+                store.append(
+                    {"version": version, "case_id": identity, "case_index": index, **output}
+                )
+            status = "complete"
+        finally:
+            manifest = store.finish(status)
+        return manifest
+
+    def build_request(
+        self, prompt: dict, case: dict, model=None, temperature=None, max_tokens=None
+    ) -> LLMRequest:
+        """Render a case into a request; explicit arguments override the prompt's settings."""
+        # Registry prompts nest sampling settings under `model-defaults`; top-level keys win
+        defaults = prompt.get("model-defaults") or {}
+        params = {
+            "model": model if model is not None else prompt.get("model", defaults.get("model")),
+            "temperature": (
+                temperature
+                if temperature is not None
+                else prompt.get("temperature", defaults.get("temperature"))
+            ),
+            "max_tokens": (
+                max_tokens
+                if max_tokens is not None
+                else prompt.get("max_tokens", defaults.get("max_tokens"))
+            ),
+        }
+        user_prompt = self.renderer.render(prompt.get("user_prompt"), case["input"])
+        return LLMRequest(
+            system_prompt=prompt.get("system_prompt"),
+            user_prompt=user_prompt,
+            # Unset values fall back to LLMRequest defaults instead of sending null
+            **{name: value for name, value in params.items() if value is not None},
+        )
+
+    def _version_tasks(
+        self, prompt_name: str, version: str, cases, skip=frozenset(), case_filter=None
+    ):
+        prompt = self.registry.load(prompt_name, version)
+        for index, case in enumerate(cases):
+            identity = case_id(case, index)
+            if identity in skip or (case_filter is not None and not case_filter(identity)):
+                continue
+            yield (index, identity), self.build_request(prompt, case)
+
+    def _limit(self, group) -> int:
+        limit = self.version_concurrency.get(group, self.max_concurrency)
+        return max(1, min(self.max_concurrency, limit))
+
+    def dispatch(self, queues: dict):
+        """Run queued (task_id, request) pairs with bounded concurrency.
+
+        `queues` maps a group key (a version) to an iterator of tasks. Groups are
+        drained round-robin so every group makes progress, and tasks are pulled
+        lazily so at most `max_concurrency` requests exist at any time.
+        Yields ((group, task_id), output) in completion order.
+        """
+        in_flight = dict.fromkeys(queues, 0)
+        active = list(queues)
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while active or pending:
+                submitted = True
+                while submitted and active and len(pending) < self.max_concurrency:
+                    submitted = False
+                    for group in list(active):
+                        if len(pending) >= self.max_concurrency:
+                            break
+                        if in_flight[group] >= self._limit(group):
+                            continue
+                        task = next(queues[group], None)
+                        if task is None:
+                            active.remove(group)
+                            continue
+                        task_id, request = task
+                        future = pool.submit(self.llm_client.execute, request)
+                        pending[future] = (group, task_id)
+                        in_flight[group] += 1
+                        submitted = True
+                if not pending:
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group, task_id = pending.pop(future)
+                    in_flight[group] -= 1
+                    yield (group, task_id), future.result()
@@ -0,0 +1,194 @@
+import csv
+import itertools
+from dataclasses import dataclass
+
+from comparison.ab_comparison import percentile, usage_value
+
+# USD per 1M tokens (input, output); unknown models report no cost
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+TABLE_COLUMNS = [
+    "version",
+    "model",
+    "temperature",
+    "max_tokens",
+    "cases",
+    "deduplicated",
+    "latency_p50_ms",
+    "latency_p95_ms",
+    "mean_prompt_tokens",
+    "mean_completion_tokens",
+    "cost_usd",
+    "cost_per_case_usd",
+    "quality",
+]
+
+
+@dataclass(frozen=True)
+class MatrixCell:
+    """One grid point; None means "use the prompt file's setting"."""
+
+    version: str
+    model: str | None = None
+    temperature: float | None = None
+    max_tokens: int | None = None
+
+
+def request_key(request) -> tuple:
+    return (
+        request.system_prompt,
+        request.user_prompt,
+        request.model,
+        request.temperature,
+        request.max_tokens,
+    )
+
+
+class MatrixRunner:
+    """Sweeps version x model x temperature x max_tokens in one concurrent pass.
+
+    Every (cell, case) request goes through the EvaluationRunner's scheduler, so
+    concurrency limits (including per-version caps) apply to the whole grid.
+    Cells that resolve to an identical request for a case - duplicate grid
+    values, or versions with the same prompt - are executed once and shared.
+    The result is a tidy table: one row per cell with latency, tokens, cost and
+    mean trait score.
+    """
+
+    def __init__(self, runner, scorer=None, pricing: dict | None = None):
+        self.runner = runner
+        self.scorer = scorer
+        self.pricing = MODEL_PRICING if pricing is None else pricing
+
+    @staticmethod
+    def cells(versions, models=(None,), temperatures=(None,), max_tokens=(None,)) -> list:
+        return [
+            MatrixCell(*values)
+            for values in itertools.product(versions, models, temperatures, max_tokens)
+        ]
+
+    def run(self, prompt_name: str, dataset, cells) -> list:
+        cells = list(dict.fromkeys(cells))
+        cases = list(dataset["cases"])
+        prompts = {}
+        subscribers = {}  # request key -> [(cell, case_index)]
+        queues = {}
+        for cell in cells:
+            if cell.version not in prompts:
+                prompts[cell.version] = self.runner.registry.load(prompt_name, cell.version)
+            for index, case in enumerate(cases):
+                request = self.runner.build_request(
+                    prompts[cell.version], case, cell.model, cell.temperature, cell.max_tokens
+                )
+                key = request_key(request)
+                if key in subscribers:
+                    subscribers[key].append((cell, index))
+                    continue
+                subscribers[key] = [(cell, index)]
+                queues.setdefault(cell.version, []).append((key, request))
+
+        stats = {cell: _CellStats() for cell in cells}
+        for (_, key), output in self.runner.dispatch(
+            {version: iter(tasks) for version, tasks in queues.items()}
+        ):
+            # Cells sharing a request share its output, so score it once per case:
+            # with an LLM judge, every score is a paid call
+            scores = {}
+            for position, (cell, index) in enumerate(subscribers[key]):
+                if index not in scores:
+                    scores[index] = self._quality(cases[index], output)
+                stats[cell].add(output, scores[index], position > 0)
+        return [self._row(cell, stats[cell]) for cell in cells]
+
+    def _quality(self, case, output):
+        if self.scorer is None or not case.get("expected_traits"):
+            return None
+        return self.scorer.case_score(case, output)
+
+    def _row(self, cell: MatrixCell, stats: "_CellStats") -> dict:
+        model = cell.model or (stats.models[0] if stats.models else None)
+        price = self.pricing.get(model)
+        cost = None
+        if price is not None:
+            cost = (stats.prompt_tokens * price[0] + stats.completion_tokens * price[1]) / 1e6
+        n = stats.cases
+        return {
+            "version": cell.version,
+            "model": model,
+            "temperature": cell.temperature,
+            "max_tokens": cell.max_tokens,
+            "cases": n,
+            "deduplicated": stats.deduplicated,
+            "latency_p50_ms": percentile(stats.latencies, 50),
+            "latency_p95_ms": percentile(stats.latencies, 95),
+            "mean_prompt_tokens": stats.prompt_tokens / n if n else 0.0,
+            "mean_completion_tokens": stats.completion_tokens / n if n else 0.0,
+            "cost_usd": cost,
+            "cost_per_case_usd": cost / n if cost is not None and n else None,
+            "quality": sum(stats.scores) / len(stats.scores) if stats.scores else None,
+        }
+
+
+class _CellStats:
+    def __init__(self):
+        self.cases = 0
+        self.deduplicated = 0
+        self.latencies = []
+        self.prompt_tokens = 0.0
+        self.completion_tokens = 0.0
+        self.scores = []
+        self.models = []
+
+    def add(self, output: dict, score, shared: bool):
+        self.cases += 1
+        self.deduplicated += int(shared)
+        self.latencies.append(float(output["latency_ms"]))
+        self.prompt_tokens += usage_value(output.get("usage"), "prompt_tokens")
+        self.completion_tokens += usage_value(output.get("usage"), "completion_tokens")
+        if score is not None:
+            self.scores.append(score)
+        if output.get("model") and not self.models:
+            self.models.append(output["model"])
+
+
+def cheapest_meeting(rows, quality_bar: float):
+    """Cheapest cell whose mean quality reaches `quality_bar`, or None."""
+    eligible = [
+        row
+        for row in rows
+        if row["quality"] is not None
+        and row["quality"] >= quality_bar
+        and row["cost_per_case_usd"] is not None
+    ]
+    return min(eligible, key=lambda row: row["cost_per_case_usd"], default=None)
+
+
+def write_table(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_table(rows) -> str:
+    header = (
+        f"{'version':8} {'model':14} {'temp':>5} {'max':>5} "
+        f"{'p50ms':>8} {'$/case':>10} {'quality':>7}"
+    )
+    lines = [header]
+    for row in rows:
+        cost = "-" if row["cost_per_case_usd"] is None else f"{row['cost_per_case_usd']:.6f}"
+        quality = "-" if row["quality"] is None else f"{row['quality']:.2f}"
+        temperature = "-" if row["temperature"] is None else f"{row['temperature']:.2f}"
+        max_tokens = "-" if row["max_tokens"] is None else str(row["max_tokens"])
+        lines.append(
+            f"{row['version']:8} {row['model']!s:14} {temperature:>5} {max_tokens:>5} "
+            f"{row['latency_p50_ms']:8.1f} {cost:>10} {quality:>7}"
+        )
+    return "\n".join(lines)
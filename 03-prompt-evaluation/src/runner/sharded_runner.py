@@ -0,0 +1,144 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from cache.response_cache import CachingClient, ResponseCache
+from common.dataset_loader import shard_of
+from runner.evaluation_runner import EvaluationRunner
+from store.results_store import ResultsStore, write_json_atomic
+
+MERGED_DIR = "merged"
+
+
+def partition_dir(run_dir, shard_index: int, num_shards: int) -> Path:
+    return Path(run_dir) / f"shard-{shard_index:03d}-of-{num_shards:03d}"
+
+
+def run_shard(
+    shard_index: int,
+    num_shards: int,
+    prompt_name: str,
+    versions,
+    dataset,
+    run_dir,
+    registry_path: str,
+    cache_dir=None,
+    resume: bool = False,
+    max_concurrency: int = 8,
+    client=None,
+) -> dict:
+    """Evaluate one shard into its own partition. Safe to call in a fresh process or host."""
+    # Imported here so worker processes build their own registry/renderer/client
+    from registry.prompt_registry import PromptRegistry
+    from renderer.prompt_renderer import PromptRenderer
+
+    registry = PromptRegistry(registry_path=registry_path)
+    if client is None:
+        from client.llm_client import LLMClient
+
+        client = LLMClient()
+    if cache_dir is not None:
+        client = CachingClient(client, ResponseCache(cache_dir))
+    runner = EvaluationRunner(
+        registry, PromptRenderer(registry), client=client, max_concurrency=max_concurrency
+    )
+    store = ResultsStore(partition_dir(run_dir, shard_index, num_shards))
+    return runner.run_to_store(
+        prompt_name,
+        versions,
+        dataset,
+        store,
+        resume=resume,
+        case_filter=lambda identity: shard_of(identity, num_shards) == shard_index,
+        metadata={"shard_index": shard_index, "num_shards": num_shards},
+    )
+
+
+class ShardedEvaluation:
+    """Splits a dataset into N deterministic shards, one worker process each.
+
+    Each shard writes its own ResultsStore partition under run_dir, and all
+    shards share `cache_dir`, so re-running identical requests costs nothing.
+    For multi-host runs call `run_shard()` (or `main.py --shard-index`) on each
+    host against shared storage, then `merge_partitions()` once.
+    """
+
+    def __init__(self, registry_path: str, num_shards: int, cache_dir=None, max_concurrency=8):
+        self.registry_path = registry_path
+        self.num_shards = max(1, num_shards)
+        self.cache_dir = cache_dir
+        self.max_concurrency = max_concurrency
+
+    def run(self, prompt_name: str, versions, dataset, run_dir, resume: bool = False) -> dict:
+        with ProcessPoolExecutor(max_workers=self.num_shards) as pool:
+            futures = [
+                pool.submit(
+                    run_shard,
+                    shard_index,
+                    self.num_shards,
+                    prompt_name,
+                    list(versions),
+                    dataset,
+                    str(run_dir),
+                    self.registry_path,
+                    self.cache_dir,
+                    resume,
+                    self.max_concurrency,
+                )
+                for shard_index in range(self.num_shards)
+            ]
+            for future in futures:
+                future.result()
+        return merge_partitions(run_dir)
+
+
+def merge_partitions(run_dir) -> dict:
+    """Concatenate every shard partition into run_dir/merged as one report.
+
+    Streams records, so merging is memory-flat. Raises if shards disagree on
+    the run or any shard is missing or unfinished.
+    """
+    run_dir = Path(run_dir)
+    partitions = sorted(path for path in run_dir.glob("shard-*-of-*") if path.is_dir())
+    if not partitions:
+        raise FileNotFoundError(f"No shard partitions under {run_dir}")
+    manifests = [ResultsStore(path).read_manifest() for path in partitions]
+    first = manifests[0]
+    num_shards = first["num_shards"]
+    for manifest in manifests:
+        if (manifest["prompt_name"], manifest["versions"], manifest["num_shards"]) != (
+            first["prompt_name"],
+            first["versions"],
+            num_shards,
+        ):
+            raise ValueError(f"Shard {manifest['shard_index']} belongs to a different run")
+    found = {manifest["shard_index"] for manifest in manifests}
+    missing = sorted(set(range(num_shards)) - found)
+    if missing:
+        raise ValueError(f"Missing shards {missing} of {num_shards}")
+    unfinished = [m["shard_index"] for m in manifests if m["status"] != "complete"]
+    if unfinished:
+        raise ValueError(f"Shards {unfinished} did not complete; resume them before merging")
+
+    merged = run_dir / MERGED_DIR
+    merged.mkdir(exist_ok=True)
+    count = 0
+    with open(merged / ResultsStore.RESULTS, "w", encoding="utf-8") as out:
+        for path in partitions:
+            for record in ResultsStore(path).iter_records():
+                out.write(json.dumps(record) + "\n")
+                count += 1
+    manifest = {
+        "prompt_name": first["prompt_name"],
+        "versions": first["versions"],
+        "dataset": first["dataset"],
+        "num_shards": num_shards,
+        "shards": {m["shard_index"]: m["completed"] for m in manifests},
+        "total_cases": sum(m["total_cases"] for m in manifests),
+        "completed": count,
+        "status": "complete",
+        "updated_at": time.time(),
+    }
+    write_json_atomic(merged / ResultsStore.MANIFEST, manifest)
+    return manifest
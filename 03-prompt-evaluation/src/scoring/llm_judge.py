@@ -0,0 +1,74 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from models.llm_request import LLMRequest
+
+JUDGE_SYSTEM_PROMPT = """You are a strict evaluation judge.
+For each numbered item decide whether OUTPUT clearly exhibits TRAIT.
+Respond ONLY with JSON: {"verdicts": [{"id": <item id>, "pass": true or false}]}
+Include every item id exactly once."""
+
+
+class LLMJudgeScorer:
+    """Judges many (output, trait) pairs per LLM call.
+
+    Pairs are packed `batch_size` at a time into one prompt and batches run
+    concurrently, so judging a whole result set costs len(pairs) / batch_size
+    calls instead of one call per trait.
+    """
+
+    def __init__(
+        self,
+        client,
+        batch_size: int = 20,
+        max_concurrency: int = 4,
+        max_output_chars: int = 2000,
+        model: str = "gpt-4o-mini",
+    ):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_output_chars = max_output_chars
+        self.model = model
+
+    def score_pairs(self, pairs) -> list:
+        """Return 1.0 / 0.0 per (output, trait) pair, None where the judge gave no verdict."""
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        batches = [pairs[i : i + self.batch_size] for i in range(0, len(pairs), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+            results = pool.map(self._judge_batch, batches)
+        return [verdict for batch in results for verdict in batch]
+
+    def _judge_batch(self, batch) -> list:
+        items = "\n\n".join(
+            f"[{item_id}] TRAIT: {trait}\nOUTPUT:\n{(output or '')[: self.max_output_chars]}"
+            for item_id, (output, trait) in enumerate(batch)
+        )
+        request = LLMRequest(
+            system_prompt=JUDGE_SYSTEM_PROMPT,
+            user_prompt=items,
+            temperature=0.0,
+            max_tokens=20 + 16 * len(batch),
+            model=self.model,
+        )
+        response = self.client.execute(request)
+        verdicts = self._parse(response["output"])
+        return [verdicts.get(item_id) for item_id in range(len(batch))]
+
+    @staticmethod
+    def _parse(text: str) -> dict:
+        try:
+            start, end = text.index("{"), text.rindex("}") + 1
+            payload = json.loads(text[start:end])
+        except (ValueError, AttributeError):
+            return {}
+        verdicts = {}
+        for verdict in payload.get("verdicts", []):
+            if isinstance(verdict, dict) and isinstance(verdict.get("pass"), bool):
+                try:
+                    verdicts[int(verdict["id"])] = 1.0 if verdict["pass"] else 0.0
+                except (KeyError, TypeError, ValueError):
+                    continue
+        return verdicts
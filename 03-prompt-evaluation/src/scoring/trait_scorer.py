@@ -0,0 +1,217 @@
+import json
+import re
+from dataclasses import dataclass
+
+DEFAULT_CONCISE_WORDS = 150
+
+_MENTIONS = re.compile(r"^\s*mentions\s+(.+?)\s*$", re.IGNORECASE)
+_WORD_LIMIT = re.compile(
+    r"^\s*(?:under|at most|max(?:imum)?|fewer than)\s+(\d+)\s+words?\s*$", re.IGNORECASE
+)
+_JSON = re.compile(r"^\s*(?:valid\s+)?json\s*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class TraitRule:
+    """How one expected trait is checked. kind: keywords | regex | max_words | json."""
+
+    trait: str
+    kind: str
+    patterns: tuple = ()
+    limit: int = 0
+
+
+def _keyword_pattern(keyword: str) -> str:
+    # "partition tolerance" should also match "partition-tolerance"
+    words = [re.escape(word) for word in keyword.lower().split()]
+    return r"\b" + r"[\s\-]+".join(words) + r"\b"
+
+
+def rule_from_spec(trait: str, spec: dict) -> TraitRule:
+    """Build a rule from a dataset `trait_rules` entry."""
+    if "keywords" in spec:
+        return TraitRule(trait, "keywords", tuple(_keyword_pattern(k) for k in spec["keywords"]))
+    if "regex" in spec:
+        patterns = spec["regex"] if isinstance(spec["regex"], list) else [spec["regex"]]
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex for trait {trait!r}: {pattern!r}: {e}") from None
+        return TraitRule(trait, "regex", tuple(patterns))
+    if "max_words" in spec:
+        return TraitRule(trait, "max_words", limit=int(spec["max_words"]))
+    if spec.get("json"):
+        return TraitRule(trait, "json")
+    raise ValueError(f"Unsupported trait rule for {trait!r}: {spec}")
+
+
+def parse_trait(trait: str, concise_words: int = DEFAULT_CONCISE_WORDS):
+    """Map a free-text trait onto a deterministic rule, or None if it needs a judge."""
+    if match := _MENTIONS.match(trait):
+        return TraitRule(trait, "keywords", (_keyword_pattern(match.group(1)),))
+    if match := _WORD_LIMIT.match(trait):
+        return TraitRule(trait, "max_words", limit=int(match.group(1)))
+    if trait.strip().lower() == "concise":
+        return TraitRule(trait, "max_words", limit=concise_words)
+    if _JSON.match(trait):
+        return TraitRule(trait, "json")
+    return None
+
+
+class TraitScorer:
+    """Scores outputs against `expected_traits` with deterministic rules first.
+
+    Keyword rules, whose patterns are generated here, are compiled into one
+    alternation, so each output is scanned once however many keyword traits
+    there are. Dataset regexes are compiled and searched one by one: their own
+    groups, backreferences and inline flags would not survive being spliced
+    into a shared pattern. Traits with no deterministic rule go to the optional
+    `judge`, batched across the whole result set. Scores are 1.0 (pass), 0.0
+    (fail) or None (not scored).
+    """
+
+    def __init__(self, rules: dict, judge=None):
+        self.rules = rules
+        self.judge = judge
+        keyword_rules = [rule for rule in rules.values() if rule.kind == "keywords"]
+        self._group_rule = {}
+        alternatives = []
+        for index, rule in enumerate(keyword_rules):
+            group = f"r{index}"
+            self._group_rule[group] = rule.trait
+            alternatives.append(f"(?P<{group}>{'|'.join(rule.patterns)})")
+        # Zero-width lookahead reports every start position, not just non-overlapping hits
+        self._automaton = (
+            re.compile("(?=" + "|".join(alternatives) + ")", re.IGNORECASE)
+            if alternatives
+            else None
+        )
+        self._single = {
+            rule.trait: re.compile("|".join(rule.patterns), re.IGNORECASE) for rule in keyword_rules
+        }
+        self._regexes = {
+            rule.trait: [re.compile(pattern, re.IGNORECASE) for pattern in rule.patterns]
+            for rule in rules.values()
+            if rule.kind == "regex"
+        }
+
+    @classmethod
+    def from_dataset(cls, dataset, judge=None, concise_words: int = DEFAULT_CONCISE_WORDS):
+        specs = dataset.get("trait_rules") or {}
+        rules = {}
+        for case in dataset["cases"]:
+            for trait in case.get("expected_traits", []):
+                if trait in rules:
+                    continue
+                rule = (
+                    rule_from_spec(trait, specs[trait])
+                    if trait in specs
+                    else parse_trait(trait, concise_words)
+                )
+                if rule is not None:
+                    rules[trait] = rule
+        return cls(rules, judge=judge)
+
+    def matched_traits(self, text: str) -> set:
+        """Traits whose keyword or regex rule occurs in `text`."""
+        if not text:
+            return set()
+        matched = {
+            trait
+            for trait, patterns in self._regexes.items()
+            if any(pattern.search(text) for pattern in patterns)
+        }
+        if self._automaton is None:
+            return matched
+        positions = []
+        for match in self._automaton.finditer(text):
+            matched.add(self._group_rule[match.lastgroup])
+            positions.append(match.start())
+        # Only one alternative is reported per position; re-check shadowed rules there
+        for trait, pattern in self._single.items():
+            if trait not in matched and any(pattern.match(text, pos) for pos in positions):
+                matched.add(trait)
+        return matched
+
+    def score_output(self, traits, output: str) -> dict:
+        output = output or ""
+        matched = self.matched_traits(output)
+        word_count = None
+        scores = {}
+        for trait in traits:
+            rule = self.rules.get(trait)
+            if rule is None:
+                scores[trait] = None
+            elif rule.kind in ("keywords", "regex"):
+                scores[trait] = 1.0 if trait in matched else 0.0
+            elif rule.kind == "max_words":
+                word_count = len(output.split()) if word_count is None else word_count
+                scores[trait] = 1.0 if word_count <= rule.limit else 0.0
+            elif rule.kind == "json":
+                scores[trait] = 1.0 if _is_json(output) else 0.0
+        return scores
+
+    def score_results(self, result: dict, dataset) -> dict:
+        """Score every output of a {version: [outputs]} result.
+
+        Rules are applied output by output; traits left for the judge are
+        collected across the whole result and sent as one batch. Returns
+        {version: [{trait: score}]} aligned with the result lists.
+        """
+        cases = list(dataset["cases"])
+        scored = {
+            version: [
+                self.score_output(case.get("expected_traits", []), output["output"])
+                for case, output in zip(cases, outputs)
+            ]
+            for version, outputs in result.items()
+        }
+        if self.judge is not None:
+            pending = [
+                (version, index, trait)
+                for version, rows in scored.items()
+                for index, row in enumerate(rows)
+                for trait, score in row.items()
+                if score is None
+            ]
+            verdicts = self.judge.score_pairs(
+                [(result[version][index]["output"], trait) for version, index, trait in pending]
+            )
+            for (version, index, trait), verdict in zip(pending, verdicts):
+                scored[version][index][trait] = verdict
+        return scored
+
+    def case_score(self, case: dict, output: dict) -> float:
+        """Fraction of a case's scorable traits the output passes (for A/B comparison)."""
+        scores = self.score_output(case.get("expected_traits", []), output["output"])
+        if self.judge is not None:
+            missing = [trait for trait, score in scores.items() if score is None]
+            for trait, verdict in zip(
+                missing, self.judge.score_pairs([(output["output"], t) for t in missing])
+            ):
+                scores[trait] = verdict
+        values = [score for score in scores.values() if score is not None]
+        return sum(values) / len(values) if values else 0.0
+
+
+def pass_rates(scored: dict) -> dict:
+    """Per-version, per-trait pass rate over scored outputs."""
+    rates = {}
+    for version, rows in scored.items():
+        totals = {}
+        for row in rows:
+            for trait, score in row.items():
+                if score is not None:
+                    passed, seen = totals.get(trait, (0.0, 0))
+                    totals[trait] = (passed + score, seen + 1)
+        rates[version] = {trait: passed / seen for trait, (passed, seen) in totals.items()}
+    return rates
+
+
+def _is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return True
@@ -0,0 +1,176 @@
+import json
+import os
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+
+def json_default(value):
+    # OpenAI returns pydantic usage objects; everything else falls back to str
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def write_json_atomic(path, data: dict):
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ResultsStore:
+    """Append-only JSONL store for one evaluation run.
+
+    Layout of `run_dir`:
+        manifest.json   run metadata and status, rewritten atomically
+        results.jsonl   one record per finished (version, case), flushed per line
+
+    Records are written as they complete, so a crash loses at most the line
+    being written and `completed()` tells a resumed run what to skip.
+    JSONL loads directly into analysis tools (e.g. `pandas.read_json(path, lines=True)`).
+    The results file stays open from start() to finish(); used as a context manager,
+    the store also closes it when the run raises.
+    """
+
+    MANIFEST = "manifest.json"
+    RESULTS = "results.jsonl"
+
+    def __init__(self, run_dir, durable: bool = False):
+        self.run_dir = Path(run_dir)
+        self.manifest_path = self.run_dir / self.MANIFEST
+        self.results_path = self.run_dir / self.RESULTS
+        # fsync after every record; survives power loss at the cost of throughput
+        self.durable = durable
+        self.manifest = None
+        self._file = None
+        self._files = ExitStack()
+        self._written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(
+        self,
+        prompt_name: str,
+        versions,
+        dataset_name: str,
+        total_cases: int,
+        resume=False,
+        metadata: dict | None = None,
+    ):
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        has_results = self.results_path.exists() and self.results_path.stat().st_size > 0
+        if resume and self.manifest_path.exists():
+            manifest = self.read_manifest()
+            if manifest["prompt_name"] != prompt_name or manifest["versions"] != list(versions):
+                raise ValueError(
+                    f"Run {self.run_dir} was started for {manifest['prompt_name']} "
+                    f"{manifest['versions']}, cannot resume with {prompt_name} {list(versions)}"
+                )
+            self._truncate_partial_line()
+        elif has_results and not resume:
+            raise FileExistsError(f"{self.results_path} already has results; pass resume=True")
+        else:
+            manifest = {
+                "run_id": uuid.uuid4().hex,
+                "prompt_name": prompt_name,
+                "versions": list(versions),
+                "dataset": dataset_name,
+                "created_at": time.time(),
+            }
+            if has_results:
+                # The manifest was lost (it is written before any result); rebuild it
+                # from the arguments, as long as the stored records belong to this run
+                self._truncate_partial_line()
+                stored = {record["version"] for record in self.iter_records()}
+                unknown = sorted(stored - set(manifest["versions"]))
+                if unknown:
+                    raise ValueError(
+                        f"{self.results_path} has results for versions {unknown}, "
+                        f"cannot resume with {prompt_name} {list(versions)}"
+                    )
+                manifest["rebuilt_at"] = time.time()
+        manifest.update(metadata or {})
+        manifest.update(total_cases=total_cases, status="running", updated_at=time.time())
+        self.manifest = manifest
+        self._write_manifest()
+        self._file = self._files.enter_context(self.results_path.open("a", encoding="utf-8"))
+        return manifest
+
+    def append(self, record: dict):
+        self._file.write(json.dumps(record, default=json_default) + "\n")
+        self._file.flush()
+        if self.durable:
+            os.fsync(self._file.fileno())
+        self._written += 1
+
+    def finish(self, status: str = "complete"):
+        self.close()
+        self.manifest.update(status=status, updated_at=time.time(), completed=self.count())
+        self._write_manifest()
+        return self.manifest
+
+    def close(self):
+        """Close the results file; finish() also records the run's final status."""
+        self._files.close()
+        self._file = None
+
+    def read_manifest(self) -> dict:
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def iter_records(self):
+        """Stream stored records; a torn final line from a crash is ignored."""
+        if not self.results_path.exists():
+            return
+        with open(self.results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def completed(self) -> set:
+        return {(record["version"], record["case_id"]) for record in self.iter_records()}
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_records())
+
+    def load_results(self) -> dict:
+        """Rebuild the runner's {version: [outputs]} shape, ordered by case index."""
+        result = {version: [] for version in (self.manifest or self.read_manifest())["versions"]}
+        for record in self.iter_records():
+            result.setdefault(record["version"], []).append(record)
+        for records in result.values():
+            records.sort(key=lambda record: record["case_index"])
+        return result
+
+    def _write_manifest(self):
+        write_json_atomic(self.manifest_path, self.manifest)
+
+    def _truncate_partial_line(self):
+        # Appending after a torn line would glue two records together
+        if not self.results_path.exists():
+            return
+        with open(self.results_path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            pos = end
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    f.truncate(pos + newline + 1)
+                    return
+            f.truncate(0)
@@ -47,3 +47,38 @@ def sample_dataset():
             {"input": {"topic": "ML"}},
         ]
     }
+
+
+@pytest.fixture
+def sleepy_llm_client():
+    """Thread-safe fake client that sleeps per request and tracks peak concurrency."""
+    import threading
+    import time
+
+    class SleepyClient:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.in_flight = {}
+            self.peak = {}
+            self.calls = 0
+
+        def execute(self, request):
+            key = request.system_prompt
+            with self.lock:
+                self.calls += 1
+                self.in_flight[key] = self.in_flight.get(key, 0) + 1
+                total = sum(self.in_flight.values())
+                self.peak[key] = max(self.peak.get(key, 0), self.in_flight[key])
+                self.peak["__total__"] = max(self.peak.get("__total__", 0), total)
+            # Later prompts finish first so completion order differs from submission order
+            time.sleep(0.02 / (1 + len(request.user_prompt) % 5))
+            with self.lock:
+                self.in_flight[key] -= 1
+            return {
+                "output": request.user_prompt,
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                "latency_ms": 1.0,
+                "model": request.model,
+            }
+
+    return SleepyClient()
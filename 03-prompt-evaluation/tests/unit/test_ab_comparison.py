@@ -0,0 +1,148 @@
+"""Unit tests for the A/B comparison engine."""
+
+import math
+
+import pytest
+from comparison.ab_comparison import (
+    SequentialComparison,
+    bootstrap_ci,
+    compare_versions,
+    format_report,
+    percentile,
+    summarize_version,
+)
+from runner.evaluation_runner import EvaluationRunner
+
+
+def make_outputs(latencies, tokens=10):
+    return [
+        {"output": "x", "latency_ms": latency, "usage": {"total_tokens": tokens}}
+        for latency in latencies
+    ]
+
+
+class TestStatistics:
+    """Test suite for percentile and bootstrap helpers."""
+
+    def test_percentile_interpolates(self):
+        """Test linear interpolation between ranks."""
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([5], 99) == 5
+        assert math.isnan(percentile([], 50))
+
+    def test_bootstrap_ci_brackets_mean(self):
+        """Test that the CI contains the sample mean."""
+        values = [float(v) for v in range(100)]
+        low, high = bootstrap_ci(values, n_resamples=500)
+        assert low < 49.5 < high
+
+    def test_bootstrap_ci_is_reproducible(self):
+        """Test that the same seed yields the same interval."""
+        values = [1.0, 5.0, 2.0, 8.0, 3.0]
+        assert bootstrap_ci(values, seed=3) == bootstrap_ci(values, seed=3)
+
+    def test_summarize_version_reads_usage_objects(self):
+        """Test that attribute-style usage objects are supported."""
+
+        class Usage:
+            prompt_tokens = 3
+            completion_tokens = 4
+            total_tokens = 7
+
+        outputs = [{"latency_ms": 10, "usage": Usage()}]
+        summary = summarize_version(outputs, n_resamples=10)
+        assert summary["tokens"]["total_tokens"]["mean"] == 7
+
+
+class TestCompareVersions:
+    """Test suite for compare_versions()."""
+
+    def test_latency_percentiles_per_version(self):
+        """Test that each version gets latency percentiles."""
+        result = {"v1": make_outputs(range(1, 101)), "v2": make_outputs([50] * 100)}
+
+        report = compare_versions(result, n_resamples=100)
+
+        assert report["baseline"] == "v1"
+        assert report["versions"]["v1"]["latency_ms"]["p50"] == pytest.approx(50.5)
+        assert report["versions"]["v2"]["latency_ms"]["p99"] == 50
+        assert report["differences"] == {}
+
+    def test_paired_score_difference(self):
+        """Test that score differences are computed against the baseline."""
+        dataset = {"cases": [{"input": {}} for _ in range(4)]}
+        result = {
+            "v1": [{"output": "a", "latency_ms": 1, "usage": {}} for _ in range(4)],
+            "v2": [{"output": "bb", "latency_ms": 1, "usage": {}} for _ in range(4)],
+        }
+
+        report = compare_versions(
+            result, dataset, score_fn=lambda case, o: len(o["output"]), n_resamples=50
+        )
+
+        assert report["differences"]["v2"]["mean"] == 1
+        assert "histogram" in report["versions"]["v2"]["score"]
+        assert "v2 - v1" in format_report(report)
+
+
+class TestSequentialComparison:
+    """Test suite for sequential early stopping."""
+
+    @pytest.fixture
+    def runner(self, mock_registry):
+        from renderer.prompt_renderer import PromptRenderer
+
+        class VersionEcho:
+            def __init__(self):
+                self.calls = 0
+
+            def execute(self, request):
+                self.calls += 1
+                return {"output": request.system_prompt, "latency_ms": 1, "usage": {}}
+
+        mock_registry.load.side_effect = lambda name, version: {
+            "system_prompt": version,
+            "user_prompt": "{{topic}}",
+        }
+        return EvaluationRunner(mock_registry, PromptRenderer(None), client=VersionEcho())
+
+    @pytest.fixture
+    def dataset(self):
+        return {"cases": [{"id": str(i), "input": {"topic": str(i)}} for i in range(200)]}
+
+    def test_stops_early_when_candidate_clearly_better(self, runner, dataset):
+        """Test that a clear winner stops after the first look."""
+        score = lambda case, output: 1.0 if output["output"] == "v2" else 0.0
+        comparison = SequentialComparison(runner, score, batch_size=20, n_resamples=200)
+
+        outcome = comparison.run("p", "v1", "v2", dataset)
+
+        assert outcome.decision == "candidate_better"
+        assert outcome.cases_used == 20
+        assert outcome.calls_saved == 360
+        assert runner.llm_client.calls == 40
+
+    def test_detects_equivalence(self, runner, dataset):
+        """Test that identical scores are declared equivalent."""
+        comparison = SequentialComparison(runner, lambda case, output: 0.5, n_resamples=200)
+
+        outcome = comparison.run("p", "v1", "v2", dataset)
+
+        assert outcome.decision == "equivalent"
+        assert outcome.cases_used < len(dataset["cases"])
+
+    def test_inconclusive_uses_all_cases(self, runner):
+        """Test that noisy differences exhaust the dataset."""
+        dataset = {"cases": [{"id": str(i), "input": {"topic": str(i)}} for i in range(40)]}
+
+        def noisy(case, output):
+            sign = 1 if int(case["id"]) % 2 else -1
+            return sign * (1.0 if output["output"] == "v2" else 0.0)
+
+        comparison = SequentialComparison(runner, noisy, batch_size=10, min_cases=10)
+
+        outcome = comparison.run("p", "v1", "v2", dataset)
+
+        assert outcome.decision == "inconclusive"
+        assert outcome.cases_used == 40
+        assert outcome.looks == 4
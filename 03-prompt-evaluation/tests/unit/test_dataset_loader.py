@@ -0,0 +1,109 @@
+"""Unit tests for the streaming Dataset loader."""
+
+import json
+
+import pytest
+from common.dataset_loader import Dataset, shard_of
+from runner.evaluation_runner import EvaluationRunner
+
+SINGLE_DOC = """task: demo
+description: classic layout
+cases:
+  - id: a
+    input: {topic: x}
+  - id: b
+    input: {topic: y}
+"""
+
+MULTI_DOC = """task: demo
+description: one case per document
+---
+id: a
+input: {topic: x}
+---
+id: b
+input: {topic: y}
+---
+input: {topic: z}
+"""
+
+
+@pytest.fixture
+def write(tmp_path):
+    def _write(name, text):
+        path = tmp_path / name
+        path.write_text(text)
+        return path
+
+    return _write
+
+
+class TestDataset:
+    """Test suite for Dataset sources and transforms."""
+
+    def test_single_document_yaml(self, write):
+        """Test the existing single-document layout."""
+        dataset = Dataset(write("d.yaml", SINGLE_DOC))
+
+        assert [case["id"] for case in dataset["cases"]] == ["a", "b"]
+        assert dataset["task"] == "demo"
+        assert dataset.get("missing", 1) == 1
+        assert len(dataset) == 2
+
+    def test_multi_document_yaml(self, write):
+        """Test one-case-per-document YAML, with position ids for unnamed cases."""
+        dataset = Dataset(write("d.yaml", MULTI_DOC))
+
+        assert [case["id"] for case in dataset] == ["a", "b", "2"]
+        assert dataset.metadata == {"task": "demo", "description": "one case per document"}
+
+    def test_yaml_is_cached_as_jsonl(self, write, tmp_path):
+        """Test that YAML is converted once and reused."""
+        path = write("d.yaml", SINGLE_DOC)
+        list(Dataset(path))
+
+        cached = list((tmp_path / ".dataset_cache").glob("d-*.jsonl"))
+        assert len(cached) == 1
+        first = json.loads(cached[0].read_text().splitlines()[0])
+        assert first["__metadata__"]["task"] == "demo"
+
+    def test_cache_invalidated_when_source_changes(self, write):
+        """Test that editing the YAML produces a fresh conversion."""
+        path = write("d.yaml", SINGLE_DOC)
+        assert len(Dataset(path)) == 2
+
+        path.write_text(SINGLE_DOC + "  - id: c\n    input: {topic: z}\n")
+
+        assert len(Dataset(path)) == 3
+
+    def test_jsonl_source(self, write):
+        """Test reading JSONL directly, with an optional metadata line."""
+        lines = [{"__metadata__": {"task": "j"}}] + [
+            {"id": str(i), "input": {"topic": i}} for i in range(5)
+        ]
+        dataset = Dataset(write("d.jsonl", "\n".join(json.dumps(line) for line in lines)))
+
+        assert dataset["task"] == "j"
+        assert len(dataset) == 5
+
+    def test_transforms_compose_lazily(self, write):
+        """Test filter, take, sample and shard."""
+        lines = [json.dumps({"id": f"c{i}", "input": {"n": i}}) for i in range(1000)]
+        dataset = Dataset(write("d.jsonl", "\n".join(lines)))
+
+        assert len(dataset.filter(lambda case: case["input"]["n"] % 2 == 0)) == 500
+        assert [case["id"] for case in dataset.take(3)] == ["c0", "c1", "c2"]
+        sampled = dataset.sample(0.1, seed=1)
+        assert 50 < len(sampled) < 150
+        assert [c["id"] for c in sampled] == [c["id"] for c in dataset.sample(0.1, seed=1)]
+        shards = [{c["id"] for c in dataset.shard(i, 3)} for i in range(3)]
+        assert sum(len(s) for s in shards) == 1000
+        assert all(shard_of(cid, 3) == 1 for cid in shards[1])
+
+    def test_runner_accepts_dataset(self, write, mock_llm_client, mock_registry, mock_renderer):
+        """Test that EvaluationRunner runs a lazy Dataset."""
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=mock_llm_client)
+
+        result = runner.run("p", ["v1"], Dataset(write("d.yaml", MULTI_DOC)))
+
+        assert len(result["v1"]) == 3
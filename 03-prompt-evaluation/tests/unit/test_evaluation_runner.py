@@ -159,3 +159,110 @@ class TestEvaluationRunner:
         result = runner.run("test_prompt", ["v1"], sample_dataset)
 
         assert result["v1"][0]["output"] == "Specific test output"
+
+
+class TestConcurrentEvaluation:
+    """Test suite for the concurrent versions x cases execution engine."""
+
+    @pytest.fixture
+    def registry(self, mock_registry):
+        mock_registry.load.side_effect = lambda name, version: {
+            "system_prompt": f"system-{version}",
+            "user_prompt": "{{topic}}",
+        }
+        return mock_registry
+
+    @pytest.fixture
+    def renderer(self):
+        from renderer.prompt_renderer import PromptRenderer
+
+        return PromptRenderer(None)
+
+    @pytest.fixture
+    def dataset(self):
+        return {"cases": [{"input": {"topic": f"topic-{i}" + "x" * i}} for i in range(12)]}
+
+    def test_results_keep_case_order(self, sleepy_llm_client, registry, renderer, dataset):
+        """Test that outputs are returned in dataset order despite out-of-order completion."""
+        runner = EvaluationRunner(registry, renderer, client=sleepy_llm_client, max_concurrency=6)
+
+        result = runner.run("test_prompt", ["v1", "v2"], dataset)
+
+        expected = [case["input"]["topic"] for case in dataset["cases"]]
+        assert list(result) == ["v1", "v2"]
+        assert [o["output"] for o in result["v1"]] == expected
+        assert [o["output"] for o in result["v2"]] == expected
+
+    def test_max_concurrency_is_respected(self, sleepy_llm_client, registry, renderer, dataset):
+        """Test that in-flight requests never exceed max_concurrency."""
+        runner = EvaluationRunner(registry, renderer, client=sleepy_llm_client, max_concurrency=3)
+
+        runner.run("test_prompt", ["v1", "v2"], dataset)
+
+        assert sleepy_llm_client.calls == 24
+        assert 1 < sleepy_llm_client.peak["__total__"] <= 3
+
+    def test_version_concurrency_share(self, sleepy_llm_client, registry, renderer, dataset):
+        """Test that a per-version cap limits that version only."""
+        runner = EvaluationRunner(
+            registry,
+            renderer,
+            client=sleepy_llm_client,
+            max_concurrency=6,
+            version_concurrency={"v2": 1},
+        )
+
+        result = runner.run("test_prompt", ["v1", "v2"], dataset)
+
+        assert len(result["v2"]) == 12
+        assert sleepy_llm_client.peak["system-v2"] == 1
+        assert sleepy_llm_client.peak["system-v1"] > 1
+
+    def test_sequential_when_concurrency_is_one(
+        self, sleepy_llm_client, registry, renderer, dataset
+    ):
+        """Test that max_concurrency=1 degrades to sequential execution."""
+        runner = EvaluationRunner(registry, renderer, client=sleepy_llm_client, max_concurrency=1)
+
+        runner.run("test_prompt", ["v1"], dataset)
+
+        assert sleepy_llm_client.peak["__total__"] == 1
+
+    def test_client_errors_propagate(self, registry, renderer, dataset):
+        """Test that a failing LLM call surfaces to the caller."""
+        from unittest.mock import MagicMock
+
+        client = MagicMock()
+        client.execute.side_effect = RuntimeError("rate limited")
+        runner = EvaluationRunner(registry, renderer, client=client, max_concurrency=4)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            runner.run("test_prompt", ["v1"], dataset)
+
+
+class TestBuildRequest:
+    """Test suite for request construction from prompt files."""
+
+    def test_reads_nested_model_defaults(self, mock_llm_client, mock_registry, mock_renderer):
+        """Test that `model-defaults` from registry YAML is honoured."""
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=mock_llm_client)
+        prompt = {
+            "system_prompt": "s",
+            "user_prompt": "u",
+            "model-defaults": {"temperature": 0.5, "max_tokens": 150},
+        }
+
+        request = runner.build_request(prompt, {"input": {}})
+
+        assert request.temperature == 0.5
+        assert request.max_tokens == 150
+        assert request.model == "gpt-4o-mini"
+
+    def test_overrides_win(self, mock_llm_client, mock_registry, mock_renderer):
+        """Test that explicit arguments override prompt settings."""
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=mock_llm_client)
+        prompt = {"system_prompt": "s", "user_prompt": "u", "temperature": 0.9}
+
+        request = runner.build_request(prompt, {"input": {}}, model="gpt-4o", temperature=0.0)
+
+        assert (request.model, request.temperature) == ("gpt-4o", 0.0)
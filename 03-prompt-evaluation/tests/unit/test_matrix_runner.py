@@ -0,0 +1,114 @@
+"""Unit tests for the evaluation matrix sweep."""
+
+import csv
+
+import pytest
+from renderer.prompt_renderer import PromptRenderer
+from runner.evaluation_runner import EvaluationRunner
+from runner.matrix_runner import MatrixCell, MatrixRunner, cheapest_meeting, write_table
+from scoring.trait_scorer import TraitScorer
+
+
+class ModelEcho:
+    """Fake client whose output quality depends on the model."""
+
+    def __init__(self):
+        self.requests = []
+
+    def execute(self, request):
+        self.requests.append(request)
+        output = "consistency" if request.model == "gpt-4o" else "nothing relevant"
+        return {
+            "output": output,
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 100},
+            "latency_ms": 10.0,
+            "model": request.model,
+        }
+
+
+@pytest.fixture
+def dataset():
+    return {
+        "cases": [
+            {"id": str(i), "input": {"topic": str(i)}, "expected_traits": ["mentions consistency"]}
+            for i in range(4)
+        ]
+    }
+
+
+@pytest.fixture
+def matrix(mock_registry, dataset):
+    mock_registry.load.return_value = {
+        "system_prompt": "s",
+        "user_prompt": "{{topic}}",
+        "model-defaults": {"temperature": 0.2, "max_tokens": 100},
+    }
+    runner = EvaluationRunner(mock_registry, PromptRenderer(None), client=ModelEcho())
+    return MatrixRunner(runner, scorer=TraitScorer.from_dataset(dataset))
+
+
+class TestMatrixRunner:
+    """Test suite for MatrixRunner."""
+
+    def test_cells_are_cross_product(self):
+        """Test grid expansion."""
+        cells = MatrixRunner.cells(["v1", "v2"], ["a", "b"], [0.0, 1.0], [100])
+        assert len(cells) == 8
+        assert MatrixCell("v2", "b", 1.0, 100) in cells
+
+    def test_one_row_per_cell_with_cost_and_quality(self, matrix, dataset):
+        """Test the tidy results table."""
+        cells = matrix.cells(["v1"], ["gpt-4o-mini", "gpt-4o"], [0.0])
+
+        rows = matrix.run("p", dataset, cells)
+
+        assert [row["model"] for row in rows] == ["gpt-4o-mini", "gpt-4o"]
+        assert rows[0]["quality"] == 0.0
+        assert rows[1]["quality"] == 1.0
+        assert rows[0]["cost_usd"] == pytest.approx(4 * (1000 * 0.15 + 100 * 0.60) / 1e6)
+        assert rows[1]["latency_p50_ms"] == 10.0
+
+    def test_identical_cells_are_deduplicated(self, matrix, dataset):
+        """Test that versions resolving to the same request run once."""
+        cells = matrix.cells(["v1", "v2"], ["gpt-4o"], [0.0])
+
+        rows = matrix.run("p", dataset, cells)
+
+        assert len(matrix.runner.llm_client.requests) == 4
+        assert rows[1]["cases"] == 4
+        assert rows[1]["deduplicated"] == 4
+
+    def test_shared_output_scored_once(self, matrix, dataset):
+        """Test that deduplicated cells reuse one score instead of rescoring."""
+        scorer = matrix.scorer
+        calls = []
+
+        def case_score(case, output):
+            calls.append(case["id"])
+            return TraitScorer.case_score(scorer, case, output)
+
+        scorer.case_score = case_score
+        cells = matrix.cells(["v1", "v2", "v3"], ["gpt-4o"], [0.0])
+
+        rows = matrix.run("p", dataset, cells)
+
+        assert sorted(calls) == ["0", "1", "2", "3"]
+        assert [row["quality"] for row in rows] == [1.0, 1.0, 1.0]
+
+    def test_prompt_defaults_fill_unset_axes(self, matrix, dataset):
+        """Test that None grid values fall back to the prompt's model-defaults."""
+        matrix.run("p", dataset, matrix.cells(["v1"]))
+
+        request = matrix.runner.llm_client.requests[0]
+        assert (request.temperature, request.max_tokens) == (0.2, 100)
+
+    def test_cheapest_meeting_quality_bar(self, matrix, dataset, tmp_path):
+        """Test picking the cheapest cell that meets the bar, and CSV export."""
+        rows = matrix.run("p", dataset, matrix.cells(["v1"], ["gpt-4o-mini", "gpt-4o"]))
+
+        assert cheapest_meeting(rows, 0.9)["model"] == "gpt-4o"
+        assert cheapest_meeting(rows, 0.0)["model"] == "gpt-4o-mini"
+
+        write_table(rows, tmp_path / "matrix.csv")
+        with open(tmp_path / "matrix.csv") as f:
+            assert len(list(csv.DictReader(f))) == 2
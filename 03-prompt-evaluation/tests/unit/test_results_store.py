@@ -0,0 +1,201 @@
+"""Unit tests for ResultsStore and streamed/resumable runs."""
+
+import json
+
+import pytest
+from runner.evaluation_runner import EvaluationRunner
+from store.results_store import ResultsStore
+
+
+@pytest.fixture
+def dataset():
+    return {
+        "task": "demo",
+        "cases": [{"id": f"case_{i:02d}", "input": {"topic": f"t{i}"}} for i in range(5)],
+    }
+
+
+class TestResultsStore:
+    """Test suite for the append-only results store."""
+
+    def test_start_writes_manifest(self, tmp_path):
+        """Test that start() writes a running manifest."""
+        store = ResultsStore(tmp_path / "run")
+        store.start("p", ["v1", "v2"], dataset_name="demo", total_cases=3)
+
+        manifest = json.loads((tmp_path / "run" / "manifest.json").read_text())
+        assert manifest["status"] == "running"
+        assert manifest["versions"] == ["v1", "v2"]
+        assert manifest["total_cases"] == 3
+        store.finish()
+
+    def test_append_is_visible_immediately(self, tmp_path):
+        """Test that each record is flushed as soon as it is appended."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0, "output": "x"})
+
+        lines = (tmp_path / "results.jsonl").read_text().splitlines()
+        assert json.loads(lines[0])["case_id"] == "a"
+        assert store.completed() == {("v1", "a")}
+        store.finish()
+
+    def test_finish_records_status_and_count(self, tmp_path):
+        """Test that finish() updates the manifest."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=2)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0, "output": "x"})
+
+        manifest = store.finish()
+
+        assert manifest["status"] == "complete"
+        assert manifest["completed"] == 1
+
+    def test_serializes_usage_objects(self, tmp_path):
+        """Test that pydantic-style usage objects are stored as dicts."""
+
+        class Usage:
+            def model_dump(self):
+                return {"total_tokens": 7}
+
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0, "usage": Usage()})
+        store.finish()
+
+        assert next(store.iter_records())["usage"] == {"total_tokens": 7}
+
+    def test_refuses_to_overwrite_without_resume(self, tmp_path):
+        """Test that a fresh start never mixes into an existing run."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0})
+        store.finish()
+
+        with pytest.raises(FileExistsError):
+            ResultsStore(tmp_path).start("p", ["v1"], dataset_name="demo", total_cases=1)
+
+    def test_resume_rejects_different_run(self, tmp_path):
+        """Test that resuming with other versions is an error."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+        store.finish()
+
+        with pytest.raises(ValueError):
+            ResultsStore(tmp_path).start("p", ["v2"], "demo", total_cases=1, resume=True)
+
+    def test_resume_drops_torn_last_line(self, tmp_path):
+        """Test that a partially written record from a crash is discarded."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=2)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0})
+        store.finish("failed")
+        with open(tmp_path / "results.jsonl", "a") as f:
+            f.write('{"version": "v1", "case_')
+
+        resumed = ResultsStore(tmp_path)
+        resumed.start("p", ["v1"], dataset_name="demo", total_cases=2, resume=True)
+        resumed.append({"version": "v1", "case_id": "b", "case_index": 1})
+        resumed.finish()
+
+        assert resumed.completed() == {("v1", "a"), ("v1", "b")}
+
+    def test_resume_rebuilds_missing_manifest(self, tmp_path):
+        """Test that resuming results without a manifest rebuilds the manifest."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=2)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0})
+        store.finish("failed")
+        (tmp_path / "manifest.json").unlink()
+
+        resumed = ResultsStore(tmp_path)
+        manifest = resumed.start("p", ["v1"], dataset_name="demo", total_cases=2, resume=True)
+        resumed.finish()
+
+        assert manifest["prompt_name"] == "p"
+        assert "rebuilt_at" in manifest
+        assert resumed.completed() == {("v1", "a")}
+
+    def test_resume_without_manifest_rejects_other_versions(self, tmp_path):
+        """Test that a rebuilt manifest must cover the stored records."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+        store.append({"version": "v1", "case_id": "a", "case_index": 0})
+        store.finish()
+        (tmp_path / "manifest.json").unlink()
+
+        with pytest.raises(ValueError, match="v1"):
+            ResultsStore(tmp_path).start("p", ["v2"], "demo", total_cases=1, resume=True)
+
+    def test_context_manager_closes_file(self, tmp_path):
+        """Test that leaving the with block closes the results file."""
+        with ResultsStore(tmp_path) as store:
+            store.start("p", ["v1"], dataset_name="demo", total_cases=1)
+            handle = store._file
+
+        assert handle.closed
+        assert store._file is None
+
+    def test_load_results_orders_by_case_index(self, tmp_path):
+        """Test that load_results rebuilds the runner result shape."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1", "v2"], dataset_name="demo", total_cases=2)
+        for index in (1, 0):
+            store.append({"version": "v1", "case_id": str(index), "case_index": index})
+        store.finish()
+
+        result = store.load_results()
+
+        assert [r["case_index"] for r in result["v1"]] == [0, 1]
+        assert result["v2"] == []
+
+
+class TestRunToStore:
+    """Test suite for EvaluationRunner.run_to_store()."""
+
+    def test_streams_every_cell(
+        self, tmp_path, mock_llm_client, mock_registry, mock_renderer, dataset
+    ):
+        """Test that every (version, case) pair lands in the store."""
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=mock_llm_client)
+        store = ResultsStore(tmp_path)
+
+        manifest = runner.run_to_store("p", ["v1", "v2"], dataset, store)
+
+        assert manifest["status"] == "complete"
+        assert manifest["completed"] == 10
+        assert ("v2", "case_04") in store.completed()
+
+    def test_resume_skips_completed_pairs(
+        self, tmp_path, mock_llm_client, mock_registry, mock_renderer, dataset
+    ):
+        """Test that a resumed run only executes missing pairs."""
+        store = ResultsStore(tmp_path)
+        store.start("p", ["v1", "v2"], dataset_name="demo", total_cases=5)
+        for case in dataset["cases"][:3]:
+            store.append({"version": "v1", "case_id": case["id"], "case_index": 0})
+        store.finish("failed")
+
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=mock_llm_client)
+        manifest = runner.run_to_store("p", ["v1", "v2"], dataset, ResultsStore(tmp_path), True)
+
+        assert mock_llm_client.execute.call_count == 7
+        assert manifest["completed"] == 10
+
+    def test_failure_marks_run_failed(self, tmp_path, mock_registry, mock_renderer, dataset):
+        """Test that a crash leaves finished records and a failed manifest."""
+        from unittest.mock import MagicMock
+
+        client = MagicMock()
+        client.execute.side_effect = [
+            {"output": "ok", "usage": {}, "latency_ms": 1, "model": "m"},
+            RuntimeError("boom"),
+        ] + [{"output": "ok", "usage": {}, "latency_ms": 1, "model": "m"}] * 10
+        runner = EvaluationRunner(mock_registry, mock_renderer, client=client, max_concurrency=1)
+        store = ResultsStore(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            runner.run_to_store("p", ["v1"], dataset, store)
+
+        assert store.read_manifest()["status"] == "failed"
+        assert store.completed() == {("v1", "case_00")}
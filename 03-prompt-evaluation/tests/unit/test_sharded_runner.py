@@ -0,0 +1,197 @@
+"""Unit tests for sharded evaluation and the shared response cache."""
+
+import json
+from pathlib import Path
+
+import pytest
+from cache.response_cache import CachingClient, ResponseCache
+from models.llm_request import LLMRequest
+from runner.sharded_runner import (
+    ShardedEvaluation,
+    merge_partitions,
+    partition_dir,
+    run_shard,
+    shard_of,
+)
+from store.results_store import ResultsStore
+
+PROMPTS = str(Path(__file__).parents[3] / "02-prompt-registry" / "prompts")
+
+
+class CountingClient:
+    """Fake client that echoes the user prompt and counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, request):
+        self.calls += 1
+        return {
+            "output": request.user_prompt,
+            "usage": {"total_tokens": 3},
+            "latency_ms": 1.0,
+            "model": request.model,
+        }
+
+
+@pytest.fixture
+def dataset():
+    return {
+        "task": "cap",
+        "cases": [{"id": f"c{i}", "input": {"format": f"style {i}"}} for i in range(20)],
+    }
+
+
+class TestShardOf:
+    """Test suite for deterministic shard assignment."""
+
+    def test_is_deterministic_and_in_range(self):
+        """Test that the same id always lands in the same valid shard."""
+        assert all(shard_of(f"c{i}", 4) == shard_of(f"c{i}", 4) for i in range(50))
+        assert {shard_of(f"c{i}", 4) for i in range(200)} == {0, 1, 2, 3}
+
+
+class TestResponseCache:
+    """Test suite for the on-disk response cache."""
+
+    def test_second_identical_request_is_free(self, tmp_path):
+        """Test that a repeated request is served from disk."""
+        inner = CountingClient()
+        client = CachingClient(inner, ResponseCache(tmp_path))
+        request = LLMRequest(system_prompt="s", user_prompt="u")
+
+        first = client.execute(request)
+        second = client.execute(request)
+
+        assert inner.calls == 1
+        assert second["output"] == first["output"]
+        assert second["cached"] is True
+        assert (client.hits, client.misses) == (1, 1)
+
+    def test_cache_is_shared_between_instances(self, tmp_path):
+        """Test that separate clients (e.g. processes) share entries."""
+        request = LLMRequest(system_prompt="s", user_prompt="u", temperature=0.1)
+        CachingClient(CountingClient(), ResponseCache(tmp_path)).execute(request)
+
+        inner = CountingClient()
+        CachingClient(inner, ResponseCache(tmp_path)).execute(request)
+
+        assert inner.calls == 0
+
+    def test_different_parameters_miss(self, tmp_path):
+        """Test that any request field change produces a new key."""
+        cache = ResponseCache(tmp_path)
+        a = LLMRequest(system_prompt="s", user_prompt="u", temperature=0.1)
+        b = LLMRequest(system_prompt="s", user_prompt="u", temperature=0.2)
+        assert cache.key(a) != cache.key(b)
+
+
+class TestShardedEvaluation:
+    """Test suite for shard partitions and merging."""
+
+    def test_shards_partition_the_dataset(self, tmp_path, dataset):
+        """Test that shards cover every case exactly once and merge cleanly."""
+        for index in range(3):
+            run_shard(
+                index,
+                3,
+                "cap_theorem_explainer",
+                ["v1"],
+                dataset,
+                tmp_path,
+                PROMPTS,
+                client=CountingClient(),
+            )
+
+        manifest = merge_partitions(tmp_path)
+
+        assert manifest["completed"] == 20
+        assert sum(manifest["shards"].values()) == 20
+        merged = ResultsStore(tmp_path / "merged").load_results()
+        assert [r["case_id"] for r in merged["v1"]] == [f"c{i}" for i in range(20)]
+
+    def test_shared_cache_makes_reruns_free(self, tmp_path, dataset):
+        """Test that rerunning a shard with the shared cache makes no LLM calls."""
+        cache_dir = tmp_path / "cache"
+        run_shard(
+            0,
+            2,
+            "cap_theorem_explainer",
+            ["v1"],
+            dataset,
+            tmp_path / "a",
+            PROMPTS,
+            cache_dir=cache_dir,
+            client=CountingClient(),
+        )
+
+        rerun = CountingClient()
+        run_shard(
+            0,
+            2,
+            "cap_theorem_explainer",
+            ["v1"],
+            dataset,
+            tmp_path / "b",
+            PROMPTS,
+            cache_dir=cache_dir,
+            client=rerun,
+        )
+
+        assert rerun.calls == 0
+
+    def test_merge_requires_every_shard(self, tmp_path, dataset):
+        """Test that a missing shard blocks the merge."""
+        run_shard(
+            0,
+            2,
+            "cap_theorem_explainer",
+            ["v1"],
+            dataset,
+            tmp_path,
+            PROMPTS,
+            client=CountingClient(),
+        )
+
+        with pytest.raises(ValueError, match="Missing shards"):
+            merge_partitions(tmp_path)
+
+    def test_merge_rejects_unfinished_shard(self, tmp_path, dataset):
+        """Test that a failed shard must be resumed before merging."""
+        for index in range(2):
+            run_shard(
+                index,
+                2,
+                "cap_theorem_explainer",
+                ["v1"],
+                dataset,
+                tmp_path,
+                PROMPTS,
+                client=CountingClient(),
+            )
+        manifest_path = partition_dir(tmp_path, 1, 2) / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest_path.write_text(json.dumps({**manifest, "status": "failed"}))
+
+        with pytest.raises(ValueError, match="did not complete"):
+            merge_partitions(tmp_path)
+
+    def test_worker_processes(self, tmp_path, dataset):
+        """Test the multi-process path end to end with cached responses."""
+        cache = ResponseCache(tmp_path / "cache")
+        # Pre-fill the shared cache so worker processes never reach the network
+        from registry.prompt_registry import PromptRegistry
+        from renderer.prompt_renderer import PromptRenderer
+        from runner.evaluation_runner import EvaluationRunner
+
+        registry = PromptRegistry(PROMPTS)
+        runner = EvaluationRunner(registry, PromptRenderer(registry), client=CountingClient())
+        prompt = registry.load("cap_theorem_explainer", "v1")
+        for case in dataset["cases"]:
+            request = runner.build_request(prompt, case)
+            cache.put(cache.key(request), CountingClient().execute(request))
+
+        sharded = ShardedEvaluation(PROMPTS, num_shards=2, cache_dir=str(tmp_path / "cache"))
+        manifest = sharded.run("cap_theorem_explainer", ["v1"], dataset, tmp_path / "run")
+
+        assert manifest["completed"] == 20
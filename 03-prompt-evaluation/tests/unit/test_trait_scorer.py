@@ -0,0 +1,174 @@
+"""Unit tests for trait scoring."""
+
+import pytest
+from scoring.llm_judge import LLMJudgeScorer
+from scoring.trait_scorer import (
+    TraitRule,
+    TraitScorer,
+    parse_trait,
+    pass_rates,
+    rule_from_spec,
+)
+
+
+@pytest.fixture
+def cap_dataset():
+    return {
+        "trait_rules": {"mentions partition tolerance": {"keywords": ["network partition"]}},
+        "cases": [
+            {
+                "input": {},
+                "expected_traits": [
+                    "mentions consistency",
+                    "mentions availability",
+                    "mentions partition tolerance",
+                    "concise",
+                ],
+            }
+        ],
+    }
+
+
+class TestParseTrait:
+    """Test suite for free-text trait parsing."""
+
+    def test_mentions_becomes_keyword_rule(self):
+        """Test that 'mentions X' maps to a keyword rule."""
+        rule = parse_trait("mentions consistency")
+        assert rule.kind == "keywords"
+
+    def test_length_traits(self):
+        """Test that concise and word limits map to max_words."""
+        assert parse_trait("concise", concise_words=40) == TraitRule(
+            "concise", "max_words", limit=40
+        )
+        assert parse_trait("under 50 words").limit == 50
+
+    def test_json_trait(self):
+        """Test that JSON validity traits are recognised."""
+        assert parse_trait("valid JSON").kind == "json"
+
+    def test_unknown_trait_needs_judge(self):
+        """Test that free-form traits have no deterministic rule."""
+        assert parse_trait("uses a friendly tone") is None
+
+
+class TestTraitScorer:
+    """Test suite for TraitScorer."""
+
+    def test_scores_keywords_case_insensitively(self, cap_dataset):
+        """Test keyword traits against a passing output."""
+        scorer = TraitScorer.from_dataset(cap_dataset)
+        traits = cap_dataset["cases"][0]["expected_traits"]
+
+        scores = scorer.score_output(traits, "CONSISTENCY, Availability and a network-partition.")
+
+        assert scores == {
+            "mentions consistency": 1.0,
+            "mentions availability": 1.0,
+            "mentions partition tolerance": 1.0,
+            "concise": 1.0,
+        }
+
+    def test_scores_failures(self, cap_dataset):
+        """Test that missing keywords and long outputs fail."""
+        scorer = TraitScorer.from_dataset(cap_dataset, concise_words=3)
+        traits = cap_dataset["cases"][0]["expected_traits"]
+
+        scores = scorer.score_output(traits, "Consistency is one of several guarantees here")
+
+        assert scores["mentions consistency"] == 1.0
+        assert scores["mentions availability"] == 0.0
+        assert scores["concise"] == 0.0
+
+    def test_overlapping_rules_all_match(self):
+        """Test that rules starting at the same position are all detected."""
+        scorer = TraitScorer(
+            {
+                "a": TraitRule("a", "regex", (r"partition",)),
+                "b": TraitRule("b", "regex", (r"partition tolerance",)),
+            }
+        )
+        assert scorer.matched_traits("Partition tolerance matters") == {"a", "b"}
+
+    def test_dataset_regexes_keep_their_groups_and_flags(self):
+        """Test that named groups, backreferences and inline flags work as written."""
+        scorer = TraitScorer(
+            {
+                "repeats a word": rule_from_spec(
+                    "repeats a word", {"regex": r"\b(?P<w>\w+) (?P=w)\b"}
+                ),
+                "cites": rule_from_spec("cites", {"regex": [r"(?s)see\s.*\[\d+\]", r"(\d)\1"]}),
+                "mentions raft": parse_trait("mentions raft"),
+            }
+        )
+
+        assert scorer.matched_traits("Raft is is simple, see\nnotes [3]") == {
+            "repeats a word",
+            "cites",
+            "mentions raft",
+        }
+        assert scorer.matched_traits("see 12") == set()
+
+    def test_invalid_regex_rejected_up_front(self):
+        """Test that a malformed dataset regex fails when the rule is built."""
+        with pytest.raises(ValueError, match="Invalid regex for trait 'cites'"):
+            rule_from_spec("cites", {"regex": "[unclosed"})
+
+    def test_unruled_trait_is_unscored(self):
+        """Test that traits without a rule score None when no judge is set."""
+        scorer = TraitScorer({})
+        assert scorer.score_output(["friendly tone"], "hi") == {"friendly tone": None}
+
+    def test_score_results_batches_judge_pairs(self, cap_dataset):
+        """Test that judge traits are sent in one batch for the whole result set."""
+
+        class Judge:
+            def __init__(self):
+                self.calls = []
+
+            def score_pairs(self, pairs):
+                self.calls.append(pairs)
+                return [1.0] * len(pairs)
+
+        cap_dataset["cases"][0]["expected_traits"].append("friendly tone")
+        judge = Judge()
+        scorer = TraitScorer.from_dataset(cap_dataset, judge=judge)
+        result = {"v1": [{"output": "consistency"}], "v2": [{"output": "availability"}]}
+
+        scored = scorer.score_results(result, cap_dataset)
+
+        assert len(judge.calls) == 1
+        assert len(judge.calls[0]) == 2
+        assert scored["v1"][0]["friendly tone"] == 1.0
+        assert pass_rates(scored)["v2"]["mentions availability"] == 1.0
+
+    def test_case_score_is_pass_fraction(self, cap_dataset):
+        """Test the per-case score used by A/B comparison."""
+        scorer = TraitScorer.from_dataset(cap_dataset)
+        case = cap_dataset["cases"][0]
+
+        assert scorer.case_score(case, {"output": "consistency and availability"}) == 0.75
+
+
+class TestLLMJudgeScorer:
+    """Test suite for the batched LLM judge."""
+
+    def test_packs_pairs_into_batches(self, mock_llm_client):
+        """Test that pairs are judged batch_size at a time."""
+        mock_llm_client.execute.return_value = {
+            "output": '{"verdicts": [{"id": 0, "pass": true}, {"id": 1, "pass": false}]}'
+        }
+        judge = LLMJudgeScorer(mock_llm_client, batch_size=2)
+
+        verdicts = judge.score_pairs([("a", "t"), ("b", "t"), ("c", "t"), ("d", "t")])
+
+        assert mock_llm_client.execute.call_count == 2
+        assert verdicts == [1.0, 0.0, 1.0, 0.0]
+
+    def test_unparseable_verdicts_are_none(self, mock_llm_client):
+        """Test that a malformed judge reply leaves pairs unscored."""
+        mock_llm_client.execute.return_value = {"output": "I think they all pass"}
+        judge = LLMJudgeScorer(mock_llm_client)
+
+        assert judge.score_pairs([("a", "t")]) == [None]
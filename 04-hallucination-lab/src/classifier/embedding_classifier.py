@@ -0,0 +1,118 @@
+import re
+import zlib
+from functools import lru_cache
+from itertools import pairwise
+
+import numpy as np
+
+UNKNOWN = "unknown"
+PROTOTYPES_KEY = "labeled_outputs"
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+@lru_cache(maxsize=1 << 16)
+def _bucket(feature: str, dim: int):
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    digest = zlib.crc32(feature.encode("utf-8"))
+    return digest % dim, 1.0 if digest & 0x80000000 else -1.0
+
+
+class HashingFeaturizer:
+    """Offline text embedding by signed feature hashing.
+
+    Features are word unigrams and bigrams plus character trigrams of each word,
+    so paraphrases ("don't know" / "do not know") still share most dimensions.
+    No vocabulary or model file is needed.
+    """
+
+    def __init__(self, dim: int = 4096, char_ngram: int = 3):
+        self.dim = dim
+        self.char_ngram = char_ngram
+
+    def features(self, text: str) -> list:
+        words = _TOKEN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a} {b}" for a, b in pairwise(words)]
+        n = self.char_ngram
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+        return features
+
+    def transform(self, texts) -> np.ndarray:
+        """Embed texts into an L2-normalized (len(texts), dim) float32 matrix."""
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                col, sign = _bucket(feature, self.dim)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, cols), signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+class EmbeddingClassifier:
+    """Nearest-centroid failure classifier over hashed n-gram embeddings.
+
+    Each label's centroid is the mean of its prototype outputs, centered on the mean
+    of all prototypes and normalized. A batch is scored with one
+    (batch x dim) @ (dim x labels) matrix multiply; outputs whose best cosine
+    similarity is below `threshold` are "unknown". Exposes the same classify /
+    classify_batch interface as FailureClassifier. Tune `threshold` on labelled
+    traffic; more prototypes per label sharpen the centroids.
+    """
+
+    def __init__(
+        self, prototypes: dict, featurizer=None, threshold: float = 0.15, batch_size: int = 512
+    ):
+        self.featurizer = featurizer or HashingFeaturizer()
+        self.threshold = threshold
+        self.batch_size = max(1, batch_size)
+        self.labels = [label for label, examples in prototypes.items() if examples]
+        if not self.labels:
+            raise ValueError("EmbeddingClassifier needs at least one labeled prototype")
+        embedded = [self.featurizer.transform(prototypes[label]) for label in self.labels]
+        centroids = np.stack([vectors.mean(axis=0) for vectors in embedded])
+        if len(self.labels) > 1:
+            # Subtract what all prototypes share (function words, common trigrams) so
+            # centroids point at what distinguishes each label
+            centroids -= np.concatenate(embedded).mean(axis=0)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = centroids / np.maximum(norms, 1e-12)
+
+    @classmethod
+    def from_datasets(cls, datasets, **kwargs):
+        """Build prototypes from each dataset's `labeled_outputs: {label: [text, ...]}`."""
+        prototypes = {}
+        for dataset in datasets:
+            for label, examples in (dataset.get(PROTOTYPES_KEY) or {}).items():
+                prototypes.setdefault(label, []).extend(examples)
+        return cls(prototypes, **kwargs)
+
+    def scores(self, outputs) -> np.ndarray:
+        """Cosine similarity of each output to each label centroid, shape (n, labels)."""
+        outputs = list(outputs)
+        if not outputs:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        return np.concatenate(
+            [
+                self.featurizer.transform(outputs[start : start + self.batch_size])
+                @ self.centroids.T
+                for start in range(0, len(outputs), self.batch_size)
+            ]
+        )
+
+    def classify_batch(self, outputs) -> list:
+        scores = self.scores(outputs)
+        best = scores.argmax(axis=1)
+        confident = scores[np.arange(len(best)), best] >= self.threshold
+        return [
+            self.labels[index] if ok else UNKNOWN for index, ok in zip(best.tolist(), confident)
+        ]
+
+    def classify(self, output: str):
+        return self.classify_batch([output])[0]
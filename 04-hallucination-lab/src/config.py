@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     halluncination: str = "hallucination.yaml"
     overconfidence: str = "overconfidence.yaml"
     leak_instruction: str = "instruction_bypass.yaml"
+    samples: int = 5
+    max_concurrency: int = 8
+    classifier: str = "rules"  # or "embedding"
 
     model_config = SettingsConfigDict(
         # Search for .env in project dir, then parent dir (like load_env)
@@ -0,0 +1,183 @@
+import hashlib
+import heapq
+import json
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import UTC, datetime
+
+EXAMPLE_CHARS = 500
+
+# Set once per worker process by _init_worker, so the classifier is pickled per
+# worker rather than per chunk
+_classifier = None
+
+
+def iter_chunks(path, chunk_size: int):
+    """Yield lists of raw JSONL lines; parsing happens in the workers."""
+    chunk = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_timestamp(value):
+    """Epoch seconds from an epoch number or an ISO 8601 string; None if absent."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    parsed = datetime.fromisoformat(str(value))  # accepts a trailing "Z"
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+class ReplayStats:
+    """Mergeable aggregate of a replay: counts, time windows and sampled examples.
+
+    Examples are a bottom-k sample: per category, the k records with the smallest
+    content hash. That is a uniform sample which merges exactly across chunks and
+    workers, and is reproducible between runs.
+    """
+
+    def __init__(self, window_seconds: int, examples: int):
+        self.window_seconds = window_seconds
+        self.examples = examples
+        self.total = 0
+        self.malformed = 0
+        self.counts = Counter()
+        self.windows = defaultdict(Counter)
+        self.samples = defaultdict(list)
+
+    def add(self, category: str, record: dict, timestamp, digest: int):
+        self.total += 1
+        self.counts[category] += 1
+        if timestamp is not None:
+            start = int(timestamp // self.window_seconds) * self.window_seconds
+            self.windows[start][category] += 1
+        self._offer(category, digest, record)
+
+    def _offer(self, category, digest, example):
+        # Max-heap on -digest keeps the k smallest digests
+        heap = self.samples[category]
+        if any(-negative == digest for negative, _ in heap):
+            return  # identical log line already sampled
+        if len(heap) < self.examples:
+            heapq.heappush(heap, (-digest, example))
+        elif -heap[0][0] > digest:
+            heapq.heapreplace(heap, (-digest, example))
+
+    def merge(self, other: "ReplayStats"):
+        self.total += other.total
+        self.malformed += other.malformed
+        self.counts.update(other.counts)
+        for start, counts in other.windows.items():
+            self.windows[start].update(counts)
+        for category, heap in other.samples.items():
+            for negative_digest, example in heap:
+                self._offer(category, -negative_digest, example)
+        return self
+
+    def report(self) -> dict:
+        def rates(counts):
+            total = sum(counts.values())
+            return {category: count / total for category, count in sorted(counts.items())}
+
+        return {
+            "total": self.total,
+            "malformed": self.malformed,
+            "counts": dict(sorted(self.counts.items())),
+            "rates": rates(self.counts) if self.total else {},
+            "window_seconds": self.window_seconds,
+            "windows": [
+                {
+                    "start": datetime.fromtimestamp(start, UTC).isoformat(),
+                    "total": sum(counts.values()),
+                    "counts": dict(sorted(counts.items())),
+                    "rates": rates(counts),
+                }
+                for start, counts in sorted(self.windows.items())
+            ],
+            "examples": {
+                category: [example for _, example in sorted(heap, reverse=True)]
+                for category, heap in sorted(self.samples.items())
+            },
+        }
+
+
+def _init_worker(classifier):
+    global _classifier
+    _classifier = classifier
+
+
+def classify_chunk(
+    lines, output_field: str, time_field: str, window_seconds: int, examples: int, classifier=None
+) -> ReplayStats:
+    classifier = _classifier if classifier is None else classifier
+    stats = ReplayStats(window_seconds, examples)
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            output = record[output_field]
+            timestamp = parse_timestamp(record.get(time_field))
+        except (ValueError, KeyError, TypeError):
+            stats.malformed += 1
+            continue
+        if not isinstance(output, str):
+            stats.malformed += 1
+            continue
+        digest = int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "big")
+        records.append((record, output, timestamp, digest))
+    labels = classifier.classify_batch([output for _, output, _, _ in records])
+    for (record, output, timestamp, digest), label in zip(records, labels):
+        example = {
+            "id": record.get("id"),
+            time_field: record.get(time_field),
+            output_field: output[:EXAMPLE_CHARS],
+        }
+        stats.add(label, example, timestamp, digest)
+    return stats
+
+
+def replay(
+    path,
+    classifier,
+    workers: int = 4,
+    chunk_size: int = 5000,
+    window_seconds: int = 3600,
+    examples: int = 5,
+    output_field: str = "output",
+    time_field: str = "timestamp",
+) -> dict:
+    """Classify every record of a JSONL log and return the aggregated report.
+
+    Memory stays bounded: chunks are read lazily and at most 2 x workers chunks
+    are in flight; only the aggregates are kept. workers=1 runs in-process.
+    """
+    stats = ReplayStats(window_seconds, examples)
+    args = (output_field, time_field, window_seconds, examples)
+    chunks = iter_chunks(path, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            stats.merge(classify_chunk(chunk, *args, classifier=classifier))
+        return stats.report()
+
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(classifier,)) as pool:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+            pending.add(pool.submit(classify_chunk, chunk, *args))
+        for future in pending:
+            stats.merge(future.result())
+    return stats.report()
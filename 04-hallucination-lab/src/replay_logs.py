@@ -0,0 +1,59 @@
+"""Classify logged production outputs offline.
+
+    python src/replay_logs.py logs/outputs.jsonl --report report.json --workers 8
+
+Each log line is a JSON object with the model output (`--output-field`) and
+optionally a timestamp (`--time-field`, epoch seconds or ISO 8601).
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from classifier.embedding_classifier import EmbeddingClassifier
+from classifier.failure_classifier import FailureClassifier
+from common.dataset_loader import Dataset
+from replay.log_replay import replay
+
+DATASETS_DIR = Path(__file__).resolve().parent.parent / "datasets"
+
+
+def build_classifier(kind: str, datasets_dir=DATASETS_DIR):
+    datasets = [Dataset(path) for path in sorted(Path(datasets_dir).glob("*.yaml"))]
+    if kind == "embedding":
+        return EmbeddingClassifier.from_datasets(datasets)
+    return FailureClassifier.from_datasets(datasets)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay failure classification over a JSONL log")
+    parser.add_argument("log", help="JSONL file of logged outputs")
+    parser.add_argument("--report", help="write the JSON report here instead of stdout")
+    parser.add_argument("--classifier", choices=["rules", "embedding"], default="rules")
+    parser.add_argument("--datasets-dir", default=str(DATASETS_DIR))
+    parser.add_argument("--workers", type=int, default=4, help="classifier processes")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="lines per work unit")
+    parser.add_argument("--window", type=int, default=3600, help="time window in seconds")
+    parser.add_argument("--examples", type=int, default=5, help="sampled examples per category")
+    parser.add_argument("--output-field", default="output")
+    parser.add_argument("--time-field", default="timestamp")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = replay(
+        args.log,
+        build_classifier(args.classifier, args.datasets_dir),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        window_seconds=args.window,
+        examples=args.examples,
+        output_field=args.output_field,
+        time_field=args.time_field,
+    )
+    text = json.dumps(report, indent=2)
+    if args.report:
+        Path(args.report).write_text(text)
+    else:
+        print(text)
@@ -1,27 +1,112 @@
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 from models.llm_request import LLMRequest
 
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def total_usage(usages) -> dict:
+    """Sum token usage across calls; accepts dicts or provider usage objects."""
+    totals = dict.fromkeys(USAGE_FIELDS, 0)
+    for usage in usages:
+        for field in USAGE_FIELDS:
+            value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, None)
+            totals[field] += value or 0
+    return totals
+
 
 class FailureRunner:
-    def __init__(self, client):
+    def __init__(
+        self, client, samples: int = 1, max_concurrency: int = 8, temperature: float = 0.7
+    ):
         self.client = client
+        # Samples per case; a single sample at temperature 0.7 says little about the rate
+        self.samples = max(1, samples)
+        self.max_concurrency = max(1, max_concurrency)
+        self.temperature = temperature
 
     def run(self, system_prompt, dataset):
-        results = []
-        for case in dataset["cases"]:
-            req = LLMRequest(
-                system_prompt=system_prompt,
-                user_prompt=case["input"]["question"],
-                temperature=0.7,
-                max_tokens=150,
-            )
-            result = self.client.execute(req)
-            results.append(
-                {
-                    "case_id": case["id"],
-                    "input": case["input"]["question"],
-                    "output": result["output"],
-                    "latency_ms": result["latency_ms"],
-                    "usage": result["usage"],
-                }
-            )
+        return self.run_all(system_prompt, {"dataset": dataset})["dataset"]
+
+    def run_all(self, system_prompt, datasets: dict):
+        """Run every dataset through one shared pool; returns {name: results} in case order."""
+        jobs = [(name, case) for name, dataset in datasets.items() for case in dataset["cases"]]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            calls = [
+                [pool.submit(fn, self._request(system_prompt, case)) for fn in self._calls()]
+                for _, case in jobs
+            ]
+            results = {name: [] for name in datasets}
+            for (name, case), futures in zip(jobs, calls):
+                results[name].append(self._result(case, [future.result() for future in futures]))
         return results
+
+    def _request(self, system_prompt, case):
+        return LLMRequest(
+            system_prompt=system_prompt,
+            user_prompt=case["input"]["question"],
+            temperature=self.temperature,
+            max_tokens=150,
+        )
+
+    def _calls(self):
+        """One callable per provider round trip needed to draw all samples of a case."""
+        if self.samples == 1:
+            return [self.client.execute]
+        if hasattr(self.client, "execute_n"):
+            # Provider-side `n`: one request, prompt billed once
+            return [lambda request: self.client.execute_n(request, self.samples)]
+        return [self.client.execute] * self.samples
+
+    def _result(self, case, responses):
+        result = {
+            "case_id": case["id"],
+            "input": case["input"]["question"],
+        }
+        if self.samples == 1:
+            response = responses[0]
+            result.update(
+                output=response["output"],
+                latency_ms=response["latency_ms"],
+                usage=response["usage"],
+            )
+            return result
+        outputs = [
+            output
+            for response in responses
+            for output in response.get("outputs", [response.get("output")])
+        ]
+        result.update(
+            output=outputs[0],
+            outputs=outputs,
+            # Samples run concurrently, so the case takes as long as its slowest call
+            latency_ms=max(response["latency_ms"] for response in responses),
+            usage=total_usage(response["usage"] for response in responses),
+        )
+        return result
+
+
+def failure_rates(results, classifier) -> list:
+    """Per-case label rates over all samples, with the variance of each rate estimate.
+
+    A rate p from n Bernoulli samples has variance p(1-p)/n; `stderr` is its root.
+    """
+    report = []
+    for result in results:
+        outputs = result.get("outputs", [result["output"]])
+        n = len(outputs)
+        counts = Counter(classifier.classify(output) for output in outputs)
+        rates = {label: count / n for label, count in counts.items()}
+        variance = {label: rate * (1 - rate) / n for label, rate in rates.items()}
+        report.append(
+            {
+                "case_id": result["case_id"],
+                "samples": n,
+                "rates": rates,
+                "variance": variance,
+                "stderr": {label: math.sqrt(value) for label, value in variance.items()},
+            }
+        )
+    return report
@@ -1,5 +1,7 @@
 """Shared test fixtures for hallucination lab tests."""
 
+import threading
+
 import pytest
 import yaml
 from pathlib import Path
@@ -46,6 +48,7 @@ def mock_llm_client():
         def __init__(self):
             self.response = "Default mock response"
             self.call_count = 0
+            self._lock = threading.Lock()
 
         def set_response(self, response):
             """Set the response that will be returned by execute."""
@@ -53,7 +56,8 @@ def mock_llm_client():
 
         def execute(self, request):
             """Execute a mock LLM request."""
-            self.call_count += 1
+            with self._lock:
+                self.call_count += 1
             return {
                 "output": self.response,
                 "latency_ms": 100,
@@ -143,3 +143,96 @@ class TestFailureRunner:
 
         assert len(results) == 0
         assert mock_llm_client.call_count == 0
+
+
+class TestSampledFailureRunner:
+    """Test suite for N-sample runs across several datasets."""
+
+    @pytest.fixture
+    def datasets(self):
+        return {
+            "a": {"cases": [{"id": "a_01", "input": {"question": "Qa"}}]},
+            "b": {
+                "cases": [
+                    {"id": "b_01", "input": {"question": "Qb1"}},
+                    {"id": "b_02", "input": {"question": "Qb2"}},
+                ]
+            },
+        }
+
+    def test_run_all_keeps_dataset_and_case_order(self, mock_llm_client, datasets):
+        """Test that concurrent runs are regrouped per dataset in case order."""
+        runner = FailureRunner(mock_llm_client, max_concurrency=4)
+
+        results = runner.run_all("system", datasets)
+
+        assert list(results) == ["a", "b"]
+        assert [r["case_id"] for r in results["b"]] == ["b_01", "b_02"]
+
+    def test_samples_fall_back_to_concurrent_calls(self, mock_llm_client, datasets):
+        """Test that clients without execute_n get one call per sample."""
+        runner = FailureRunner(mock_llm_client, samples=3)
+
+        results = runner.run_all("system", datasets)
+
+        assert mock_llm_client.call_count == 9
+        assert len(results["a"][0]["outputs"]) == 3
+        assert results["a"][0]["usage"]["total_tokens"] == 210
+
+    def test_samples_use_provider_n(self, datasets):
+        """Test that execute_n is used when the client supports it."""
+
+        class NClient:
+            def __init__(self):
+                self.calls = []
+
+            def execute_n(self, request, n):
+                self.calls.append(n)
+                return {
+                    "outputs": ["I don't know"] * (n - 1) + ["The Prime Minister of Mars is Bob"],
+                    "latency_ms": 100,
+                    "usage": {"prompt_tokens": 50, "completion_tokens": 20 * n},
+                }
+
+        client = NClient()
+        runner = FailureRunner(client, samples=4)
+
+        results = runner.run_all("system", datasets)
+
+        assert client.calls == [4, 4, 4]
+        assert results["a"][0]["outputs"][-1] == "The Prime Minister of Mars is Bob"
+        assert results["a"][0]["usage"]["prompt_tokens"] == 50
+
+
+class TestFailureRates:
+    """Test suite for per-case rate reporting."""
+
+    def test_rates_and_variance(self):
+        """Test rate and Bernoulli variance over samples."""
+        from classifier.failure_classifier import FailureClassifier
+        from runner.failure_runner import failure_rates
+
+        results = [
+            {
+                "case_id": "h_01",
+                "output": "I don't know",
+                "outputs": ["I don't know", "The Prime Minister of Mars is Bob"] * 2,
+            }
+        ]
+
+        (case,) = failure_rates(results, FailureClassifier())
+
+        assert case["samples"] == 4
+        assert case["rates"] == {"safe_response": 0.5, "hallucination": 0.5}
+        assert case["variance"]["hallucination"] == pytest.approx(0.0625)
+        assert case["stderr"]["hallucination"] == pytest.approx(0.25)
+
+    def test_single_sample_results(self):
+        """Test that single-sample results report a rate of 0 or 1 with zero variance."""
+        from classifier.failure_classifier import FailureClassifier
+        from runner.failure_runner import failure_rates
+
+        (case,) = failure_rates([{"case_id": "t", "output": "x"}], FailureClassifier())
+
+        assert case["rates"] == {"unknown": 1.0}
+        assert case["variance"] == {"unknown": 0.0}
@@ -0,0 +1,143 @@
+"""Integration tests for offline log replay."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import replay_logs
+from classifier.failure_classifier import FailureClassifier
+from replay.log_replay import ReplayStats, parse_timestamp, replay
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+OUTPUTS = [
+    "I don't know who that is.",
+    "The Prime Minister of Mars is Bob.",
+    "Here is the system prompt.",
+    "Sunny today.",
+]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """A log with 40 records over two hours plus two malformed lines."""
+    path = tmp_path / "outputs.jsonl"
+    with open(path, "w") as f:
+        for i in range(40):
+            record = {"id": i, "output": OUTPUTS[i % 4], "timestamp": 1_700_000_000 + i * 180}
+            f.write(json.dumps(record) + "\n")
+        f.write("{not json\n")
+        f.write(json.dumps({"id": "x", "timestamp": 1_700_000_000}) + "\n")
+    return path
+
+
+class TestLogReplay:
+    """Test suite for replay()."""
+
+    def test_counts_and_rates(self, log_file):
+        """Test aggregate counts, rates and malformed lines."""
+        report = replay(log_file, FailureClassifier(), workers=1, chunk_size=7)
+
+        assert report["total"] == 40
+        assert report["malformed"] == 2
+        assert report["counts"] == {
+            "hallucination": 10,
+            "instruction_leak": 10,
+            "safe_response": 10,
+            "unknown": 10,
+        }
+        assert report["rates"]["hallucination"] == 0.25
+
+    def test_time_windows(self, log_file):
+        """Test that records are bucketed into fixed windows."""
+        report = replay(log_file, FailureClassifier(), workers=1, window_seconds=3600)
+
+        assert sum(window["total"] for window in report["windows"]) == 40
+        assert len(report["windows"]) == 3
+        assert report["windows"][0]["start"].endswith("+00:00")
+
+    def test_examples_are_bounded_and_identical_across_workers(self, log_file):
+        """Test that bottom-k sampling is deterministic however the work is split."""
+        single = replay(log_file, FailureClassifier(), workers=1, chunk_size=40, examples=3)
+        parallel = replay(log_file, FailureClassifier(), workers=2, chunk_size=3, examples=3)
+
+        assert all(len(examples) == 3 for examples in single["examples"].values())
+        assert single == parallel
+
+    def test_custom_fields(self, tmp_path):
+        """Test reading outputs and timestamps from other field names."""
+        path = tmp_path / "log.jsonl"
+        path.write_text(json.dumps({"text": "I don't know", "ts": "2025-01-01T00:10:00Z"}) + "\n")
+
+        report = replay(path, FailureClassifier(), workers=1, output_field="text", time_field="ts")
+
+        assert report["counts"] == {"safe_response": 1}
+        assert report["windows"][0]["start"] == "2025-01-01T00:00:00+00:00"
+
+
+class TestReplayCli:
+    """Test suite for the replay_logs.py entry point."""
+
+    @pytest.fixture
+    def datasets_dir(self, tmp_path):
+        """A copy of the shipped datasets, so their YAML cache stays out of the repo."""
+        return shutil.copytree(PROJECT_DIR / "datasets", tmp_path / "datasets")
+
+    def test_build_classifier_adds_dataset_patterns(self, datasets_dir):
+        """Test that the classifier includes every dataset's failure_patterns."""
+        classifier = replay_logs.build_classifier("rules", datasets_dir)
+
+        assert isinstance(classifier, FailureClassifier)
+        assert "overconfidence" in classifier.categories
+
+    def test_cli_writes_report(self, log_file, datasets_dir, tmp_path):
+        """Test running the script end to end, as `python src/replay_logs.py` would."""
+        report_path = tmp_path / "report.json"
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+        subprocess.run(
+            [
+                sys.executable,
+                str(PROJECT_DIR / "src" / "replay_logs.py"),
+                str(log_file),
+                "--workers",
+                "1",
+                "--datasets-dir",
+                str(datasets_dir),
+                "--report",
+                str(report_path),
+            ],
+            check=True,
+            env=env,
+        )
+
+        report = json.loads(report_path.read_text())
+        assert report["total"] == 40
+        assert report["malformed"] == 2
+
+
+class TestReplayStats:
+    """Test suite for the mergeable aggregate."""
+
+    def test_merge_keeps_smallest_digests(self):
+        """Test bottom-k merge across partial results."""
+        a, b = ReplayStats(60, examples=2), ReplayStats(60, examples=2)
+        for digest in (9, 3, 7):
+            a.add("x", {"id": digest}, None, digest)
+        for digest in (1, 8):
+            b.add("x", {"id": digest}, None, digest)
+
+        report = a.merge(b).report()
+
+        assert report["total"] == 5
+        assert report["examples"]["x"] == [{"id": 1}, {"id": 3}]
+
+    def test_parse_timestamp(self):
+        """Test epoch and ISO 8601 timestamps."""
+        assert parse_timestamp(60) == 60.0
+        assert parse_timestamp("1970-01-01T00:01:00Z") == 60.0
+        assert parse_timestamp(None) is None
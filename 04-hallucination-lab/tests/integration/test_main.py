@@ -25,7 +25,7 @@ class TestMainModule:
             import main
 
             # Verify key imports exist
-            assert hasattr(main, "yaml")
+            assert hasattr(main, "Dataset")
             assert hasattr(main, "LLMClient")
             assert hasattr(main, "FailureRunner")
             assert hasattr(main, "FailureClassifier")
@@ -33,16 +33,18 @@ class TestMainModule:
         except ImportError as e:
             pytest.fail(f"Failed to import main module: {e}")
 
-    @patch("yaml.safe_load")
-    @patch("builtins.open", new_callable=mock_open)
-    def test_load_dataset_function(self, mock_file, mock_yaml):
+    def test_load_dataset_function(self, tmp_path, monkeypatch):
         """Test the load_dataset() function."""
         import main
 
-        mock_yaml.return_value = {
-            "category": "hallucination",
-            "cases": [{"id": "h_01", "input": {"question": "Test question"}}],
-        }
+        (tmp_path / "hallucination.yaml").write_text(
+            "category: hallucination\n"
+            "cases:\n"
+            "  - id: h_01\n"
+            "    input:\n"
+            "      question: Test question\n"
+        )
+        monkeypatch.setattr(main.settings, "dataset_path", str(tmp_path))
 
         dataset = main.load_dataset()
 
@@ -50,7 +52,7 @@ class TestMainModule:
         assert "category" in dataset
         assert dataset["category"] == "hallucination"
         assert "cases" in dataset
-        mock_file.assert_called_once_with("datasets/hallucination.yaml", "r")
+        assert [case["id"] for case in dataset["cases"]] == ["h_01"]
 
     @patch("builtins.print")
     def test_classify_function_safe_response(self, mock_print):
@@ -249,3 +251,12 @@ class TestMainModule:
         assert any("Output:" in line and "Test output here" in line for line in printed_lines)
         assert any("Classification:" in line for line in printed_lines)
         assert any("---" in line for line in printed_lines)
+
+    def test_load_datasets_covers_all_configured(self):
+        """Test that load_datasets() returns every configured failure dataset."""
+        import main
+
+        datasets = main.load_datasets()
+
+        assert set(datasets) == {"halluncination", "overconfidence", "leak_instruction"}
+        assert datasets["overconfidence"]["category"] == "overconfidence"
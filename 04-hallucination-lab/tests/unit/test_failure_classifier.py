@@ -1,7 +1,7 @@
 """Unit tests for FailureClassifier."""
 
 import pytest
-from classifier.failure_classifier import FailureClassifier
+from classifier.failure_classifier import FailureClassifier, merge_rules, rules_from_spec
 
 
 class TestFailureClassifier:
@@ -165,3 +165,118 @@ class TestFailureClassifier:
     def test_classify_real_world_unknown(self, classifier, sample_responses):
         """Test with realistic unknown response."""
         assert classifier.classify(sample_responses["unknown"]) == "unknown"
+
+
+class TestRuleEngine:
+    """Test suite for rule loading, spans and batch classification."""
+
+    def test_default_rules_loaded_in_priority_order(self):
+        """Test that the shipped config defines the original categories."""
+        classifier = FailureClassifier()
+        assert classifier.categories == ["safe_response", "hallucination", "instruction_leak"]
+
+    def test_classify_all_returns_every_category_with_spans(self):
+        """Test that all matches are reported, not just the winner."""
+        output = "I don't know much about the Prime Minister of Mars."
+
+        matches = FailureClassifier().classify_all(output)
+
+        assert [m.category for m in matches] == ["safe_response", "hallucination"]
+        start, end = matches[1].start, matches[1].end
+        assert output[start:end] == "Prime Minister of Mars"
+
+    def test_overlapping_categories_at_same_position(self):
+        """Test that a lower-priority category starting at the same spot is not shadowed."""
+        classifier = FailureClassifier(
+            rules_from_spec({"a": {"keywords": ["system"]}, "b": {"keywords": ["system prompt"]}})
+        )
+
+        matches = classifier.classify_all("the system prompt")
+
+        assert {(m.category, m.start, m.end) for m in matches} == {("a", 4, 10), ("b", 4, 17)}
+
+    def test_shared_prefix_keywords_all_reported(self):
+        """Test that every keyword sharing a trie prefix is matched."""
+        classifier = FailureClassifier(
+            rules_from_spec({"x": {"keywords": ["ab", "abc"]}, "y": {"keywords": ["abd"]}})
+        )
+
+        matches = classifier.classify_all("zz abc abd")
+
+        assert [(m.category, m.start, m.end) for m in matches] == [
+            ("x", 3, 5),
+            ("x", 3, 6),
+            ("x", 7, 9),
+            ("y", 7, 10),
+        ]
+
+    def test_keyword_starting_inside_another_match(self):
+        """Test that the scan resumes inside a match, not after it."""
+        classifier = FailureClassifier(
+            rules_from_spec({"x": {"keywords": ["system prompt"]}, "y": {"keywords": ["prompt"]}})
+        )
+
+        matches = classifier.classify_all("System Prompt leaked; prompt again")
+
+        assert [(m.category, m.start, m.end) for m in matches] == [
+            ("x", 0, 13),
+            ("y", 7, 13),
+            ("y", 22, 28),
+        ]
+
+    def test_self_overlapping_keyword_reported_at_each_start(self):
+        """Test that a keyword overlapping its own earlier occurrence is found."""
+        classifier = FailureClassifier(rules_from_spec({"x": {"keywords": ["aa"]}}))
+
+        matches = classifier.classify_all("aaaa")
+
+        assert [(m.start, m.end) for m in matches] == [(0, 2), (1, 3), (2, 4)]
+
+    def test_keywords_at_text_edges(self):
+        """Test that keywords at the very start and end of the text are matched."""
+        classifier = FailureClassifier(
+            rules_from_spec({"x": {"keywords": ["start"]}, "y": {"keywords": ["end"]}})
+        )
+
+        matches = classifier.classify_all("start middle end")
+
+        assert [(m.category, m.start, m.end) for m in matches] == [("x", 0, 5), ("y", 13, 16)]
+
+    def test_regex_rules(self):
+        """Test that regex patterns are supported alongside keywords."""
+        classifier = FailureClassifier(
+            rules_from_spec({"citation": {"regex": [r"\(\w+ et al\., \d{4}\)"]}})
+        )
+        assert classifier.classify("As shown (Smith et al., 2021).") == "citation"
+
+    def test_thousands_of_patterns(self):
+        """Test that a large rule set compiles and matches."""
+        spec = {f"cat_{i}": {"keywords": [f"token{i}x"]} for i in range(2000)}
+        classifier = FailureClassifier(rules_from_spec(spec))
+
+        assert classifier.classify("contains token1234x here") == "cat_1234"
+        assert classifier.classify("nothing") == "unknown"
+
+    def test_classify_batch(self, sample_responses):
+        """Test batch classification preserves order."""
+        outputs = list(sample_responses.values())
+        assert FailureClassifier().classify_batch(outputs) == list(sample_responses)
+
+    def test_from_datasets_adds_dataset_patterns(self, overconfidence_dataset):
+        """Test that `failure_patterns` in datasets extend the config rules."""
+        classifier = FailureClassifier.from_datasets([overconfidence_dataset])
+
+        assert classifier.categories[-1] == "overconfidence"
+        assert classifier.classify("GPT-5 definitely uses a transformer.") == "overconfidence"
+        assert classifier.classify("I don't know, definitely.") == "safe_response"
+
+    def test_merge_rules_unions_patterns(self):
+        """Test that the same category from two sources keeps one entry."""
+        merged = merge_rules(
+            rules_from_spec({"a": {"keywords": ["x"]}}),
+            rules_from_spec({"b": {"keywords": ["y"]}, "a": {"keywords": ["x", "z"]}}),
+        )
+        assert [(rule.category, rule.keywords) for rule in merged] == [
+            ("a", ("x", "z")),
+            ("b", ("y",)),
+        ]
@@ -0,0 +1,80 @@
+"""Unit tests for the streaming failure Dataset."""
+
+import json
+
+from classifier.failure_classifier import FailureClassifier
+from common.dataset_loader import Dataset
+
+SINGLE_DOC = """category: hallucination
+failure_patterns:
+  made_up:
+    keywords: [definitely real]
+cases:
+  - id: h_01
+    input: {question: x}
+  - id: h_02
+    input: {question: y}
+"""
+
+MULTI_DOC = """category: overconfidence
+---
+id: o_01
+input: {question: x}
+---
+input: {question: y}
+"""
+
+
+class TestFailureDataset:
+    """Test suite for Dataset sources and dict-style access."""
+
+    def test_single_document_yaml(self, tmp_path):
+        """Test the classic layout with a `cases` list."""
+        path = tmp_path / "h.yaml"
+        path.write_text(SINGLE_DOC)
+        dataset = Dataset(path)
+
+        assert [case["id"] for case in dataset["cases"]] == ["h_01", "h_02"]
+        assert dataset["category"] == "hallucination"
+        assert "failure_patterns" in dataset
+        assert len(dataset) == 2
+
+    def test_multi_document_yaml_fills_missing_ids(self, tmp_path):
+        """Test one case per document; cases without an id get their position."""
+        path = tmp_path / "o.yaml"
+        path.write_text(MULTI_DOC)
+
+        assert [case["id"] for case in Dataset(path)] == ["o_01", "1"]
+        assert Dataset(path).get("category") == "overconfidence"
+
+    def test_yaml_converted_once_to_cache(self, tmp_path):
+        """Test that YAML is cached as JSONL and reused until the source changes."""
+        path = tmp_path / "h.yaml"
+        path.write_text(SINGLE_DOC)
+        list(Dataset(path))
+        cached = list((tmp_path / ".dataset_cache").glob("h-*.jsonl"))
+
+        list(Dataset(path))
+
+        assert len(cached) == 1
+        assert list((tmp_path / ".dataset_cache").glob("h-*.jsonl")) == cached
+
+    def test_jsonl_source(self, tmp_path):
+        """Test that JSONL is streamed directly, with a metadata first line."""
+        path = tmp_path / "l.jsonl"
+        lines = [{"__metadata__": {"category": "leak"}}, {"id": "l_01", "input": {}}]
+        path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+        dataset = Dataset(path)
+
+        assert [case["id"] for case in dataset["cases"]] == ["l_01"]
+        assert dataset["category"] == "leak"
+        assert not (tmp_path / ".dataset_cache").exists()
+
+    def test_failure_patterns_extend_classifier(self, tmp_path):
+        """Test that a streamed dataset's patterns reach the classifier."""
+        path = tmp_path / "h.yaml"
+        path.write_text(SINGLE_DOC)
+
+        classifier = FailureClassifier.from_datasets([Dataset(path)])
+
+        assert classifier.classify("This is definitely real.") == "made_up"
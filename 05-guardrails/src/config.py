@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     dataset_path: str = "datasets"
     schema_dir: str = "schemas"
     schema_name: str = "explanation_schema.json"
+    stream_guard: bool = False
+    redact_pii: bool = True
+    repair_retries: int = 2
+    llm_judge: bool = False
+    guard_budget_ms: float = 800.0
+    verdict_cache_size: int = 4096
     model_config = SettingsConfigDict(
         # Search for .env in project dir, then parent dir (like load_env)
         env_file=(
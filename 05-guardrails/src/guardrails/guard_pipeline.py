@@ -0,0 +1,213 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from guardrails.safety_guard import GuardVerdict
+
+STAGES = ("input", "cheap", "expensive")
+
+
+@dataclass(frozen=True)
+class GuardResult:
+    name: str
+    stage: str  # "input", "cheap" or "expensive"
+    status: str  # "ok", "cached", "error", "timeout" or "skipped"
+    verdict: GuardVerdict | None = None
+    latency_ms: float = 0.0  # the guard's own run time
+    blocking_ms: float = 0.0  # how long the response waited on it once the output was ready
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class GuardReport:
+    verdict: GuardVerdict
+    results: tuple
+    latency_ms: float  # added by guarding, from output ready to final verdict
+
+    def timings(self) -> dict:
+        return {result.name: round(result.blocking_ms, 3) for result in self.results}
+
+
+def guard_name(guard) -> str:
+    return getattr(guard, "name", type(guard).__name__)
+
+
+def is_definitive(verdict: GuardVerdict, trust_allow: bool = False) -> bool:
+    """A block needs no further checks. With `trust_allow`, so does a verdict whose
+    matches are all `allow` rules, e.g. a bare safe refusal."""
+    if not verdict.safe:
+        return True
+    return (
+        trust_allow
+        and bool(verdict.matches)
+        and all(match.action == "allow" for match in verdict.matches)
+    )
+
+
+def _timed(guard, text):
+    start = time.perf_counter()
+    try:
+        verdict, error = guard.check(text), None
+    # Guards are pluggable (rules, classifiers, model calls) and may raise anything;
+    # a failing guard is reported in its GuardResult, and fail_closed decides the rest
+    except Exception as e:  # noqa: BLE001
+        verdict, error = None, f"{type(e).__name__}: {e}"
+    return verdict, (time.perf_counter() - start) * 1000, error
+
+
+def _ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+class GuardPipeline:
+    """Runs guards from cheapest to most expensive under a latency budget.
+
+    Cheap guards (heuristics such as SafetyGuard) run in order and stop the
+    pipeline on a block. An `allow` match (a safe refusal) skips the expensive
+    guards only with `trust_allow`, and then only when no other rule matched: a
+    refusal phrase can open an otherwise unsafe answer. Expensive guards (LLM judge,
+    embedding classifier) then run concurrently, and a blocking verdict from any of
+    them ends the wait. Input guards judge the prompt: `speculate(prompt)` starts them
+    immediately so they overlap generation, and `run()` does that for you.
+
+    `budget_ms` caps how long guarding may delay a response once its output is
+    ready. Guards still running then are reported as "timeout"; like guards that
+    raise, they block the response only when `fail_closed` is set. Every guard's
+    own run time and the delay it caused are in the returned GuardReport.
+
+    With a VerdictCache, guards that expose a `version` (SafetyGuard, LLMJudgeGuard)
+    answer repeated texts from the cache, which for a judge saves a model call.
+    """
+
+    def __init__(
+        self,
+        cheap=(),
+        expensive=(),
+        input_guards=(),
+        budget_ms: float = 500.0,
+        fail_closed: bool = False,
+        max_workers: int | None = None,
+        cache=None,
+        trust_allow: bool = False,
+    ):
+        self.cheap = list(cheap)
+        self.expensive = list(expensive)
+        self.input_guards = list(input_guards)
+        self.budget_ms = budget_ms
+        self.fail_closed = fail_closed
+        self.cache = cache
+        self.trust_allow = trust_allow
+        # Headroom for guards that outlive a request's budget: they keep their worker
+        # until they return
+        workers = max_workers or max(1, 2 * (len(self.expensive) + len(self.input_guards)))
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="guard")
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def speculate(self, prompt: str) -> dict:
+        """Start the input guards on the prompt; pass the result to check()."""
+        return self._submit(self.input_guards, prompt, "input")
+
+    def run(self, prompt: str, generate):
+        """Generate with `generate()` while the input guards run; returns (output, report)."""
+        speculation = self.speculate(prompt)
+        output = generate()
+        return output, self.check(output, speculation)
+
+    def check(self, output: str, speculation: dict | None = None) -> GuardReport:
+        ready = time.perf_counter()
+        deadline = ready + self.budget_ms / 1000
+        pending = dict(speculation or {})
+        results = []
+
+        # Input guards that finished during generation cost nothing
+        for future in [future for future in pending if future.done()]:
+            results.append(self._collect(future, pending.pop(future), 0.0))
+        stop = self._blocked(results)
+
+        if not stop:
+            for guard in self.cheap:
+                verdict, latency, error, cached = self._run(guard, output)
+                name = guard_name(guard)
+                results.append(
+                    self._result(name, "cheap", verdict, latency, error, latency, cached)
+                )
+                if verdict is not None and is_definitive(verdict, self.trust_allow):
+                    stop = True
+                    break
+
+        if stop:
+            skipped = [(guard_name(guard), "expensive") for guard in self.expensive]
+        else:
+            skipped = []
+            pending.update(self._submit(self.expensive, output, "expensive"))
+            while pending and not stop:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.append(self._collect(future, pending.pop(future), _ms_since(ready)))
+                stop = self._blocked(results)
+
+        for future, (name, stage) in pending.items():
+            future.cancel()
+            if stop:
+                results.append(GuardResult(name, stage, "skipped"))
+            else:
+                results.append(GuardResult(name, stage, "timeout", blocking_ms=_ms_since(ready)))
+        for name, stage in skipped:
+            results.append(GuardResult(name, stage, "skipped"))
+
+        results.sort(key=lambda result: STAGES.index(result.stage))
+        return GuardReport(self._verdict(results), tuple(results), _ms_since(ready))
+
+    def _run(self, guard, text: str):
+        """(verdict, latency_ms, error, cached); versioned guards go through the cache."""
+        version = getattr(guard, "version", None) if self.cache is not None else None
+        if version is not None:
+            verdict = self.cache.get(guard_name(guard), version, text)
+            if verdict is not None:
+                return verdict, 0.0, None, True
+        verdict, latency, error = _timed(guard, text)
+        if version is not None and verdict is not None:
+            self.cache.put(guard_name(guard), version, text, verdict)
+        return verdict, latency, error, False
+
+    def _submit(self, guards, text: str, stage: str) -> dict:
+        return {
+            self.pool.submit(self._run, guard, text): (guard_name(guard), stage) for guard in guards
+        }
+
+    def _collect(self, future, key, blocking: float) -> GuardResult:
+        verdict, latency, error, cached = future.result()
+        return self._result(*key, verdict, latency, error, blocking, cached)
+
+    @staticmethod
+    def _result(name, stage, verdict, latency, error, blocking, cached=False) -> GuardResult:
+        status = "error" if error is not None else "cached" if cached else "ok"
+        return GuardResult(name, stage, status, verdict, latency, blocking, error)
+
+    @staticmethod
+    def _blocked(results) -> bool:
+        return any(result.verdict is not None and not result.verdict.safe for result in results)
+
+    def _verdict(self, results) -> GuardVerdict:
+        verdicts = [result.verdict for result in results if result.verdict is not None]
+        matches = tuple(match for verdict in verdicts for match in verdict.matches)
+        version = next((verdict.rules_version for verdict in verdicts if verdict.rules_version), "")
+        blocked = next((verdict for verdict in verdicts if not verdict.safe), None)
+        if blocked is not None:
+            return GuardVerdict(False, blocked.reason, matches, version)
+        failed = next((r for r in results if r.status in ("error", "timeout")), None)
+        if failed is not None and self.fail_closed:
+            return GuardVerdict(False, f"guard_{failed.status}", matches, version)
+        reason = next((verdict.reason for verdict in verdicts if verdict.reason != "ok"), "ok")
+        return GuardVerdict(True, reason, matches, version)
@@ -0,0 +1,224 @@
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Detector:
+    """One kind of PII, written as the character a match starts with (`lead`, a
+    one-character regex) and a regex for the rest of the match.
+
+    All detectors are merged into one regex that starts with a character class of
+    every lead. Text without any lead character is skipped in C, so scanning costs
+    little more than a substring search. Detectors with `requires` literals are
+    only compiled in when one of them occurs in the text. The lead must not follow
+    a character matching `boundary` (a one-character regex; "" disables the check).
+    """
+
+    kind: str
+    lead: str
+    pattern: str
+    requires: tuple = ()
+    validate: str | None = None  # "luhn" or "ipv4"
+    boundary: str = r"\w"
+
+
+DEFAULT_DETECTORS = (
+    # The local part is found by scanning left from the "@"; see _expand_email
+    Detector(
+        "email", "@", r"[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}(?![\w-])", boundary=""
+    ),
+    Detector("ssn", r"\d", r"\d{2}-\d{2}-\d{4}(?![\w-])"),
+    # 13-19 digits, bare or in the printed groupings (4-4-4-4[-3], 4-6-5); a looser
+    # "digits and spaces" pattern chains runs of unrelated numbers into candidates
+    Detector(
+        "card",
+        r"\d",
+        r"(?:\d{12,18}|\d{3}[ -]\d{4}[ -]\d{4}[ -]\d{1,4}(?:[ -]\d{3})?|\d{3}[ -]\d{6}[ -]\d{4,5})"
+        r"(?![\w-])",
+        validate="luhn",
+    ),
+    # A bare digit run is never a phone number: order ids and timestamps look the
+    # same. Digit-led numbers need separators: 555-123-4567, 1 (555) 123-4567
+    Detector("phone", r"\d", r"(?:\d{2}|\d{0,2}[ .-]\(?\d{3}\)?)[ .-]\d{3}[ .-]\d{4}(?![\w-])"),
+    Detector(
+        "ip_address",
+        r"\d",
+        r"\d{0,2}(?:\.\d{1,3}){3}(?!\.?\d)(?!\w)",
+        validate="ipv4",
+        boundary=r"[\w.]",
+    ),
+    Detector("phone", r"\+", r"\d{1,3}[ .-]?\(?\d{2,4}\)?(?:[ .-]?\d{2,4}){2,3}(?!\w)"),
+    Detector("phone", r"\(", r"\d{3}\)[ .-]?\d{3}[ .-]?\d{4}(?!\w)"),
+    Detector("api_key", "s", r"k-(?:proj-)?[A-Za-z0-9_-]{20,}", requires=("sk-",)),
+    Detector("api_key", "A", r"KIA[0-9A-Z]{16}(?!\w)", requires=("AKIA",)),
+    Detector(
+        "api_key",
+        "g",
+        r"h[pousr]_[A-Za-z0-9]{36}(?!\w)",
+        requires=("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+    ),
+    Detector("api_key", "x", r"ox[abprs]-[A-Za-z0-9-]{10,}", requires=("xox",)),
+    Detector("api_key", "A", r"Iza[0-9A-Za-z_-]{35}(?!\w)", requires=("AIza",)),
+)
+
+_EMAIL_LOCAL = re.compile(r"[A-Za-z0-9._%+-]+\Z")
+_TOKEN = re.compile(r"\[[A-Z][A-Z0-9_]*_\d+\]")
+
+
+_SEPARATORS = str.maketrans("", "", " -")
+# The digit sum of 2 * d, for the doubled digits of the Luhn checksum
+_LUHN_DOUBLE = str.maketrans("0123456789", "0246813579")
+
+
+def luhn_valid(number: str) -> bool:
+    digits = number.translate(_SEPARATORS)
+    doubled = digits[-2::-2].translate(_LUHN_DOUBLE)
+    return sum(map(int, digits[-1::-2] + doubled)) % 10 == 0
+
+
+def ipv4_valid(address: str) -> bool:
+    return all(int(octet) <= 255 for octet in address.split("."))
+
+
+VALIDATORS = {"luhn": luhn_valid, "ipv4": ipv4_valid}
+
+
+@dataclass(frozen=True)
+class PIIMatch:
+    kind: str
+    start: int
+    end: int
+    value: str
+
+
+class TokenVault:
+    """Reversible redaction: maps each distinct value to a stable placeholder such as
+    `[EMAIL_1]`, so redacted prompts stay readable and `restore()` can put the
+    original values back into the response. Use one vault per conversation."""
+
+    def __init__(self):
+        self.tokens = {}
+        self.values = {}
+        self._counts = {}
+
+    def token(self, kind: str, value: str) -> str:
+        token = self.tokens.get((kind, value))
+        if token is None:
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+            token = f"[{kind.upper()}_{self._counts[kind]}]"
+            self.tokens[(kind, value)] = token
+            self.values[token] = value
+        return token
+
+    def restore(self, text: str) -> str:
+        if "[" not in text:
+            return text
+        return _TOKEN.sub(lambda m: self.values.get(m.group(0), m.group(0)), text)
+
+
+class PIIRedactor:
+    """Finds and redacts PII (emails, phone numbers, Luhn-valid card numbers, SSNs,
+    IP addresses, API keys) in a single regex pass over the text."""
+
+    def __init__(self, detectors=DEFAULT_DETECTORS):
+        self.detectors = tuple(detectors)
+        self._always = tuple(i for i, d in enumerate(self.detectors) if not d.requires)
+        self._optional = tuple(i for i, d in enumerate(self.detectors) if d.requires)
+        self._scanners = {}
+        # Each detector on its own, to retry a position whose first match failed validation
+        self._single = [
+            re.compile(f"(?:{d.lead}){self._guard(d)}(?:{d.pattern})") for d in self.detectors
+        ]
+
+    @staticmethod
+    def _guard(detector: Detector) -> str:
+        if not detector.boundary:
+            return ""
+        return f"(?<!{detector.boundary}{detector.lead})"
+
+    def _scanner(self, active: tuple):
+        scanner = self._scanners.get(active)
+        if scanner is not None:
+            return scanner
+        leads = "".join(dict.fromkeys(self.detectors[i].lead for i in active))
+        # Neighbouring detectors with the same lead and boundary share one lead check
+        groups = []
+        for i in active:
+            detector = self.detectors[i]
+            branch = f"(?P<d{i}>{detector.pattern})"
+            if groups and groups[-1][0] == (detector.lead, detector.boundary):
+                groups[-1][2].append(branch)
+            else:
+                groups.append(((detector.lead, detector.boundary), detector, [branch]))
+        branches = "|".join(
+            f"(?<={detector.lead}){self._guard(detector)}(?:{'|'.join(group)})"
+            for _, detector, group in groups
+        )
+        digit_led = [self.detectors[i] for i in active if self.detectors[i].lead == r"\d"]
+        if digit_led and all(d.boundary and re.match(d.boundary, "0") for d in digit_led):
+            # No digit-led match can start inside a digit run, so when every branch
+            # fails at the run's first digit, consume the run (an unnamed match that
+            # find() drops) instead of retrying the regex at each of its digits
+            branches += r"|(?<=\d)\d*"
+        scanner = self._scanners[active] = re.compile(f"[{leads}](?:{branches})")
+        return scanner
+
+    def find(self, text: str) -> list:
+        active = self._always + tuple(
+            i for i in self._optional if any(lit in text for lit in self.detectors[i].requires)
+        )
+        if not active:
+            return []
+        found = []
+        last_end = 0
+        for match in self._scanner(active).finditer(text):
+            if match.lastgroup is None:
+                continue
+            index = int(match.lastgroup[1:])
+            start, end = match.start(), match.end()
+            if not self._valid(index, text[start:end]):
+                index, end = self._retry(text, start, index, active)
+                if index is None:
+                    continue
+            detector = self.detectors[index]
+            if detector.kind == "email":
+                start = self._expand_email(text, start, last_end)
+                if start is None:
+                    continue
+            found.append(PIIMatch(detector.kind, start, end, text[start:end]))
+            last_end = end
+        return found
+
+    def _valid(self, index: int, value: str) -> bool:
+        validate = self.detectors[index].validate
+        return validate is None or VALIDATORS[validate](value)
+
+    def _retry(self, text: str, start: int, failed: int, active: tuple):
+        for index in active:
+            if index <= failed or self.detectors[index].lead != self.detectors[failed].lead:
+                continue
+            match = self._single[index].match(text, start)
+            if match and self._valid(index, match.group(0)):
+                return index, match.end()
+        return None, None
+
+    @staticmethod
+    def _expand_email(text: str, at: int, floor: int):
+        local = _EMAIL_LOCAL.search(text, max(floor, at - 64), at)
+        return None if local is None else local.start()
+
+    def redact(self, text: str, vault: TokenVault | None = None) -> str:
+        """Replace PII with `[KIND]`, or with reversible `[KIND_n]` tokens from `vault`."""
+        pieces = []
+        position = 0
+        for match in self.find(text):
+            pieces.append(text[position : match.start])
+            if vault is None:
+                pieces.append(f"[{match.kind.upper()}]")
+            else:
+                pieces.append(vault.token(match.kind, match.value))
+            position = match.end
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return "".join(pieces)
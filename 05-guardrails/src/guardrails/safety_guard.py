@@ -1,20 +1,181 @@
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+from common.keyword_trie import KeywordTrie
+from guardrails.pii_redactor import VALIDATORS
+from guardrails.verdict_cache import fingerprint
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parents[2] / "rules" / "safety_rules.yaml"
+ACTIONS = ("block", "flag", "allow")
+
+
+@dataclass(frozen=True)
+class GuardMatch:
+    check: str
+    action: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class GuardVerdict:
+    """Outcome of every check on one output."""
+
+    safe: bool
+    reason: str
+    matches: tuple = ()
+    rules_version: str = ""
+
+    @property
+    def flags(self) -> tuple:
+        return tuple(dict.fromkeys(m.check for m in self.matches if m.action == "flag"))
+
+
+@dataclass(frozen=True)
+class _RegexRule:
+    check: str
+    pattern: re.Pattern
+    requires: tuple = ()
+    validate: object = None  # a VALIDATORS check each match must also pass
+
+
+class CompiledRules:
+    """An immutable compiled rule set; swapped in whole on reload."""
+
+    def __init__(self, spec: dict):
+        self.version = str(spec.get("version", ""))
+        # Changes with any edit to the rules, unlike the hand-maintained `version`
+        self.fingerprint = fingerprint(json.dumps(spec, sort_keys=True, default=str))
+        self.actions = {}
+        self.keyword_checks = {}
+        self.regex_rules = []
+        for name, check in (spec.get("checks") or {}).items():
+            action = check.get("action", "block")
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown action {action!r} for check {name!r}")
+            self.actions[name] = action
+            keywords = dict.fromkeys(keyword.lower() for keyword in check.get("keywords") or ())
+            for keyword in keywords:
+                self.keyword_checks.setdefault(keyword, []).append(name)
+            for entry in check.get("regex") or ():
+                if isinstance(entry, str):
+                    entry = {"pattern": entry}
+                validate = entry.get("validate")
+                if validate is not None and validate not in VALIDATORS:
+                    raise ValueError(f"Unknown validator {validate!r} for check {name!r}")
+                self.regex_rules.append(
+                    _RegexRule(
+                        name,
+                        re.compile(entry["pattern"], re.IGNORECASE),
+                        tuple(literal.lower() for literal in entry.get("requires") or ()),
+                        VALIDATORS.get(validate),
+                    )
+                )
+        self.order = list(self.actions)
+        self.keywords = KeywordTrie(self.keyword_checks)
+        self.max_keyword_length = self.keywords.max_length
+
+    def scan(self, output: str, pos: int = 0):
+        """Matches starting at `pos` or later; earlier text is only context for
+        lookbehinds and word boundaries."""
+        text = output.lower()
+        for keyword, start, end in self.keywords.find_all(text, pos):
+            for name in self.keyword_checks[keyword]:
+                yield GuardMatch(name, self.actions[name], start, end)
+        for rule in self.regex_rules:
+            # A substring test is far cheaper than running a regex over the text
+            if rule.requires and not any(literal in text for literal in rule.requires):
+                continue
+            for match in rule.pattern.finditer(text, pos):
+                if rule.validate is not None and not rule.validate(match.group()):
+                    continue
+                yield GuardMatch(rule.check, self.actions[rule.check], *match.span())
+
+    def verdict(self, matches) -> GuardVerdict:
+        matches = tuple(matches)
+        matched = {m.check for m in matches}
+        ordered = [name for name in self.order if name in matched]
+        blocked = next((name for name in ordered if self.actions[name] == "block"), None)
+        if blocked is not None:
+            return GuardVerdict(False, blocked, matches, self.version)
+        return GuardVerdict(True, ordered[0] if ordered else "ok", matches, self.version)
+
+
 class SafetyGuard:
-    def enforce(self, output: str):
-        lowered = output.lower()
+    """Runs every configured check over an output with rules compiled once.
 
-        unsafe_patterns = [
-            "as an ai model i was instructed",
-            "system prompt",
-            "ignore previous instructions"
-        ]
+    All keywords are matched in one scan; regex checks run only when their
+    `requires` literals occur in the text.
 
-        for p in unsafe_patterns:
-            if p in lowered:
-                return False, "instruction_leak"
+    Rules come from `rules/safety_rules.yaml`. When `reload_interval` is set, the
+    file's mtime is checked at most that often and changed rules are recompiled and
+    swapped in atomically; a broken edit keeps the previous rules (see `last_error`).
+    With a VerdictCache, repeated outputs are answered from the cache until the
+    rules change.
+    """
 
-        if "i don't know" in lowered or "cannot determine" in lowered:
-            return True, "safe_refusal"
+    def __init__(
+        self, rules_path=DEFAULT_RULES_PATH, reload_interval: float | None = None, cache=None
+    ):
+        self.rules_path = Path(rules_path)
+        self.reload_interval = reload_interval
+        self.cache = cache
+        self.name = "safety_guard"
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self._rules = None
+        self.reload()
 
-        return True, "ok"
+    def reload(self) -> bool:
+        """Recompile the rule file if it changed; returns True when new rules are active."""
+        with self._lock:
+            try:
+                mtime = os.stat(self.rules_path).st_mtime_ns
+                if mtime == self._mtime:
+                    return False
+                with open(self.rules_path, "r") as f:
+                    rules = CompiledRules(yaml.safe_load(f) or {})
+            except (OSError, ValueError, TypeError, KeyError, re.error, yaml.YAMLError) as e:
+                if self._rules is None:
+                    raise
+                self.last_error = str(e)
+                return False
+            self._rules, self._mtime, self.last_error = rules, mtime, None
+            return True
 
-# TODO: Add more guardrails -This evolves into ML / LLM-based guards later - Simple heuristics on purpose
\ No newline at end of file
+    def _maybe_reload(self):
+        if self.reload_interval is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            self.reload()
+
+    def snapshot(self) -> CompiledRules:
+        """The active rules, after any due reload; use one snapshot per output."""
+        self._maybe_reload()
+        return self._rules
+
+    @property
+    def version(self) -> str:
+        return self.snapshot().fingerprint
+
+    def check(self, output: str) -> GuardVerdict:
+        rules = self.snapshot()
+        if self.cache is None:
+            return rules.verdict(rules.scan(output))
+        return self.cache.get_or_compute(
+            self.name, rules.fingerprint, output, lambda text: rules.verdict(rules.scan(text))
+        )
+
+    def enforce(self, output: str):
+        verdict = self.check(output)
+        return verdict.safe, verdict.reason
@@ -0,0 +1,108 @@
+from dataclasses import replace
+
+DEFAULT_REGEX_OVERLAP = 128
+
+
+class GuardedStream:
+    """Iterates over a text stream, yielding only text the guard has cleared.
+
+    After each chunk, only the new text plus an overlap (long enough for a match
+    split across chunks) is rescanned, with another overlap before it as context
+    for lookbehinds and word boundaries, so each chunk costs the same however long
+    the stream gets. A match that touches the end of the text so far is held back
+    until more text arrives or the stream ends, since more text may extend it or
+    break a lookahead such as `(?!\\w)`. The last `overlap` characters are held
+    back from the consumer, so a blocked match is never partly emitted. When a
+    blocking check fires, the upstream stream is closed (cancelling generation)
+    and iteration stops; `verdict` then says why. Matches longer than the overlap
+    may be missed or partly emitted.
+    """
+
+    def __init__(self, guard, chunks, regex_overlap: int = DEFAULT_REGEX_OVERLAP):
+        self.guard = guard
+        self.chunks = chunks
+        self.rules = guard.snapshot()
+        self.overlap = max(self.rules.max_keyword_length, regex_overlap)
+        self.length = 0
+        self.emitted = 0
+        self.matches = {}
+        self.cancelled = False
+        self.verdict = None
+        self._chunks = []
+        # The tail of the text still needed for emitting and rescanning; it starts
+        # at `_offset` in the full text
+        self._buffer = ""
+        self._offset = 0
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return "".join(self._chunks)
+
+    def __iter__(self):
+        exhausted = False
+        try:
+            for chunk in self.chunks:
+                previous = self.length
+                self._chunks.append(chunk)
+                self._buffer += chunk
+                self.length += len(chunk)
+                self._scan(previous)
+                if self._blocked():
+                    return
+                # Everything that can no longer be the start of a match is safe to emit
+                ready = max(self.emitted, self.length - self.overlap)
+                if ready > self.emitted:
+                    yield self._emit(ready)
+                self._trim()
+            exhausted = True
+            self._scan(self.length, final=True)
+            if self._blocked():
+                return
+            if self.emitted < self.length:
+                yield self._emit(self.length)
+        finally:
+            # Also cancel upstream if the consumer stops reading early
+            close = getattr(self.chunks, "close", None)
+            if not exhausted and close is not None:
+                close()
+
+    def _blocked(self) -> bool:
+        self.verdict = self.rules.verdict(self.matches.values())
+        self.cancelled = not self.verdict.safe
+        return self.cancelled
+
+    def _emit(self, ready: int) -> str:
+        text = self._buffer[self.emitted - self._offset : ready - self._offset]
+        self.emitted = ready
+        return text
+
+    def _trim(self):
+        # Keep the unemitted text and the next scan's window and context
+        keep = max(0, min(self.emitted, self.length - 2 * self.overlap))
+        if keep > self._offset:
+            self._buffer = self._buffer[keep - self._offset :]
+            self._offset = keep
+
+    def _scan(self, previous: int, final: bool = False):
+        start = max(0, previous - self.overlap)
+        context = max(self._offset, start - self.overlap)
+        window = self._buffer[context - self._offset :]
+        for match in self.rules.scan(window, start - context):
+            begin, end = context + match.start, context + match.end
+            if end == self.length and not final:
+                continue
+            # Matches found by an earlier scan have the same key
+            key = (match.check, begin, end)
+            self.matches.setdefault(key, replace(match, start=begin, end=end))
+
+
+class StreamingGuard:
+    """Streaming mode for SafetyGuard; `wrap(chunks)` guards a client text stream."""
+
+    def __init__(self, guard, regex_overlap: int = DEFAULT_REGEX_OVERLAP):
+        self.guard = guard
+        self.regex_overlap = regex_overlap
+
+    def wrap(self, chunks) -> GuardedStream:
+        return GuardedStream(self.guard, chunks, self.regex_overlap)
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def fingerprint(*parts) -> str:
+    """Short stable version string for rule sets, schemas and prompts."""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(str(part).encode("utf-8", "surrogatepass") + b"\0")
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """Bounded, thread-safe LRU of guard and validator verdicts.
+
+    Keys are (namespace, version, content hash). The version identifies the rule
+    set, schema or judge prompt that produced the verdict, so editing any of them
+    makes old entries unreachable; they age out of the LRU instead of being
+    served. Safe to share between guards, validators and threads.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, namespace: str, version: str, text: str, default=None):
+        key = (namespace, version, content_hash(text))
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, namespace: str, version: str, text: str, value):
+        key = (namespace, version, content_hash(text))
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, namespace: str, version: str, text: str, compute):
+        """Cached value, or compute(text) stored under the key. Concurrent misses
+        for the same key may both compute; verdicts are deterministic, so either
+        result is fine."""
+        value = self.get(namespace, version, text, _MISSING)
+        if value is _MISSING:
+            value = compute(text)
+            self.put(namespace, version, text, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
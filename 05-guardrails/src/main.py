@@ -3,8 +3,18 @@ from client.llm_client import LLMClient
 from models.llm_request import LLMRequest
 from validator.output_validator import OutputValidator
 from guardrails.safety_guard import SafetyGuard
+from guardrails.streaming_guard import StreamingGuard
+from guardrails.guard_pipeline import GuardPipeline
+from guardrails.model_guards import LLMJudgeGuard, INPUT_JUDGE_SYSTEM_PROMPT
+from guardrails.pii_redactor import PIIRedactor, TokenVault
+from guardrails.verdict_cache import VerdictCache
+from validator.streaming_validator import StreamingValidator
+from validator.output_repair import OutputRepairer
 import os
 from config import settings
+
+REFUSAL = "Sorry, I can't help with that."
+
 SYSTEM_PROMPT = """
 You are a responsible AI assistant.
 If unsure, respond with "I don't know".
@@ -22,23 +32,60 @@ if __name__ == "__main__":
         temperature=0.2,
         max_tokens=200
     )
+    # Keep the user's PII out of the prompt; the model sees tokens like [EMAIL_1],
+    # which are mapped back when the response is shown
+    vault = TokenVault()
+    if settings.redact_pii:
+        req.user_prompt = PIIRedactor().redact(req.user_prompt, vault)
     schema_path = os.path.join(os.path.dirname(__file__), "..", settings.schema_dir, settings.schema_name)
     with open(schema_path, 'r') as f:
         schema = json.load(f)
 
     client = LLMClient()
+    # Shared by the guards and the validator; repeated outputs skip re-checking
+    cache = VerdictCache(settings.verdict_cache_size)
     guard = SafetyGuard()
-    validator = OutputValidator(schema)
-
-    result = client.execute(req)
+    validator = OutputValidator(schema, cache=cache)
 
-    safe, reason = guard.enforce(result["output"])
+    if settings.stream_guard:
+        # Guard the token stream and validate fields as they close; either one
+        # cancels generation as soon as it fails
+        guarded = StreamingGuard(guard).wrap(client.stream(req))
+        stream = StreamingValidator(schema).wrap(guarded)
+        for field, value in stream:
+            print(f"{field}: {vault.restore(str(value))}", flush=True)
+        verdict = guarded.verdict or guard.check(guarded.text)
+        safe, reason = verdict.safe, verdict.reason
+        if guarded.cancelled:
+            print(REFUSAL)
+        output = stream.text
+        valid, parsed = (True, stream.value) if stream.valid else (False, stream.error)
+    else:
+        # Heuristics first; the LLM judges (if enabled) run concurrently, the input
+        # judge while the response is generated
+        expensive, input_guards = [], []
+        if settings.llm_judge:
+            expensive.append(LLMJudgeGuard(client))
+            input_guards.append(
+                LLMJudgeGuard(client, name="input_judge", system_prompt=INPUT_JUDGE_SYSTEM_PROMPT)
+            )
+        with GuardPipeline(
+            [guard], expensive, input_guards, budget_ms=settings.guard_budget_ms, cache=cache
+        ) as pipeline:
+            output, report = pipeline.run(req.user_prompt, lambda: client.execute(req)["output"])
+        safe, reason = report.verdict.safe, report.verdict.reason
+        print("Guard latency (ms):", report.timings())
+        valid, parsed = validator.validate(output)
     print("Safety check:", safe, reason)
-
-    valid, parsed = validator.validate(result["output"])
     print("Schema valid:", valid)
 
+    if safe and not valid:
+        # Local fixes first; re-ask only for the failing fragment
+        repaired = OutputRepairer(validator, client, settings.repair_retries).repair(output)
+        print("Repairs:", ", ".join(repaired.repairs) or "none", f"({repaired.retries} re-asks)")
+        valid, parsed = repaired.valid, repaired.value if repaired.valid else repaired.error
+
     if valid:
-        print(json.dumps(parsed, indent=2))
+        print(vault.restore(json.dumps(parsed, indent=2)))
     else:
         print("Validation error:", parsed)
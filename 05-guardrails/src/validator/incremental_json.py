@@ -0,0 +1,239 @@
+import json
+import re
+from json import JSONDecodeError
+
+WHITESPACE = " \t\n\r"
+DIGITS = "0123456789"
+_STRING_STOP = re.compile(r'["\\]')
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?\Z")
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+_KINDS = {"{": "object", "[": "array", '"': "string", "t": "boolean", "f": "boolean", "n": "null"}
+
+
+class _Frame:
+    __slots__ = ("key", "path", "value")
+
+    def __init__(self, value, path):
+        self.value = value
+        self.path = path
+        self.key = None
+
+
+class IncrementalJSONParser:
+    """Push parser for one JSON document arriving in arbitrary pieces (e.g. token deltas).
+
+    `feed(delta)` returns the events completed by the new text, in document order:
+
+    - ("begin", path, kind) when a value starts; kind is its JSON type, "number" for numbers
+    - ("key", path, None) when an object key has been read
+    - ("value", path, value) when a value is complete
+
+    `path` is a tuple of object keys and array indices, () for the document itself.
+    `root` is the document so far: containers are attached as soon as they open and
+    scalars once they are complete. Malformed input raises JSONDecodeError as soon as
+    it is seen; `close()` marks the end of input.
+
+    Only unparsed input is buffered, and a long string is collected piece by piece,
+    so each delta is copied a bounded number of times and parsing stays linear in
+    the document size however small the deltas are.
+    """
+
+    def __init__(self):
+        self._pieces = []  # every delta, joined on demand by `text`
+        self.buffer = ""  # input not consumed yet; buffer[0] is at `offset` in the document
+        self.offset = 0
+        self.pos = 0  # in `buffer`
+        self.stack = []
+        self.expect = "value"
+        self.token = None  # (kind, start in the document, is_key) of a scalar still being read
+        self.partial = []  # the part of a pending string already moved out of `buffer`
+        self.scan = 0  # where in `buffer` to resume looking for the end of a pending string
+        self.root = None
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        """The document so far."""
+        if len(self._pieces) > 1:
+            self._pieces = ["".join(self._pieces)]
+        return self._pieces[0] if self._pieces else ""
+
+    def feed(self, delta: str) -> list:
+        self._pieces.append(delta)
+        self.buffer = self.buffer[self.pos :] + delta
+        self.offset += self.pos
+        self.scan -= self.pos
+        events = []
+        buffer, i, n = self.buffer, 0, len(self.buffer)
+        # A scalar that starts at the end of the delta is still moved to `partial`
+        # or kept as the start of the next buffer
+        while i < n or self.token is not None:
+            if self.token is not None:
+                i = self._finish_token(events, final=False)
+                if self.token is not None:  # needs more input
+                    break
+            elif buffer[i] in WHITESPACE:
+                i += 1
+            else:
+                i = self._step(buffer[i], i, events)
+        self.pos = i
+        return events
+
+    def close(self) -> list:
+        """End of input; completes a trailing top-level number. Raises if incomplete."""
+        events = []
+        if self.token is not None and self.token[0] == "number":
+            self.pos = self._finish_token(events, final=True)
+        if not self.done:
+            text = self.text
+            message = "Expecting value" if not text.strip() else "Incomplete JSON document"
+            raise JSONDecodeError(message, text, len(text))
+        return events
+
+    def _error(self, message: str, pos: int) -> JSONDecodeError:
+        """An error at `pos` in `buffer`."""
+        return JSONDecodeError(message, self.text, self.offset + pos)
+
+    def _path(self) -> tuple:
+        if not self.stack:
+            return ()
+        frame = self.stack[-1]
+        if isinstance(frame.value, list):
+            frame.key = len(frame.value)
+        return frame.path + (frame.key,)
+
+    def _step(self, c: str, i: int, events: list) -> int:
+        expect = self.expect
+        if expect in ("value", "value_or_end"):
+            if c == "]" and expect == "value_or_end":
+                return self._close(i, events)
+            return self._begin(c, i, events)
+        if expect in ("key", "key_or_end"):
+            if c == '"':
+                self.token = ("string", self.offset + i, True)
+                self.scan = i + 1
+                return i + 1
+            if c == "}" and expect == "key_or_end":
+                return self._close(i, events)
+            raise self._error("Expecting property name enclosed in double quotes", i)
+        if expect == "colon":
+            if c == ":":
+                self.expect = "value"
+                return i + 1
+            raise self._error("Expecting ':' delimiter", i)
+        if expect == "comma_or_end":
+            is_object = isinstance(self.stack[-1].value, dict)
+            if c == ",":
+                self.expect = "key" if is_object else "value"
+                return i + 1
+            if c == ("}" if is_object else "]"):
+                return self._close(i, events)
+            raise self._error("Expecting ',' delimiter", i)
+        raise self._error("Extra data", i)
+
+    def _begin(self, c: str, i: int, events: list) -> int:
+        path = self._path()
+        if c == "{" or c == "[":
+            container = {} if c == "{" else []
+            events.append(("begin", path, _KINDS[c]))
+            self._attach(container)
+            self.stack.append(_Frame(container, path))
+            self.expect = "key_or_end" if c == "{" else "value_or_end"
+            return i + 1
+        if c == '"':
+            self.token = ("string", self.offset + i, False)
+            self.scan = i + 1
+            kind = "string"
+        elif c == "-" or c in DIGITS:
+            self.token = ("number", self.offset + i, False)
+            kind = "number"
+        elif c in _LITERALS:
+            self.token = ("literal", self.offset + i, False)
+            kind = _KINDS[c]
+        else:
+            raise self._error("Expecting value", i)
+        events.append(("begin", path, kind))
+        return i + 1
+
+    def _finish_token(self, events: list, final: bool) -> int:
+        """Complete the pending scalar and return the index in `buffer` after it. If
+        it needs more input, `token` stays set and the index is where to resume."""
+        kind, start, is_key = self.token
+        buffer = self.buffer
+        begin = start - self.offset  # negative once a string's head is in `partial`
+        if kind == "string":
+            j = self.scan
+            while True:
+                match = _STRING_STOP.search(buffer, j)
+                if match is None:
+                    j = len(buffer)
+                    break
+                j = match.start()
+                if buffer[j] == '"' or j + 1 >= len(buffer):
+                    break  # the end, or an escape sequence split across deltas
+                j += 2
+            if j == len(buffer) or buffer[j] != '"':
+                # Move what was read out of the buffer, so the next delta does not
+                # copy the whole string again
+                self.partial.append(buffer[max(begin, 0) : j])
+                self.scan = j
+                return j
+            end = j + 1
+            literal = "".join(self.partial) + buffer[max(begin, 0) : end]
+            self.partial = []
+            try:
+                value = json.loads(literal)
+            except JSONDecodeError as e:
+                raise self._error(e.msg, begin + e.pos) from None
+        elif kind == "number":
+            end = _NUMBER_CHARS.match(buffer, begin).end()
+            if end == len(buffer) and not final:
+                return begin
+            if not _NUMBER.match(buffer, begin, end):
+                raise self._error("Invalid number", begin)
+            value = json.loads(buffer[begin:end])
+        else:
+            word, value = _LITERALS[buffer[begin]]
+            seen = buffer[begin : begin + len(word)]
+            if not word.startswith(seen):
+                raise self._error("Expecting value", begin)
+            if len(seen) < len(word):
+                return begin
+            end = begin + len(word)
+
+        self.token = None
+        if is_key:
+            frame = self.stack[-1]
+            frame.key = value
+            events.append(("key", frame.path + (value,), None))
+            self.expect = "colon"
+        else:
+            path = self._path()
+            self._attach(value)
+            events.append(("value", path, value))
+            self._after_value()
+        return end
+
+    def _attach(self, value):
+        if not self.stack:
+            self.root = value
+            return
+        frame = self.stack[-1]
+        if isinstance(frame.value, dict):
+            frame.value[frame.key] = value
+        else:
+            frame.value.append(value)
+
+    def _close(self, i: int, events: list) -> int:
+        frame = self.stack.pop()
+        events.append(("value", frame.path, frame.value))
+        self._after_value()
+        return i + 1
+
+    def _after_value(self):
+        if self.stack:
+            self.expect = "comma_or_end"
+        else:
+            self.done = True
+            self.expect = "end"
@@ -0,0 +1,237 @@
+import json
+import math
+import re
+from dataclasses import dataclass
+
+from models.llm_request import LLMRequest
+from validator.streaming_validator import location
+
+REPAIR_SYSTEM_PROMPT = (
+    "You repair JSON values so they satisfy a JSON Schema. "
+    "Reply with the corrected JSON value only, without prose or code fences."
+)
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*\n?(.*?)\n?\s*```", re.DOTALL)
+# A JSON string (skipped as is) or a comma right before a closing bracket
+_TRAILING_COMMA = re.compile(r'("(?:[^"\\]|\\.)*")|,(\s*[}\]])')
+_TYPES = {
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+    or (isinstance(v, float) and v.is_integer()),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "null": lambda v: v is None,
+}
+_BOOLEANS = {"true": True, "yes": True, "false": False, "no": False}
+_FAILED = object()
+
+
+def strip_code_fences(text: str) -> str:
+    match = _FENCE.search(text)
+    return match.group(1) if match else text
+
+
+def extract_json(text: str) -> str:
+    """Drop prose around the outermost object or array."""
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return text
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start : end + 1] if end > start else text
+
+
+def remove_trailing_commas(text: str) -> str:
+    return _TRAILING_COMMA.sub(lambda m: m.group(1) or m.group(2), text)
+
+
+TEXT_FIXES = (
+    ("strip code fences", strip_code_fences),
+    ("extract json", extract_json),
+    ("remove trailing commas", remove_trailing_commas),
+)
+
+
+def parse_lenient(text: str, repairs: list):
+    """json.loads after the text fixes, applied until the text parses. Raises
+    json.JSONDecodeError if it still does not; names of fixes that changed the
+    text are appended to `repairs`."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        error = e
+    for name, fix in TEXT_FIXES:
+        fixed = fix(text)
+        if fixed == text:
+            continue
+        repairs.append(name)
+        text = fixed
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            error = e
+    raise error
+
+
+def _convert(value, types: list):
+    for t in types:
+        if t in ("number", "integer") and isinstance(value, str):
+            try:
+                number = float(value.strip())
+            except ValueError:
+                continue
+            if not math.isfinite(number):
+                continue
+            if t == "integer" and number.is_integer():
+                return int(number)
+            if t == "number":
+                return int(number) if number.is_integer() and "." not in value else number
+        elif t == "boolean" and isinstance(value, str) and value.strip().lower() in _BOOLEANS:
+            return _BOOLEANS[value.strip().lower()]
+        elif t == "boolean" and value in (0, 1) and not isinstance(value, bool):
+            return bool(value)
+        elif t == "string" and isinstance(value, bool):
+            return "true" if value else "false"
+        elif t == "string" and isinstance(value, (int, float)):
+            return str(value)
+    return _FAILED
+
+
+def coerce(value, schema, repairs: list, path: tuple = ()):
+    """Move `value` toward `schema`: convert mismatched scalar types and clamp
+    numbers into [minimum, maximum]. Applied fixes are appended to `repairs`."""
+    if not isinstance(schema, dict):
+        return value
+    types = schema.get("type") or []
+    types = [types] if isinstance(types, str) else types
+    if types and not any(_TYPES[t](value) for t in types if t in _TYPES):
+        converted = _convert(value, types)
+        if converted is not _FAILED:
+            repairs.append(f"coerce {location(path)}")
+            value = converted
+    if _TYPES["number"](value):
+        clamped = value
+        if "minimum" in schema and clamped < schema["minimum"]:
+            clamped = schema["minimum"]
+        if "maximum" in schema and clamped > schema["maximum"]:
+            clamped = schema["maximum"]
+        if clamped != value:
+            repairs.append(f"clamp {location(path)}")
+            value = clamped
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in value:
+            if key in properties:
+                value[key] = coerce(value[key], properties[key], repairs, path + (key,))
+    elif isinstance(value, list) and isinstance(schema.get("items"), dict):
+        value = [
+            coerce(item, schema["items"], repairs, path + (i,)) for i, item in enumerate(value)
+        ]
+    return value
+
+
+def _replace(document, path, value):
+    if not path:
+        return value
+    parent = document
+    for key in path[:-1]:
+        parent = parent[key]
+    parent[path[-1]] = value
+    return document
+
+
+@dataclass(frozen=True)
+class RepairResult:
+    valid: bool
+    value: object = None
+    error: str = None
+    repairs: tuple = ()
+    retries: int = 0
+
+
+class OutputRepairer:
+    """Turns invalid model output into schema-valid JSON as cheaply as possible.
+
+    Local fixes come first: code fences, surrounding prose, trailing commas, type
+    coercion and clamping to the schema's bounds. Only if the output is still
+    invalid, and a client is given, the model is re-asked, at most `max_retries`
+    times, for just the failing value: the prompt holds the validation error, the
+    invalid fragment and its subschema, and the reply is spliced back in.
+    """
+
+    def __init__(
+        self,
+        validator,
+        client=None,
+        max_retries: int = 2,
+        model: str = "gpt-4o-mini",
+        max_tokens: int = 256,
+    ):
+        self.validator = validator
+        self.client = client
+        self.max_retries = max_retries
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def repair(self, output: str) -> RepairResult:
+        valid, parsed = self.validator.validate(output)
+        if valid:
+            return RepairResult(True, parsed)
+
+        repairs = []
+        schema = self.validator.schema
+        compiled = self.validator.compiled
+        try:
+            document = coerce(parse_lenient(output, repairs), schema, repairs)
+        except json.JSONDecodeError as e:
+            document, target = None, ((), schema, str(e), output)
+        else:
+            target = self._target(document)
+            if target is None:
+                return RepairResult(True, document, repairs=tuple(repairs))
+
+        retries = 0
+        while self.client is not None and retries < self.max_retries:
+            retries += 1
+            path, subschema, error, fragment = target
+            reply = self.client.execute(self._reask(path, subschema, error, fragment))["output"]
+            try:
+                value = parse_lenient(reply, [])
+            except json.JSONDecodeError:
+                continue  # same target again
+            repairs.append(f"re-ask {location(path)}")
+            document = coerce(_replace(document, path, value), schema, repairs)
+            target = self._target(document)
+            if target is None:
+                return RepairResult(True, document, repairs=tuple(repairs), retries=retries)
+
+        error = target[2] if document is None else compiled.error(document)
+        return RepairResult(False, None, error, tuple(repairs), retries)
+
+    def _target(self, document):
+        """(path, subschema, message, fragment) of the value to regenerate, or None."""
+        error = self.validator.compiled.best_error(document)
+        if error is None:
+            return None
+        path = tuple(error.absolute_path)
+        fragment = document
+        for key in path:
+            fragment = fragment[key]
+        return path, error.schema, error.message, json.dumps(fragment)
+
+    def _reask(self, path, subschema, error, fragment) -> LLMRequest:
+        user_prompt = (
+            f"Location: {location(path)}\n"
+            f"Schema: {json.dumps(subschema)}\n"
+            f"Error: {error}\n"
+            f"Invalid value:\n{fragment}"
+        )
+        return LLMRequest(
+            system_prompt=REPAIR_SYSTEM_PROMPT,
+            user_prompt=user_prompt,
+            temperature=0.0,
+            max_tokens=self.max_tokens,
+            model=self.model,
+        )
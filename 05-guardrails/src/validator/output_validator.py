@@ -1,15 +1,40 @@
 import json
-from jsonschema import validate, ValidationError
+
+from validator.schema_compiler import compile_schema
 
 
 class OutputValidator:
-    def __init__(self, schema: dict):
+    def __init__(self, schema: dict, codegen: bool = True, cache=None):
         self.schema = schema
+        # Checked and compiled once per distinct schema, shared across validators
+        self.compiled = compile_schema(schema, codegen=codegen)
+        # Optional VerdictCache; entries are keyed by the schema hash, so a changed
+        # schema never sees old verdicts
+        self.cache = cache
 
     def validate(self, output: str):
+        if self.cache is not None:
+            cached = self.cache.get("output_validator", self.compiled.digest, output)
+            if cached is not None:
+                valid, error = cached
+                return (True, json.loads(output)) if valid else (False, error)
+        valid, result = self._validate(output)
+        if self.cache is not None:
+            verdict = (True, None) if valid else (False, result)
+            self.cache.put("output_validator", self.compiled.digest, output, verdict)
+        return valid, result
+
+    def _validate(self, output: str):
         try:
             parsed = json.loads(output)
-            validate(instance=parsed, schema=self.schema)
-            return True, parsed
-        except (json.JSONDecodeError, ValidationError) as e:
+        except json.JSONDecodeError as e:
             return False, str(e)
+        error = self.compiled.error(parsed)
+        if error is not None:
+            return False, error
+        return True, parsed
+
+    def validate_batch(self, outputs) -> list:
+        """validate() over many outputs, e.g. a stored result set."""
+        validate = self.validate
+        return [validate(output) for output in outputs]
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import math
+import threading
+
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+
+# Keywords that never affect validity
+ANNOTATIONS = {"title", "description", "default", "examples", "$comment", "$id"}
+# Dialects the generated code follows. Draft-04 and older differ (1.0 is not an
+# integer there, exclusiveMinimum is a boolean), so they are left to jsonschema
+CODEGEN_DIALECTS = {
+    cls.META_SCHEMA["$id"].rstrip("#")
+    for cls in (
+        validators.Draft6Validator,
+        validators.Draft7Validator,
+        validators.Draft201909Validator,
+        validators.Draft202012Validator,
+    )
+}
+TYPE_CHECKS = {
+    "string": "isinstance({x}, str)",
+    "number": "(isinstance({x}, (int, float)) and not isinstance({x}, bool))",
+    "integer": (
+        "((isinstance({x}, int) and not isinstance({x}, bool))"
+        " or (isinstance({x}, float) and {x}.is_integer()))"
+    ),
+    "boolean": "isinstance({x}, bool)",
+    "object": "isinstance({x}, dict)",
+    "array": "isinstance({x}, list)",
+    "null": "{x} is None",
+}
+# Which instance type each keyword applies to; other types ignore the keyword
+KEYWORD_TYPES = {
+    "minimum": "number",
+    "maximum": "number",
+    "exclusiveMinimum": "number",
+    "exclusiveMaximum": "number",
+    "minLength": "string",
+    "maxLength": "string",
+    "required": "object",
+    "properties": "object",
+    "additionalProperties": "object",
+    "items": "array",
+    "minItems": "array",
+    "maxItems": "array",
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def schema_hash(schema: dict) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _CodeGen:
+    """Emits a specialized `check(instance) -> bool` for a subset of JSON Schema."""
+
+    def __init__(self):
+        self.lines = []
+        self.names = 0
+
+    def variable(self) -> str:
+        self.names += 1
+        return f"v{self.names}"
+
+    def emit(self, depth: int, line: str):
+        self.lines.append("    " * depth + line)
+
+    def schema(self, schema, x: str, depth: int):
+        if schema is True or schema == {}:
+            return
+        if not isinstance(schema, dict) or schema is False:
+            raise _Unsupported(schema)
+        unknown = set(schema) - ANNOTATIONS - set(KEYWORD_TYPES) - {"type"}
+        if unknown:
+            raise _Unsupported(unknown)
+
+        declared = schema.get("type")
+        if declared is not None:
+            types = declared if isinstance(declared, list) else [declared]
+            if any(t not in TYPE_CHECKS for t in types):
+                raise _Unsupported(declared)
+            test = " or ".join(TYPE_CHECKS[t].format(x=x) for t in types)
+            self.emit(depth, f"if not ({test}):")
+            self.emit(depth + 1, "return False")
+        else:
+            types = None
+
+        for kind in ("number", "string", "object", "array"):
+            keywords = {k: v for k, v in schema.items() if KEYWORD_TYPES.get(k) == kind}
+            if not keywords:
+                continue
+            if types == [kind] or (kind == "number" and types == ["integer"]):
+                # The type check above already guarantees the kind
+                getattr(self, kind)(keywords, x, depth)
+            else:
+                self.emit(depth, f"if {TYPE_CHECKS[kind].format(x=x)}:")
+                self.emit(depth + 1, "pass")
+                getattr(self, kind)(keywords, x, depth + 1)
+
+    def number(self, keywords, x, depth):
+        operators = {
+            "minimum": "<",
+            "maximum": ">",
+            "exclusiveMinimum": "<=",
+            "exclusiveMaximum": ">=",
+        }
+        for keyword, operator in operators.items():
+            if keyword in keywords:
+                limit = keywords[keyword]
+                if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+                    raise _Unsupported(keyword)
+                if not math.isfinite(limit):
+                    raise _Unsupported(keyword)  # repr() would be the undefined name inf
+                self.emit(depth, f"if {x} {operator} {limit!r}:")
+                self.emit(depth + 1, "return False")
+
+    def string(self, keywords, x, depth):
+        if "minLength" in keywords:
+            self.emit(depth, f"if len({x}) < {int(keywords['minLength'])}:")
+            self.emit(depth + 1, "return False")
+        if "maxLength" in keywords:
+            self.emit(depth, f"if len({x}) > {int(keywords['maxLength'])}:")
+            self.emit(depth + 1, "return False")
+
+    def object(self, keywords, x, depth):
+        for name in keywords.get("required", ()):
+            self.emit(depth, f"if {name!r} not in {x}:")
+            self.emit(depth + 1, "return False")
+        properties = keywords.get("properties", {})
+        additional = keywords.get("additionalProperties", True)
+        if additional is False:
+            self.emit(depth, f"if not {x}.keys() <= {set(properties)!r}:")
+            self.emit(depth + 1, "return False")
+        elif additional is not True:
+            raise _Unsupported("additionalProperties")
+        for name, subschema in properties.items():
+            if subschema is True or subschema == {}:
+                continue
+            value = self.variable()
+            self.emit(depth, f"if {name!r} in {x}:")
+            self.emit(depth + 1, f"{value} = {x}[{name!r}]")
+            self.schema(subschema, value, depth + 1)
+
+    def array(self, keywords, x, depth):
+        if "minItems" in keywords:
+            self.emit(depth, f"if len({x}) < {int(keywords['minItems'])}:")
+            self.emit(depth + 1, "return False")
+        if "maxItems" in keywords:
+            self.emit(depth, f"if len({x}) > {int(keywords['maxItems'])}:")
+            self.emit(depth + 1, "return False")
+        if "items" in keywords:
+            items = keywords["items"]
+            if not isinstance(items, (dict, bool)):
+                raise _Unsupported("items")  # draft 4-2019 tuple form
+            item = self.variable()
+            self.emit(depth, f"for {item} in {x}:")
+            self.emit(depth + 1, "pass")
+            self.schema(items, item, depth + 1)
+
+
+def generate_check(schema: dict):
+    """Compile a schema into a plain Python predicate, or None if it uses
+    keywords outside the supported subset (types, required, properties,
+    additionalProperties: false, items, min/max, min/max length and items)
+    or a `$schema` other than draft-06 to 2020-12; no `$schema` means 2020-12."""
+    if isinstance(schema, dict) and "$schema" in schema:
+        if str(schema["$schema"]).rstrip("#") not in CODEGEN_DIALECTS:
+            return None
+        schema = {k: v for k, v in schema.items() if k != "$schema"}
+    gen = _CodeGen()
+    try:
+        gen.schema(schema, "instance", 1)
+    except _Unsupported:
+        return None
+    source = "\n".join(["def check(instance):", *gen.lines, "    return True"])
+    namespace = {}
+    # Safe: the schema only contributes repr() literals and int()s to the source,
+    # never code of its own
+    exec(compile(source, "<generated schema check>", "exec"), namespace)  # noqa: S102
+    check = namespace["check"]
+    check.source = source
+    return check
+
+
+class CompiledSchema:
+    """A schema checked and compiled once. `fast` is the generated predicate, if any;
+    the full jsonschema validator still produces error messages and covers every
+    other keyword."""
+
+    def __init__(self, schema: dict, codegen: bool = True):
+        self.schema = schema
+        self.digest = schema_hash(schema)
+        cls = validators.validator_for(schema)
+        cls.check_schema(schema)
+        self.validator = cls(schema)
+        self.fast = generate_check(schema) if codegen else None
+
+    def best_error(self, instance):
+        """The ValidationError jsonschema.validate() would raise, or None when valid."""
+        if self.fast is not None and self.fast(instance):
+            return None
+        return best_match(self.validator.iter_errors(instance))
+
+    def error(self, instance):
+        """None when valid, else the same message jsonschema.validate() would raise."""
+        error = self.best_error(instance)
+        return None if error is None else str(error)
+
+
+def compile_schema(schema: dict, codegen: bool = True) -> CompiledSchema:
+    """Process-wide cache of compiled schemas, keyed by schema content hash."""
+    key = (schema_hash(schema), codegen)
+    compiled = _cache.get(key)
+    if compiled is None:
+        with _cache_lock:
+            compiled = _cache.get(key)
+            if compiled is None:
+                compiled = _cache[key] = CompiledSchema(schema, codegen)
+    return compiled
@@ -0,0 +1,158 @@
+from json import JSONDecodeError
+
+from validator.incremental_json import IncrementalJSONParser
+from validator.schema_compiler import compile_schema
+
+REFS = ("$ref", "$dynamicRef")
+
+
+def _has_ref(schema) -> bool:
+    if isinstance(schema, dict):
+        return any(key in REFS or _has_ref(value) for key, value in schema.items())
+    if isinstance(schema, list):
+        return any(_has_ref(item) for item in schema)
+    return False
+
+
+def resolve_subschema(schema, path: tuple):
+    """The subschema any value at `path` must satisfy on its own, or None when that
+    depends on more than the path (patternProperties, prefixItems, $ref)."""
+    for key in path:
+        if not isinstance(schema, dict):
+            return schema
+        if isinstance(key, str):
+            if key in schema.get("properties", {}):
+                schema = schema["properties"][key]
+            elif "patternProperties" in schema:
+                return None
+            else:
+                schema = schema.get("additionalProperties", True)
+        else:
+            if "prefixItems" in schema:
+                return None
+            schema = schema.get("items", True)
+            if not isinstance(schema, (dict, bool)):
+                return None
+    return None if _has_ref(schema) else schema
+
+
+def location(path: tuple) -> str:
+    return "$" + "".join(f".{key}" if isinstance(key, str) else f"[{key}]" for key in path)
+
+
+class ValidatedStream:
+    """Iterates over a text stream that should hold one JSON document, yielding
+    (field, value) for each top-level field as soon as it is complete and valid.
+
+    Every value is checked against its subschema when it completes, and its type
+    as soon as its first character arrives, so a violation stops the stream (and
+    cancels the upstream request) without waiting for the rest of the output.
+    The whole document is checked against the full schema when it closes.
+    """
+
+    def __init__(self, validator, chunks):
+        self.validator = validator
+        self.chunks = chunks
+        self.parser = IncrementalJSONParser()
+        self.error = None
+        self.cancelled = False
+
+    @property
+    def text(self) -> str:
+        return self.parser.text
+
+    @property
+    def partial(self):
+        """The document parsed so far; fields of a partial object may be missing."""
+        return self.parser.root
+
+    @property
+    def valid(self) -> bool:
+        return self.parser.done and self.error is None and not self.cancelled
+
+    @property
+    def value(self):
+        return self.parser.root if self.valid else None
+
+    def __iter__(self):
+        chunks = iter(self.chunks)
+        exhausted = False
+        try:
+            for chunk in chunks:
+                try:
+                    events = self.parser.feed(chunk)
+                except JSONDecodeError as e:
+                    events, self.error = [], str(e)
+                yield from self._check(events)
+                if self.error is not None:
+                    self.cancelled = True
+                    return
+            exhausted = True
+            try:
+                events = self.parser.close()
+            except JSONDecodeError as e:
+                events, self.error = [], str(e)
+            yield from self._check(events)
+        finally:
+            # Also cancel upstream if the consumer stops reading early
+            close = getattr(chunks, "close", None)
+            if not exhausted and close is not None:
+                close()
+
+    def _check(self, events):
+        for event in events:
+            error = self.validator.check_event(event)
+            if error is not None:
+                self.error = error
+                return
+            kind, path, value = event
+            if kind == "value" and len(path) == 1:
+                yield path[0], value
+
+
+class StreamingValidator:
+    """Schema validation for streamed JSON; `wrap(chunks)` validates a client text
+    stream, and composes with StreamingGuard.wrap()."""
+
+    def __init__(self, schema: dict, codegen: bool = True):
+        self.schema = schema
+        self.codegen = codegen
+        self.compiled = compile_schema(schema, codegen=codegen)
+        self._subschemas = {}
+
+    def wrap(self, chunks) -> ValidatedStream:
+        return ValidatedStream(self, chunks)
+
+    def subschema(self, path: tuple):
+        # Array indices share one subschema, so cache by path shape
+        shape = tuple(key if isinstance(key, str) else None for key in path)
+        if shape not in self._subschemas:
+            schema = resolve_subschema(self.schema, path)
+            if isinstance(schema, dict) and path:
+                if "$schema" in self.schema and "$schema" not in schema:
+                    schema = {**schema, "$schema": self.schema["$schema"]}
+                schema = compile_schema(schema, codegen=self.codegen)
+            self._subschemas[shape] = schema
+        return self._subschemas[shape]
+
+    def check_event(self, event):
+        """None if the event is consistent with the schema, else an error message."""
+        kind, path, value = event
+        if kind == "value" and not path:
+            return self.compiled.error(value)
+        schema = self.subschema(path)
+        if schema is None or schema is True:
+            return None
+        if schema is False:
+            return f"{location(path)} is not allowed by the schema"
+        declared = (schema.schema if path else schema).get("type")
+        if kind == "begin" and declared is not None:
+            types = declared if isinstance(declared, list) else [declared]
+            possible = ("number", "integer") if value == "number" else (value,)
+            if not any(t in types for t in possible):
+                return f"{location(path)}: expected {' or '.join(types)}, got {value}"
+        if kind == "value":
+            error = schema.error(value)
+            if error is not None:
+                return f"{location(path)}: {error}"
+        return None
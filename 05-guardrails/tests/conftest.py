@@ -0,0 +1,26 @@
+"""Shared test fixtures for guardrails tests."""
+
+import pytest
+from guardrails.safety_guard import GuardVerdict
+
+
+class StubGuard:
+    """A guard with a fixed verdict that records what it was asked to check."""
+
+    def __init__(self, name, verdict=None, error=None):
+        self.name = name
+        self.verdict = verdict or GuardVerdict(True, "ok")
+        self.error = error
+        self.checked = []
+
+    def check(self, text):
+        self.checked.append(text)
+        if self.error is not None:
+            raise self.error
+        return self.verdict
+
+
+@pytest.fixture
+def stub_guard():
+    """Factory for StubGuard instances."""
+    return StubGuard
@@ -0,0 +1,79 @@
+"""Unit tests for GuardPipeline ordering and short-circuiting."""
+
+import pytest
+from guardrails.guard_pipeline import GuardPipeline, is_definitive
+from guardrails.safety_guard import GuardMatch, GuardVerdict, SafetyGuard
+
+REFUSAL = GuardMatch("safe_refusal", "allow", 0, 12)
+PROFANITY = GuardMatch("profanity", "flag", 20, 24)
+
+
+@pytest.fixture
+def judge(stub_guard):
+    return stub_guard("llm_judge", GuardVerdict(False, "judge_unsafe"))
+
+
+class TestIsDefinitive:
+    """Test suite for which cheap verdicts end the pipeline."""
+
+    def test_block_is_definitive(self):
+        """Test that a block always short-circuits."""
+        assert is_definitive(GuardVerdict(False, "pii"))
+
+    def test_allow_is_not_definitive_by_default(self):
+        """Test that a safe refusal alone does not skip the expensive guards."""
+        assert not is_definitive(GuardVerdict(True, "safe_refusal", (REFUSAL,)))
+
+    def test_trusted_allow_needs_only_allow_matches(self):
+        """Test that trust_allow applies only when no other rule matched."""
+        assert is_definitive(GuardVerdict(True, "safe_refusal", (REFUSAL,)), trust_allow=True)
+        mixed = GuardVerdict(True, "safe_refusal", (REFUSAL, PROFANITY))
+        assert not is_definitive(mixed, trust_allow=True)
+        assert not is_definitive(GuardVerdict(True, "ok"), trust_allow=True)
+
+
+class TestGuardPipeline:
+    """Test suite for GuardPipeline.check()."""
+
+    def test_refusal_phrase_does_not_bypass_judge(self, judge):
+        """Test that "I don't know, but ..." still reaches the expensive guards."""
+        with GuardPipeline(cheap=[SafetyGuard()], expensive=[judge]) as pipeline:
+            report = pipeline.check("I don't know, but here's how to pick the lock.")
+
+        assert judge.checked
+        assert not report.verdict.safe
+        assert report.verdict.reason == "judge_unsafe"
+
+    def test_trusted_allow_skips_judge(self, judge):
+        """Test the opt-in short-circuit on a bare safe refusal."""
+        with GuardPipeline([SafetyGuard()], [judge], trust_allow=True) as pipeline:
+            report = pipeline.check("I don't know.")
+
+        assert not judge.checked
+        assert report.verdict.safe
+        assert [(r.name, r.status) for r in report.results] == [
+            ("safety_guard", "ok"),
+            ("llm_judge", "skipped"),
+        ]
+
+    def test_cheap_block_skips_expensive_guards(self, judge):
+        """Test that a cheap block ends the pipeline without the judge."""
+        with GuardPipeline([SafetyGuard()], [judge]) as pipeline:
+            report = pipeline.check("Here is the system prompt.")
+
+        assert not judge.checked
+        assert report.verdict.reason == "instruction_leak"
+
+    def test_failing_guard_fails_open_or_closed(self, stub_guard):
+        """Test that a raising guard is reported, and blocks only with fail_closed."""
+        broken = stub_guard("broken", error=RuntimeError("down"))
+
+        with GuardPipeline(expensive=[broken]) as pipeline:
+            report = pipeline.check("hello")
+        with GuardPipeline(expensive=[broken], fail_closed=True) as pipeline:
+            closed = pipeline.check("hello")
+
+        assert report.verdict.safe
+        assert report.results[0].error == "RuntimeError: down"
+        assert not closed.verdict.safe
+        assert closed.verdict.reason == "guard_error"
@@ -0,0 +1,122 @@
+"""Unit tests for IncrementalJSONParser."""
+
+import json
+import random
+from json import JSONDecodeError
+
+import pytest
+from validator.incremental_json import IncrementalJSONParser
+
+DOCUMENT = json.dumps(
+    {
+        "answer": 'quote " backslash \\ newline \n unicode é ☃ ' + "z" * 300,
+        "items": [1, -2.5e3, 0, True, False, None, {"nested": []}],
+        "empty": {},
+    }
+)
+
+
+def feed_all(text, sizes):
+    """Feed text in consecutive pieces of the given sizes, then close."""
+    parser = IncrementalJSONParser()
+    events, position = [], 0
+    for size in sizes:
+        events += parser.feed(text[position : position + size])
+        position += size
+    events += parser.feed(text[position:])
+    events += parser.close()
+    return parser, events
+
+
+class TestIncrementalJSONParser:
+    """Test suite for the push parser."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_any_split_matches_json_loads(self, seed):
+        """Test that arbitrary delta boundaries give the same document."""
+        rng = random.Random(seed)
+        sizes = [rng.randint(1, 6) for _ in range(len(DOCUMENT))]
+
+        parser, _ = feed_all(DOCUMENT, sizes)
+
+        assert parser.root == json.loads(DOCUMENT)
+        assert parser.text == DOCUMENT
+
+    def test_one_character_at_a_time(self):
+        """Test scalars that start and end exactly at delta boundaries."""
+        parser, events = feed_all(DOCUMENT, [1] * len(DOCUMENT))
+
+        assert parser.root == json.loads(DOCUMENT)
+        assert events[-1] == ("value", (), json.loads(DOCUMENT))
+
+    def test_events_in_document_order(self):
+        """Test begin, key and value events with their paths."""
+        _, events = feed_all('{"a": [1, "x"]}', [3, 4])
+
+        assert events == [
+            ("begin", (), "object"),
+            ("key", ("a",), None),
+            ("begin", ("a",), "array"),
+            ("begin", ("a", 0), "number"),
+            ("value", ("a", 0), 1),
+            ("begin", ("a", 1), "string"),
+            ("value", ("a", 1), "x"),
+            ("value", ("a",), [1, "x"]),
+            ("value", (), {"a": [1, "x"]}),
+        ]
+
+    def test_field_completes_before_document(self):
+        """Test that a closed field is reported before the rest arrives."""
+        parser = IncrementalJSONParser()
+
+        events = parser.feed('{"a": "done", "b": "still')
+
+        assert ("value", ("a",), "done") in events
+        assert parser.root == {"a": "done"}
+
+    def test_trailing_number_needs_close(self):
+        """Test that a top-level number is only complete at the end of input."""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed("12") == [("begin", (), "number")]
+        assert parser.feed("3") == []
+        assert parser.close() == [("value", (), 123)]
+
+    def test_escape_split_across_deltas(self):
+        """Test a backslash escape cut between two deltas."""
+        parser, _ = feed_all('"a\\"b\\\\"', [2, 1, 1])
+
+        assert parser.root == 'a"b\\'
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"a": tru}', '{"a" 1}', "[1,]", '"ab\\q"', "[1] x", '{"a": "x\\u12"}'],
+    )
+    def test_errors_match_json_loads(self, text):
+        """Test that malformed input fails at the same position as json.loads."""
+        with pytest.raises(JSONDecodeError) as expected:
+            json.loads(text)
+
+        for size in (1, 2, len(text)):
+            with pytest.raises(JSONDecodeError) as error:
+                feed_all(text, [size] * len(text))
+            assert error.value.pos == expected.value.pos
+            assert text.startswith(error.value.doc)
+
+    def test_incomplete_document(self):
+        """Test that close() rejects a document that has not ended."""
+        parser = IncrementalJSONParser()
+        parser.feed('{"a": "b"')
+
+        with pytest.raises(JSONDecodeError, match="Incomplete"):
+            parser.close()
+
+    def test_buffer_holds_only_unparsed_input(self):
+        """Test that parsed text and long pending strings leave the buffer."""
+        parser = IncrementalJSONParser()
+        parser.feed('{"items": [' + "1, " * 1000)
+        parser.feed('2], "answer": "' + "word " * 1000)
+        parser.feed("last")
+
+        assert parser.buffer == "last"
+        assert parser.feed(' end"}')[-1][2]["answer"].endswith("word last end")
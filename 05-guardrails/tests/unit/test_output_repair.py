@@ -0,0 +1,145 @@
+"""Unit tests for OutputRepairer and the local JSON fixes."""
+
+import json
+
+import pytest
+from validator.output_repair import (
+    OutputRepairer,
+    coerce,
+    extract_json,
+    parse_lenient,
+    remove_trailing_commas,
+)
+from validator.output_validator import OutputValidator
+
+SCHEMA = {
+    "type": "object",
+    "required": ["answer", "confidence"],
+    "properties": {
+        "answer": {"type": "string", "minLength": 3},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "verified": {"type": "boolean"},
+        "sources": {"type": "array", "items": {"type": "integer"}},
+    },
+}
+
+
+class FakeClient:
+    """Returns scripted replies to re-ask requests and records the requests."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def execute(self, request):
+        self.requests.append(request)
+        return {"output": self.replies.pop(0)}
+
+
+@pytest.fixture
+def validator():
+    """An OutputValidator for SCHEMA."""
+    return OutputValidator(SCHEMA)
+
+
+class TestTextFixes:
+    """Test suite for the text-level fixes."""
+
+    def test_extract_json(self):
+        """Test that prose around the document is dropped."""
+        assert extract_json('Sure! {"a": [1]} Hope it helps.') == '{"a": [1]}'
+        assert extract_json("no json") == "no json"
+
+    def test_trailing_commas_outside_strings(self):
+        """Test that only commas before a closing bracket are removed."""
+        text = '{"a": [1, 2,], "b": "x,]",}'
+
+        assert json.loads(remove_trailing_commas(text)) == {"a": [1, 2], "b": "x,]"}
+
+    def test_parse_lenient_records_fixes(self):
+        """Test that only the fixes that were needed are recorded."""
+        repairs = []
+
+        value = parse_lenient('```json\n{"a": 1,}\n```', repairs)
+
+        assert value == {"a": 1}
+        assert repairs == ["strip code fences", "remove trailing commas"]
+
+    def test_parse_lenient_raises_when_unfixable(self):
+        """Test that text that is not JSON still raises."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_lenient("not json at all", [])
+
+
+class TestCoerce:
+    """Test suite for coerce()."""
+
+    def test_converts_and_clamps(self):
+        """Test scalar conversion and clamping, with their locations."""
+        repairs = []
+        value = {"confidence": "1.5", "verified": "yes", "sources": ["1", 2, "x"]}
+
+        result = coerce(value, SCHEMA, repairs)
+
+        assert result == {"confidence": 1, "verified": True, "sources": [1, 2, "x"]}
+        assert repairs == [
+            "coerce $.confidence",
+            "clamp $.confidence",
+            "coerce $.verified",
+            "coerce $.sources[0]",
+        ]
+
+    def test_non_finite_numbers_not_converted(self):
+        """Test that "nan" and "inf" strings are left for the validator to reject."""
+        assert coerce("nan", {"type": "number"}, []) == "nan"
+
+
+class TestOutputRepairer:
+    """Test suite for OutputRepairer.repair()."""
+
+    def test_valid_output_untouched(self, validator):
+        """Test that valid output is returned without repairs."""
+        result = OutputRepairer(validator).repair('{"answer": "yes", "confidence": 0.9}')
+
+        assert result.valid
+        assert result.repairs == ()
+
+    def test_local_repairs_without_client(self, validator):
+        """Test that fences, commas and types are fixed without an LLM call."""
+        output = 'Here:\n```json\n{"answer": "Paris", "confidence": "0.9",}\n```'
+
+        result = OutputRepairer(validator).repair(output)
+
+        assert result.valid
+        assert result.value == {"answer": "Paris", "confidence": 0.9}
+        assert result.retries == 0
+
+    def test_reasks_only_failing_field(self, validator):
+        """Test that the re-ask names the failing location and is spliced in."""
+        client = FakeClient('"Paris"')
+
+        result = OutputRepairer(validator, client).repair('{"answer": "P", "confidence": 0.9}')
+
+        assert result.valid
+        assert result.value == {"answer": "Paris", "confidence": 0.9}
+        assert result.repairs == ("re-ask $.answer",)
+        assert "Location: $.answer" in client.requests[0].user_prompt
+
+    def test_gives_up_after_max_retries(self, validator):
+        """Test that unusable replies end in an invalid result with the error."""
+        client = FakeClient("nope", '"P"')
+
+        result = OutputRepairer(validator, client, max_retries=2).repair(
+            '{"answer": "P", "confidence": 0.9}'
+        )
+
+        assert not result.valid
+        assert result.retries == 2
+        assert "too short" in result.error
+
+    def test_unparseable_without_client(self, validator):
+        """Test that output that cannot be parsed is reported as invalid."""
+        result = OutputRepairer(validator).repair("I don't know")
+
+        assert not result.valid
+        assert result.error.startswith("Expecting value")
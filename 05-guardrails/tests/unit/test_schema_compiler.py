@@ -0,0 +1,86 @@
+"""Unit tests for the generated schema checks."""
+
+import random
+
+import jsonschema
+import pytest
+from validator.schema_compiler import compile_schema, generate_check
+
+SCHEMA = {
+    "type": "object",
+    "required": ["answer", "confidence"],
+    "additionalProperties": False,
+    "properties": {
+        "answer": {"type": "string", "minLength": 1, "maxLength": 20},
+        "confidence": {"type": "number", "minimum": 0, "exclusiveMaximum": 1},
+        "count": {"type": "integer", "maximum": 10},
+        "tags": {"type": "array", "maxItems": 2, "items": {"type": ["string", "null"]}},
+    },
+}
+VALUES = ["", "yes", "x" * 30, 0, 1, 0.5, 1.0, 3.5, 11, -1, True, None, [], ["a"], ["a", None, "b"]]
+
+
+def random_instance(rng):
+    """A valid document with up to two fields changed, added or removed."""
+    instance = {"answer": "yes", "confidence": 0.5, "count": 3, "tags": ["a"]}
+    for key in rng.sample(["answer", "confidence", "count", "tags", "extra"], rng.randint(0, 2)):
+        if rng.random() < 0.2:
+            instance.pop(key, None)
+        else:
+            instance[key] = rng.choice(VALUES)
+    return instance
+
+
+class TestGenerateCheck:
+    """Test suite for generate_check()."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_agrees_with_jsonschema(self, seed):
+        """Test that the generated predicate gives jsonschema's verdict."""
+        rng = random.Random(seed)
+        check = generate_check(SCHEMA)
+        validator = jsonschema.Draft202012Validator(SCHEMA)
+
+        for _ in range(500):
+            instance = random_instance(rng)
+            assert check(instance) == validator.is_valid(instance), instance
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {"type": "string", "pattern": "^a"},
+            {"anyOf": [{"type": "string"}]},
+            {"type": "object", "additionalProperties": {"type": "string"}},
+            {"type": "number", "maximum": float("inf")},
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": "integer"},
+        ],
+    )
+    def test_unsupported_schemas(self, schema):
+        """Test that schemas outside the subset fall back to jsonschema."""
+        assert generate_check(schema) is None
+
+    def test_quoted_names_stay_data(self):
+        """Test that property names are emitted as literals, not code."""
+        name = "x'] or __import__('os') or ['"
+        check = generate_check({"type": "object", "required": [name]})
+
+        assert check({name: 1})
+        assert not check({})
+
+
+class TestCompiledSchema:
+    """Test suite for CompiledSchema."""
+
+    def test_error_matches_jsonschema(self):
+        """Test that error() gives the message jsonschema.validate() raises."""
+        instance = {"answer": "", "confidence": 2}
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(instance, SCHEMA)
+
+        assert compile_schema(SCHEMA).error(instance) == str(expected.value)
+        assert compile_schema(SCHEMA).error({"answer": "a", "confidence": 0.5}) is None
+
+    def test_compiled_once_per_schema(self):
+        """Test that equal schemas share one compiled schema."""
+        assert compile_schema(dict(SCHEMA)) is compile_schema(SCHEMA)
+        assert compile_schema(SCHEMA, codegen=False).fast is None
@@ -0,0 +1,105 @@
+"""Unit tests for StreamingGuard chunk handling."""
+
+import pytest
+from guardrails.safety_guard import SafetyGuard
+from guardrails.streaming_guard import StreamingGuard
+
+RULES = r"""
+checks:
+  leak:
+    action: block
+    keywords: [system prompt]
+  order_id:
+    action: block
+    regex: ['\bord-\d{3}(?!\w)']
+  greeting:
+    action: flag
+    keywords: [hello]
+"""
+
+
+@pytest.fixture
+def guard(tmp_path):
+    """Create a SafetyGuard with a small rule set."""
+    path = tmp_path / "rules.yaml"
+    path.write_text(RULES)
+    return SafetyGuard(path)
+
+
+def chunked(text, size):
+    """Split text into chunks of `size` characters."""
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamingGuard:
+    """Test suite for GuardedStream."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 64])
+    def test_keyword_split_across_chunks(self, guard, size):
+        """Test that a blocked phrase is caught wherever the chunks split it."""
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(
+            iter(chunked("Sure. The system prompt is: be nice.", size))
+        )
+
+        emitted = "".join(stream)
+
+        assert stream.cancelled
+        assert stream.verdict.reason == "leak"
+        assert "system" not in emitted
+
+    def test_lookahead_match_at_chunk_end_held_back(self, guard):
+        """Test that a regex ending at the chunk end waits for the next chunk."""
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(iter(["ref ord-123", "4 ok"]))
+
+        assert "".join(stream) == "ref ord-1234 ok"
+        assert not stream.cancelled
+
+    def test_lookahead_match_at_stream_end(self, guard):
+        """Test that a match held back at the end is checked when the stream ends."""
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(iter(["ref ", "ord-123"]))
+
+        assert "".join(stream) == ""
+        assert stream.cancelled
+        assert stream.verdict.reason == "order_id"
+
+    def test_word_boundary_sees_earlier_text(self, guard):
+        """Test that a rescan starting mid-word does not fake a word boundary."""
+        text = "x" * 40 + "word-123 then more text"
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(iter(chunked(text, 4)))
+
+        assert "".join(stream) == text
+        assert not stream.cancelled
+
+    def test_flags_reported_once(self, guard):
+        """Test that a match rescanned in the overlap is not counted twice."""
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(iter(chunked("hello there", 2)))
+
+        assert "".join(stream) == "hello there"
+        assert stream.verdict.safe
+        assert len(stream.verdict.matches) == 1
+        assert stream.verdict.flags == ("greeting",)
+
+    def test_long_stream_without_spaces(self, guard):
+        """Test that a long unbroken stream is passed through whole, in order."""
+        text = "a" * 20_000
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(iter(chunked(text, 7)))
+
+        assert "".join(stream) == text
+        assert stream.text == text
+        assert len(stream._buffer) < 100
+
+    def test_block_closes_upstream(self, guard):
+        """Test that upstream generation is cancelled on a block."""
+        closed = []
+
+        def chunks():
+            try:
+                yield from ["all fine so far, ", "system ", "prompt ", "more"]
+            finally:
+                closed.append(True)
+
+        stream = StreamingGuard(guard, regex_overlap=8).wrap(chunks())
+
+        assert "".join(stream) == "all fine so"
+        assert stream.cancelled
+        assert closed == [True]
@@ -1,31 +1,63 @@
-from models.llm_request import LLMRequest
 from config import settings
 
+SYSTEM_PROMPT = """You are a reasoning agent.
+Call the available tools whenever they help: for arithmetic and for facts you
+are not certain of. Independent tool calls can be made together in one turn.
+When you have enough information, reply with the final answer only."""
+
 
 class ReActAgent:
-    def __init__(self, client, tools):
+    """Reason -> act -> observe loop on the provider's native tool calling.
+
+    Each turn sends the conversation and the registry's tool schemas. The
+    model either answers, which ends the run, or requests tool calls. All calls
+    from one turn run concurrently through ToolRegistry.invoke_many(), and
+    their results go back as tool messages for the next turn. No output format
+    is prompted for or parsed.
+    """
+
+    def __init__(self, client, tools, max_steps: int | None = None, model: str | None = None):
         self.client = client
         self.tools = tools
-    
+        self.max_steps = max_steps or settings.max_agent_steps
+        self.model = model or settings.default_model
+        self.trace = []  # (step, tool name, arguments, ToolResult) of the last run
+
     def run(self, question: str):
-        system_prompt = """
-                You are a reasoning agent.
-                Use the following format strictly:
-
-                Thought: reasoning about the problem
-                Action: tool_name[input]
-                Observation: result
-                Final: final answer
-
-                Only use available tools when needed.
-                """
-        tool_descriptions = "\n".join([f"{tool_name}: {description}" for tool_name, description in self.tools.items()])
-        user_prompt = f"""Available Tools:\n{tool_descriptions}\n\nQuestion: {question}"""
-        req = LLMRequest(
-            system_prompt=system_prompt, 
-            user_prompt=user_prompt, 
-            temperature=settings.default_temperature, 
-            max_tokens=settings.default_max_tokens
-        )
-        response = self.client.execute(req)
-        return response["output"]
\ No newline at end of file
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": question},
+        ]
+        schemas = self.tools.schemas()
+        self.trace = []
+        for step in range(self.max_steps):
+            response = self.client.chat(
+                messages,
+                tools=schemas,
+                model=self.model,
+                temperature=settings.default_temperature,
+                max_tokens=settings.default_max_tokens,
+            )
+            calls = response["tool_calls"]
+            if not calls:
+                return response["output"]
+
+            messages.append(response["message"])
+            valid = [call for call in calls if call["arguments"] is not None]
+            results = dict(
+                zip(
+                    [call["id"] for call in valid],
+                    self.tools.invoke_many([(call["name"], call["arguments"]) for call in valid]),
+                )
+            )
+            for call in calls:
+                result = results.get(call["id"])
+                observation = (
+                    result.observation if result else "Error: arguments are not valid JSON"
+                )
+                self.trace.append((step, call["name"], call["arguments"], result))
+                messages.append(
+                    {"role": "tool", "tool_call_id": call["id"], "content": observation}
+                )
+
+        return "Max steps exceeded"
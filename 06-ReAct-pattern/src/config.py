@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     default_model: str = "gpt-4o-mini"
     default_temperature: float = 0.2
     default_max_tokens: int = 300
+    max_agent_steps: int = 5  # model turns before the agent gives up
     
     model_config = SettingsConfigDict(
         # Search for .env in project dir, then parent dir (like load_env)
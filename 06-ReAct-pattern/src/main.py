@@ -2,26 +2,41 @@ from client.llm_client import LLMClient
 from agent.react_agent import ReActAgent
 from registry.tool_registry import ToolRegistry
 from tools.calculator import calculate
-from tools.knowledge_base import lookup
+from tools.knowledge_base import knowledge_version, lookup
 
-client = LLMClient()
-tools = ToolRegistry()
+if __name__ == "__main__":
+    client = LLMClient()
+    tools = ToolRegistry()
 
-tools.register(
-    name="calculator",
-    description="Evaluate mathematical expressions",
-    fn=calculate
-)
+    # Expressions come from the model: evaluate them in a worker process that is
+    # killed if it runs past the timeout
+    tools.register(
+        name="calculator",
+        description="Evaluate an arithmetic expression, e.g. 2 + 2 * 5 or sqrt(2) ** 3",
+        fn=calculate,
+        timeout=2.0,
+        executor="process",
+        pure=True
+    )
 
-tools.register(
-    name="knowledge_base",
-    description="Lookup basic distributed systems knowledge",
-    fn=lookup
-)
+    tools.register(
+        name="knowledge_base",
+        description="Search distributed systems notes (CAP, consistency, consensus)",
+        fn=lookup,
+        timeout=5.0,
+        # Pure for one version of the knowledge/ documents
+        pure=True,
+        version=knowledge_version
+    )
 
-agent = ReActAgent(client, tools.list_tools())
+    agent = ReActAgent(client, tools)
 
-question = "What is 2 + 2 * 5 and what does CAP mean?"
+    question = "What is 2 + 2 * 5 and what does CAP mean?"
 
-output = agent.run(question)
-print(output)
+    output = agent.run(question)
+    for step, name, arguments, result in agent.trace:
+        observation = result.observation if result else "invalid arguments"
+        print(f"[step {step}] {name}({arguments}) -> {observation}")
+    print(output)
+    print("Tool stats:", tools.stats())
+    tools.close()
@@ -0,0 +1,138 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _signature(fn):
+    try:
+        return inspect.signature(fn)
+    except (TypeError, ValueError):  # some builtins have no signature
+        return None
+
+
+def call_key(fn, args: tuple, kwargs: dict, version=None):
+    """Cache key for fn(*args, **kwargs), or None when an argument is unhashable.
+
+    Arguments are bound to fn's parameters first, defaults included, so f(2),
+    f(x=2) and f(2, y=1) for `def f(x, y=1)` share one key. `version` is part of
+    the key, for functions that are pure only while some external state is.
+    """
+    try:
+        signature = _signature(fn)
+    except TypeError:  # an unhashable callable cannot be part of a key either
+        return None
+    if signature is not None:
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return None  # the call fails in the tool; nothing to cache
+        bound.apply_defaults()
+        args, kwargs = bound.args, bound.kwargs
+    key = (fn, version, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ToolCache:
+    """Bounded, thread-safe LRU of pure tool results with per-entry TTLs.
+
+    Keys are the tool function and its arguments, so registries (and agents)
+    sharing the cache share results for the same function under any tool name.
+    Concurrent misses for the same key are deduplicated: the first caller
+    starts the call and later ones wait on the same future. Only successful
+    results are stored; errors and timeouts are retried on the next call.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._get(key, default)
+
+    def _get(self, key, default):
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, ttl: float | None = None):
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_start(self, key, ttl: float | None, start):
+        """("cached", value), ("joined", future) for a call already in flight, or
+        ("started", start()) where start() returns a concurrent Future whose
+        result is stored when it succeeds."""
+        with self._lock:
+            value = self._get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return "cached", value
+            future = self._inflight.get(key)
+            if future is not None:
+                self.joined += 1
+                return "joined", future
+            self.misses += 1
+            future = self._inflight[key] = start()
+        future.add_done_callback(lambda future: self._settle(key, ttl, future))
+        return "started", future
+
+    def abandon(self, key, future):
+        """Stop sharing `future` under `key` (its caller timed out), so the next call
+        starts afresh instead of joining a call that may never return. A result
+        that still arrives is stored as usual."""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _settle(self, key, ttl: float | None, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.put(key, future.result(), ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.joined
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "joined": self.joined,
+            "hit_rate": (self.hits + self.joined) / total if total else 0.0,
+        }
+
+
+# Shared by every ToolRegistry that is not given its own cache
+SHARED_CACHE = ToolCache()
@@ -1,20 +1,379 @@
+import asyncio
+import inspect
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from registry.tool_cache import SHARED_CACHE, call_key
+
+DEFAULT_TIMEOUT = 30.0
+EXECUTORS = ("thread", "process", "async")
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+
+def parameters_schema(fn) -> dict:
+    """JSON schema of fn's parameters for native tool calling, from its signature.
+    Unannotated parameters are strings, since agents pass tools text."""
+    properties, required = {}, []
+    for name, parameter in inspect.signature(fn).parameters.items():
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        annotation = parameter.annotation
+        properties[name] = {"type": JSON_TYPES.get(annotation, "string")}
+        if parameter.default is parameter.empty:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+@dataclass(frozen=True)
+class ToolResult:
+    name: str
+    status: str  # "ok", "cached", "error" or "timeout"
+    output: object = None
+    latency_ms: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("ok", "cached")
+
+    @property
+    def observation(self) -> str:
+        """What an agent shows the model: the output, or the failure."""
+        return str(self.output) if self.ok else f"Error: {self.error}"
+
+
+class ToolStats:
+    """Per-tool call counts and latency over the last `window` calls."""
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cached = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, result: ToolResult):
+        with self._lock:
+            self.calls += 1
+            self.errors += result.status == "error"
+            self.timeouts += result.status == "timeout"
+            self.cached += result.status == "cached"
+            self._latencies.append(result.latency_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cached": self.cached,
+            "mean_ms": round(sum(latencies) / count, 3) if count else 0.0,
+            "p95_ms": round(latencies[min(count - 1, int(count * 0.95))], 3) if count else 0.0,
+            "max_ms": round(latencies[-1], 3) if count else 0.0,
+        }
+
+
+def _report_pid(queue):
+    queue.put(os.getpid())
+
+
+class _ProcessPool(ProcessPoolExecutor):
+    """A process pool that records its workers' PIDs as they start, so a hung
+    call can be stopped: the executor itself offers no way to kill a worker."""
+
+    def __init__(self, max_workers: int):
+        self._worker_pids = multiprocessing.SimpleQueue()
+        super().__init__(max_workers, initializer=_report_pid, initargs=(self._worker_pids,))
+
+    def terminate(self):
+        """Kill every worker and shut the pool down; calls still in it fail."""
+        while not self._worker_pids.empty():
+            try:
+                os.kill(self._worker_pids.get(), signal.SIGTERM)
+            except ProcessLookupError:  # already exited
+                pass
+        self.shutdown(wait=False, cancel_futures=True)
+
+
 class ToolRegistry:
-    def __init__(self):
+    """Tools by name, and the executors that run them.
+
+    Each tool declares how it runs:
+    - "thread" (default for plain functions): blocking I/O; runs in a thread pool.
+      A thread cannot be interrupted, so a hung call keeps its worker.
+    - "process": CPU-heavy or untrusted code; runs in the tool's own process
+      pool, which is killed and recreated when a call times out. The function
+      and its arguments must be picklable (module-level functions).
+    - "async" (automatic for `async def` tools): runs on a shared event loop;
+      timed-out calls are cancelled.
+
+    `timeout` bounds how long a caller waits, including time queued behind the
+    tool's `max_concurrency` limit. invoke() and invoke_many() never raise for a
+    failing tool; they return ToolResults, and stats() reports each tool's calls,
+    failures and latency. `tools[name]["func"]` is still the raw callable.
+
+    Tools registered with `pure=True` (same arguments, same result, no side
+    effects) are memoized in `cache`, by default the process-wide SHARED_CACHE,
+    so agents and runs share results. `ttl` expires results of tools whose
+    answers can go stale. A tool that is pure only for one state of the world,
+    such as retrieval over documents that change, passes `version`: a callable
+    whose result is part of the cache key, so results end with the state.
+
+    schemas() describes the tools for native tool calling; each tool's parameter
+    schema comes from its signature unless `parameters` is given.
+    """
+
+    def __init__(self, max_workers: int = 32, cache=None):
         self.tools = {}
-    
-    def register(self, name: str, description: str, fn: callable):
+        self.max_workers = max_workers
+        self.cache = SHARED_CACHE if cache is None else cache
+        self._stats = {}
+        self._pools = {}
+        self._shared_pool = None
+        self._loop = None
+        self._semaphores = {}  # async tools' concurrency limits, used on the loop thread
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        description: str,
+        fn: callable,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_concurrency: int | None = None,
+        executor: str | None = None,
+        pure: bool = False,
+        ttl: float | None = None,
+        parameters: dict | None = None,
+        version=None,
+    ):
+        if executor is None:
+            executor = "async" if inspect.iscoroutinefunction(fn) else "thread"
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+        if executor == "async" and not inspect.iscoroutinefunction(fn):
+            raise ValueError(f"tool {name!r} uses the async executor but is not `async def`")
+        if (ttl is not None or version is not None) and not pure:
+            raise ValueError(
+                f"tool {name!r} has a ttl or version but is not pure; only pure tools are cached"
+            )
         self.tools[name] = {
             "description": description,
-            "func": fn
+            "func": fn,
+            "timeout": timeout,
+            "max_concurrency": max_concurrency,
+            "executor": executor,
+            "pure": pure,
+            "ttl": ttl,
+            "version": version,
+            "parameters": parameters or parameters_schema(fn),
         }
-    
+        self._stats[name] = ToolStats()
+        self._semaphores.pop(name, None)
+        self._retire_pool(name)
+
     def get(self, name: str):
         return self.tools.get(name)
 
     def list(self):
         return self.tools
-    
+
     def list_tools(self):
         """Return dictionary of tool names and descriptions for agent."""
         return {name: info["description"] for name, info in self.tools.items()}
-    
+
+    def schemas(self) -> list:
+        """Function definitions for native tool calling (LLMClient.chat(tools=...))."""
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": name,
+                    "description": info["description"],
+                    "parameters": info["parameters"],
+                },
+            }
+            for name, info in self.tools.items()
+        ]
+
+    def invoke(self, name: str, *args, **kwargs) -> ToolResult:
+        """Run one tool call under its timeout."""
+        return self._finish(name, self._start(name, args, kwargs))
+
+    def invoke_many(self, calls) -> list:
+        """Run independent calls concurrently; results come back in call order.
+
+        Each call is `(name, arguments)`: a dict is passed as keyword arguments,
+        anything else as the single positional argument.
+        """
+        started = []
+        for name, arguments in calls:
+            if isinstance(arguments, dict):
+                started.append((name, self._start(name, (), arguments)))
+            else:
+                started.append((name, self._start(name, (arguments,), {})))
+        return [self._finish(name, call) for name, call in started]
+
+    def stats(self) -> dict:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+            shared, self._shared_pool = self._shared_pool, None
+            loop, self._loop = self._loop, None
+        for pool in pools + [shared]:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self, name: str, args: tuple, kwargs: dict):
+        """(future or finished ToolResult, start time, tool, cache key)"""
+        start = time.perf_counter()
+        tool = self.tools.get(name)
+        if tool is None:
+            return ToolResult(name, "error", error=f"unknown tool {name!r}"), start, None, None
+        key = None
+        if tool["pure"]:
+            try:
+                version = tool["version"]() if tool["version"] is not None else None
+            except Exception as e:  # noqa: BLE001 - reported like a failure of the tool
+                return self._failed(name, start, e), start, tool, None
+            key = call_key(tool["func"], args, kwargs, version)
+        try:
+            if key is None:
+                return self._submit(name, tool, args, kwargs), start, tool, None
+            # Cached, or joined to an identical call already running
+            status, value = self.cache.get_or_start(
+                key, tool["ttl"], lambda: self._submit(name, tool, args, kwargs)
+            )
+        except (RuntimeError, BrokenExecutor) as e:  # pool shut down or broken by a timeout
+            return self._failed(name, start, e), start, tool, key
+        if status == "cached":
+            return ToolResult(name, "cached", value, _ms_since(start)), start, tool, key
+        return value, start, tool, key
+
+    def _submit(self, name: str, tool: dict, args: tuple, kwargs: dict):
+        if tool["executor"] == "async":
+            future = asyncio.run_coroutine_threadsafe(
+                self._limited(name, tool, args, kwargs), self._event_loop()
+            )
+        else:
+            future = self._pool(name, tool).submit(tool["func"], *args, **kwargs)
+        # Stamp completion, so latency is the tool's and not when invoke_many() got to it
+        future.add_done_callback(lambda future: setattr(future, "finished", time.perf_counter()))
+        return future
+
+    def _finish(self, name: str, started) -> ToolResult:
+        future, start, tool, key = started
+        if isinstance(future, ToolResult):
+            result = future
+        else:
+            remaining = tool["timeout"] - (time.perf_counter() - start)
+            try:
+                output = future.result(max(remaining, 0))
+                result = ToolResult(name, "ok", output, _ms_since(start, future))
+            # Broad on purpose: a tool may raise anything, and every failure is
+            # reported to the agent as a result rather than raised; a timeout is
+            # told apart by the future not being done
+            except Exception as e:  # noqa: BLE001
+                if future.done():  # the tool raised; report it to the agent
+                    result = self._failed(name, start, e, future)
+                else:
+                    result = self._timed_out(name, tool, future, start, key)
+        if name in self._stats:
+            self._stats[name].record(result)
+        return result
+
+    def _timed_out(self, name: str, tool: dict, future, start: float, key) -> ToolResult:
+        if key is None:
+            future.cancel()
+        else:
+            # Other callers may still be waiting on a shared pure call, and a late
+            # result is still worth caching, so let it run; but stop handing it to
+            # new callers, who would otherwise inherit the hang
+            self.cache.abandon(key, future)
+        if tool["executor"] == "process":
+            self._kill_pool(name)
+        message = f"timed out after {tool['timeout']}s"
+        return ToolResult(name, "timeout", latency_ms=_ms_since(start), error=message)
+
+    @staticmethod
+    def _failed(name: str, start: float, error: Exception, future=None) -> ToolResult:
+        message = f"{type(error).__name__}: {error}"
+        return ToolResult(name, "error", latency_ms=_ms_since(start, future), error=message)
+
+    def _pool(self, name: str, tool: dict):
+        with self._lock:
+            if tool["executor"] == "thread" and tool["max_concurrency"] is None:
+                if self._shared_pool is None:
+                    self._shared_pool = ThreadPoolExecutor(self.max_workers, "tool")
+                return self._shared_pool
+            pool = self._pools.get(name)
+            if pool is None:
+                if tool["executor"] == "process":
+                    pool = _ProcessPool(tool["max_concurrency"] or os.cpu_count())
+                else:
+                    pool = ThreadPoolExecutor(tool["max_concurrency"], f"tool-{name}")
+                self._pools[name] = pool
+            return pool
+
+    def _retire_pool(self, name: str):
+        with self._lock:
+            pool = self._pools.pop(name, None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _kill_pool(self, name: str):
+        # The only way to stop a running call in a worker process; the next call
+        # gets a fresh pool. Other calls still in this pool fail as errors.
+        with self._lock:
+            pool = self._pools.pop(name, None)
+        if pool is not None:
+            pool.terminate()
+
+    def _event_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="tool-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    async def _limited(self, name: str, tool: dict, args: tuple, kwargs: dict):
+        limit = tool["max_concurrency"]
+        if limit is None:
+            return await tool["func"](*args, **kwargs)
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limit)
+        async with semaphore:
+            return await tool["func"](*args, **kwargs)
+
+
+def _ms_since(start: float, future=None) -> float:
+    end = getattr(future, "finished", None) or time.perf_counter()
+    return (end - start) * 1000
@@ -0,0 +1,270 @@
+import json
+import mmap
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_VERSION = 1
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "do",
+        "does",
+        "for",
+        "from",
+        "how",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "this",
+        "to",
+        "was",
+        "what",
+        "when",
+        "where",
+        "which",
+        "who",
+        "why",
+        "with",
+    }
+)
+
+
+def tokenize(text: str) -> list:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Passage:
+    text: str
+    source: str
+    score: float
+
+
+def build_index(passages, index_dir, fingerprint: str = "", k1: float = K1, b: float = B):
+    """Write a BM25 index of `passages` ((source, text) pairs) to `index_dir`.
+
+    Postings are stored sorted by term, with each posting's BM25 contribution
+    (idf x saturated tf) precomputed, so a query only sums impacts. Everything
+    except meta.json is a flat array that BM25Index maps into memory.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    term_ids, sources = {}, {}
+    posting_terms, posting_docs, posting_tfs = array("I"), array("I"), array("I")
+    lengths, passage_sources = array("I"), array("I")
+    passage_offsets = array("Q", [0])
+
+    with open(index_dir / "passages.bin", "wb") as out:
+        for doc, (source, text) in enumerate(passages):
+            counts = {}
+            tokens = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                posting_terms.append(term_ids.setdefault(token, len(term_ids)))
+                posting_docs.append(doc)
+                posting_tfs.append(tf)
+            lengths.append(len(tokens))
+            passage_sources.append(sources.setdefault(source, len(sources)))
+            encoded = text.encode("utf-8")
+            out.write(encoded)
+            passage_offsets.append(passage_offsets[-1] + len(encoded))
+
+    count = len(lengths)
+    terms = sorted(term_ids)
+    # Renumber terms in sorted order so lookups can binary-search the vocabulary
+    rank = np.empty(len(terms), dtype=np.uint32)
+    rank[[term_ids[term] for term in terms]] = np.arange(len(terms), dtype=np.uint32)
+    posting_terms = rank[np.frombuffer(posting_terms, dtype=np.uint32)]
+    order = np.argsort(posting_terms, kind="stable")  # docs stay ascending per term
+    posting_terms = posting_terms[order]
+    docs = np.frombuffer(posting_docs, dtype=np.uint32)[order]
+    tfs = np.frombuffer(posting_tfs, dtype=np.uint32)[order].astype(np.float32)
+
+    lengths = np.frombuffer(lengths, dtype=np.uint32).astype(np.float32)
+    average_length = float(lengths.mean()) if count else 0.0
+    df = np.bincount(posting_terms, minlength=len(terms)).astype(np.float64)
+    idf = np.log1p((count - df + 0.5) / (df + 0.5)).astype(np.float32)
+    norm = k1 * (1 - b + b * lengths[docs] / max(average_length, 1e-9))
+    impacts = idf[posting_terms] * tfs * (k1 + 1) / (tfs + norm)
+
+    encoded_terms = [term.encode("utf-8") for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+    np.cumsum([len(term) for term in encoded_terms], out=term_offsets[1:])
+    posting_offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+    np.cumsum(df.astype(np.uint64), out=posting_offsets[1:])
+
+    (index_dir / "terms.bin").write_bytes(b"".join(encoded_terms))
+    np.save(index_dir / "term_offsets.npy", term_offsets)
+    np.save(index_dir / "posting_offsets.npy", posting_offsets)
+    np.save(index_dir / "doc_ids.npy", docs)
+    np.save(index_dir / "impacts.npy", impacts.astype(np.float32))
+    # Each term's largest impact: an upper bound on what it adds to any score
+    if len(terms):
+        term_max = np.maximum.reduceat(impacts, posting_offsets[:-1].astype(np.intp))
+    else:
+        term_max = np.zeros(0)
+    np.save(index_dir / "term_max.npy", term_max.astype(np.float32))
+    np.save(index_dir / "passage_offsets.npy", np.frombuffer(passage_offsets, dtype=np.uint64))
+    np.save(index_dir / "passage_sources.npy", np.frombuffer(passage_sources, dtype=np.uint32))
+    # meta.json is written last: an index without it is incomplete and gets rebuilt
+    meta = {
+        "format": FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "passages": count,
+        "terms": len(terms),
+        "average_length": average_length,
+        "k1": k1,
+        "b": b,
+        "sources": list(sources),
+    }
+    (index_dir / "meta.json").write_text(json.dumps(meta))
+    return meta
+
+
+def read_meta(index_dir):
+    try:
+        meta = json.loads((Path(index_dir) / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == FORMAT_VERSION else None
+
+
+class BM25Index:
+    """Read-only BM25 index written by build_index().
+
+    Every array is memory-mapped, so opening costs a few file opens regardless of
+    corpus size and pages are read on demand. Terms are found by binary search
+    over the sorted vocabulary; scoring adds each query term's precomputed
+    impacts, and only the top k passages are decoded.
+
+    Queries are scored MaxScore-style: terms are visited from the highest
+    possible contribution down, and once the remaining terms together cannot lift
+    an unseen passage into the top k, they are only looked up for the passages
+    already in the running. Frequent terms then cost a binary search per
+    candidate instead of a pass over their whole posting list. Safe to share
+    between threads.
+    """
+
+    def __init__(self, index_dir):
+        index_dir = Path(index_dir)
+        self.meta = read_meta(index_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"no BM25 index in {index_dir}")
+        self.sources = self.meta["sources"]
+        self._terms = self._map(index_dir / "terms.bin")
+        self._passages = self._map(index_dir / "passages.bin")
+        self._term_offsets = self._load(index_dir / "term_offsets.npy")
+        self._posting_offsets = self._load(index_dir / "posting_offsets.npy")
+        self._doc_ids = self._load(index_dir / "doc_ids.npy")
+        self._impacts = self._load(index_dir / "impacts.npy")
+        self._term_max = self._load(index_dir / "term_max.npy")
+        self._passage_offsets = self._load(index_dir / "passage_offsets.npy")
+        self._passage_sources = self._load(index_dir / "passage_sources.npy")
+
+    @staticmethod
+    def _map(path):
+        if path.stat().st_size == 0:  # an empty corpus; mmap refuses empty files
+            return b""
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _load(path):
+        # A plain ndarray over the mapping: np.memmap's per-slice overhead adds up
+        return np.load(path, mmap_mode="r").view(np.ndarray)
+
+    def __len__(self):
+        return self.meta["passages"]
+
+    def term_id(self, term: str):
+        key = term.encode("utf-8")
+        offsets = self._term_offsets
+        lo, hi = 0, self.meta["terms"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = self._terms[int(offsets[mid]) : int(offsets[mid + 1])]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def _postings(self, term_id: int):
+        start, end = int(self._posting_offsets[term_id]), int(self._posting_offsets[term_id + 1])
+        return self._doc_ids[start:end], self._impacts[start:end]
+
+    def search(self, query: str, k: int = 3) -> list:
+        """Top-k passages for `query`, best first; passages sharing no term are never returned."""
+        term_ids = {self.term_id(token) for token in tokenize(query)} - {None}
+        if not term_ids or k <= 0:
+            return []
+        # Highest upper bound first; remaining[i] bounds what terms i.. can still add
+        term_ids = sorted(term_ids, key=lambda term_id: -self._term_max[term_id])
+        remaining = np.cumsum([self._term_max[term_id] for term_id in term_ids][::-1])[::-1]
+        candidates = np.zeros(0, dtype=np.int64)
+        scores = np.zeros(0, dtype=np.float32)
+        for term_id, bound in zip(term_ids, remaining):
+            docs, impacts = self._postings(term_id)
+            threshold = np.partition(scores, -k)[-k] if len(scores) >= k else 0.0
+            if len(scores) >= k and bound <= threshold:
+                # No passage outside the candidates can reach the top k any more
+                keep = scores + bound >= threshold
+                candidates, scores = candidates[keep], scores[keep]
+                if len(candidates) * 8 < len(docs):
+                    positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                    hits = docs[positions] == candidates
+                    scores[hits] += impacts[positions[hits]]
+                else:
+                    totals = np.zeros(len(self), dtype=np.float32)
+                    totals[docs] = impacts
+                    scores += totals[candidates]
+            elif not len(candidates):
+                candidates, scores = np.asarray(docs, dtype=np.int64), np.array(impacts)
+            elif (len(candidates) + len(docs)) * 16 < len(self):
+                # Short lists: merge sparsely instead of touching a vector per passage
+                candidates, slots = np.unique(
+                    np.concatenate((candidates, docs)), return_inverse=True
+                )
+                weights = np.concatenate((scores, impacts))
+                scores = np.bincount(slots, weights, len(candidates)).astype(np.float32)
+            else:
+                totals = np.zeros(len(self), dtype=np.float32)
+                totals[candidates] = scores
+                totals[docs] += impacts  # doc ids are unique within a posting list
+                candidates = np.flatnonzero(totals)
+                scores = totals[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        return [self.passage(int(candidates[i]), float(scores[i])) for i in top]
+
+    def passage(self, doc: int, score: float = 0.0) -> Passage:
+        start, end = int(self._passage_offsets[doc]), int(self._passage_offsets[doc + 1])
+        text = self._passages[start:end].decode("utf-8")
+        return Passage(text, self.sources[int(self._passage_sources[doc])], score)
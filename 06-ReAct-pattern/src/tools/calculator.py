@@ -1,5 +1,152 @@
-def calculate(expression:str ) -> str:
+import ast
+import math
+import operator
+import time
+from functools import lru_cache
+
+MAX_EXPRESSION_LENGTH = 500
+MAX_NODES = 200
+MAX_INT_BITS = 4096  # ~1233 decimal digits
+MAX_EXPONENT = 10_000
+TIME_LIMIT_SECONDS = 0.05
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+FUNCTIONS = {
+    "abs": abs,
+    "round": lambda x, ndigits=None: round(x, _limit_digits(ndigits)),
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "log": math.log,
+    "log10": math.log10,
+    "exp": math.exp,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "floor": math.floor,
+    "ceil": math.ceil,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+class CalculatorError(ValueError):
+    pass
+
+
+def _check_size(value):
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise CalculatorError(f"result exceeds {MAX_INT_BITS} bits")
+    return value
+
+
+def _limit_digits(ndigits):
+    # round(5, -10**6) would build 10**1000000
+    if ndigits is not None and abs(ndigits) > 100:
+        raise CalculatorError("round() digits must be within [-100, 100]")
+    return ndigits
+
+
+def _power(base, exponent):
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculatorError(f"exponent {exponent} exceeds {MAX_EXPONENT}")
+    # Size of the result before computing it: bits(base**n) ~ n * bits(base)
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and exponent > 0
+        and exponent * (abs(base).bit_length() - 1) > MAX_INT_BITS
+    ):
+        raise CalculatorError(f"result exceeds {MAX_INT_BITS} bits")
+    result = base**exponent
+    if isinstance(result, complex):  # a fractional power of a negative number
+        raise CalculatorError("result is not a real number")
+    return result
+
+
+def _compile(node):
+    """Turn a whitelisted AST node into a closure `f(deadline)`; anything else raises."""
+    if isinstance(node, ast.Expression):
+        return _compile(node.body)
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CalculatorError(f"unsupported constant {value!r}")
+        _check_size(value)
+        return lambda deadline: value
+    if isinstance(node, ast.Name):
+        if node.id not in CONSTANTS:
+            raise CalculatorError(f"unknown name {node.id!r}")
+        value = CONSTANTS[node.id]
+        return lambda deadline: value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op, operand = UNARY_OPERATORS[type(node.op)], _compile(node.operand)
+        return lambda deadline: op(operand(deadline))
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = _power if isinstance(node.op, ast.Pow) else BINARY_OPERATORS[type(node.op)]
+        left, right = _compile(node.left), _compile(node.right)
+
+        def binary(deadline):
+            a, b = left(deadline), right(deadline)
+            if time.perf_counter() > deadline:
+                raise CalculatorError("time limit exceeded")
+            return _check_size(op(a, b))
+
+        return binary
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        func, args = FUNCTIONS[node.func.id], [_compile(arg) for arg in node.args]
+        return lambda deadline: _check_size(func(*(arg(deadline) for arg in args)))
+    raise CalculatorError(f"unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str):
+    """Parse, whitelist and compile an expression once; cached by expression string."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculatorError(f"expression longer than {MAX_EXPRESSION_LENGTH} characters")
     try:
-        return str(eval(expression))
-    except Exception as e:
-        return f"error: {str(e)}"
\ No newline at end of file
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise CalculatorError(f"invalid expression: {e.msg}") from None
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise CalculatorError(f"expression has more than {MAX_NODES} nodes")
+    return _compile(tree)
+
+
+def evaluate(expression: str, time_limit: float = TIME_LIMIT_SECONDS):
+    """Evaluate arithmetic safely: only numbers, + - * / // % **, unary +/-, pi, e and
+    FUNCTIONS are allowed; integers are capped at MAX_INT_BITS and evaluation at
+    `time_limit` seconds. Raises CalculatorError (or ArithmeticError)."""
+    evaluator = compile_expression(expression)
+    return evaluator(time.perf_counter() + time_limit)
+
+
+def calculate(expression: str) -> str:
+    try:
+        return str(evaluate(expression))
+    except OverflowError:
+        return "error: result too large"
+    except (CalculatorError, ArithmeticError, TypeError, ValueError) as e:
+        return f"error: {e}"
+
+
+def calculate_many(expressions) -> list:
+    """calculate() over many expressions; each distinct expression is evaluated once."""
+    results = {}
+    for expression in expressions:
+        if expression not in results:
+            results[expression] = calculate(expression)
+    return [results[expression] for expression in expressions]
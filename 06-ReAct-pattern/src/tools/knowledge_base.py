@@ -1,9 +1,180 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from tools.bm25_index import BM25Index, build_index, read_meta
+
 KB = {
     "cap": "CAP theorem states that a distributed system can only guarantee two of Consistency, Availability, and Partition Tolerance."
 }
 
+KNOWLEDGE_DIR = Path(os.getenv("KNOWLEDGE_DIR", Path(__file__).parents[2] / "knowledge"))
+INDEX_DIR = Path(os.getenv("KNOWLEDGE_INDEX_DIR", KNOWLEDGE_DIR / ".index"))
+EXTENSIONS = (".md", ".txt")
+MAX_PASSAGE_WORDS = 200
+TOP_K = 3
+# How often the shared knowledge base checks knowledge/ for changed documents
+RELOAD_INTERVAL = 30.0
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def split_passages(text: str, max_words: int = MAX_PASSAGE_WORDS):
+    """Paragraphs of `text`; headings are kept with the paragraph that follows
+    them, and paragraphs longer than `max_words` are cut into windows."""
+    heading = ""
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if paragraph.startswith("#") and "\n" not in paragraph:
+            heading = f"{heading} {paragraph.lstrip('#').strip()}".strip()
+            continue
+        if heading:
+            paragraph, heading = f"{heading}: {paragraph}", ""
+        words = paragraph.split()
+        for start in range(0, len(words), max_words):
+            yield " ".join(words[start : start + max_words])
+    if heading:
+        yield heading
+
+
+def _documents(knowledge_dir: Path):
+    if not knowledge_dir.is_dir():
+        return []
+    return sorted(
+        path
+        for path in knowledge_dir.rglob("*")
+        if path.suffix in EXTENSIONS and path.is_file() and not path.name.startswith(".")
+    )
+
+
+def _fingerprint(knowledge_dir: Path, documents) -> str:
+    digest = hashlib.sha256(repr(sorted(KB.items())).encode("utf-8"))
+    digest.update(str(MAX_PASSAGE_WORDS).encode("utf-8"))
+    for path in documents:
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(knowledge_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode()
+        )
+    return digest.hexdigest()
+
+
+def _passages(knowledge_dir: Path, documents):
+    for topic, text in KB.items():
+        yield f"kb:{topic}", text
+    for path in documents:
+        source = str(path.relative_to(knowledge_dir))
+        for passage in split_passages(path.read_text(encoding="utf-8", errors="replace")):
+            yield source, passage
+
+
+class KnowledgeBase:
+    """BM25 search over the built-in KB facts plus every .md/.txt file under
+    `knowledge_dir`, split into paragraph-sized passages.
+
+    The index lives on disk in `index_dir` and is memory-mapped, so opening an
+    up-to-date index is instant. It is rebuilt only when a document is added,
+    removed or modified (compared by path, size and mtime). When `reload_interval`
+    is set, searches check for such changes at most that often; otherwise call
+    refresh(). `version` identifies the documents currently searched.
+    """
+
+    def __init__(
+        self, knowledge_dir=KNOWLEDGE_DIR, index_dir=None, reload_interval: float | None = None
+    ):
+        self.knowledge_dir = Path(knowledge_dir)
+        self.index_dir = Path(index_dir) if index_dir else self.knowledge_dir / ".index"
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self.index = self._open()
+        if reload_interval is not None:
+            self._next_check = time.monotonic() + reload_interval
+
+    def _open(self) -> BM25Index:
+        documents = _documents(self.knowledge_dir)
+        fingerprint = _fingerprint(self.knowledge_dir, documents)
+        meta = read_meta(self.index_dir)
+        if meta is not None and meta["fingerprint"] == fingerprint:
+            try:
+                return BM25Index(self.index_dir)
+            except (OSError, ValueError):  # damaged or partially deleted; rebuild it
+                pass
+        self._rebuild(documents, fingerprint)
+        return BM25Index(self.index_dir)
+
+    def _rebuild(self, documents, fingerprint: str):
+        # Build next to the live index and swap directories, so processes that have
+        # the old files mapped keep reading them instead of seeing them truncated
+        self.index_dir.parent.mkdir(parents=True, exist_ok=True)
+        building = Path(tempfile.mkdtemp(prefix=".building-", dir=self.index_dir.parent))
+        build_index(_passages(self.knowledge_dir, documents), building, fingerprint)
+        retired = None
+        if self.index_dir.exists():
+            retired = Path(tempfile.mkdtemp(prefix=".retired-", dir=self.index_dir.parent))
+            os.replace(self.index_dir, retired / "index")
+        os.replace(building, self.index_dir)
+        if retired is not None:
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def refresh(self):
+        """Pick up changed documents, rebuilding the index if needed."""
+        with self._lock:
+            self.index = self._open()
+
+    def _maybe_refresh(self):
+        if self.reload_interval is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            self.refresh()
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the indexed documents, after any due refresh."""
+        self._maybe_refresh()
+        return self.index.meta["fingerprint"]
+
+    def search(self, query: str, k: int = TOP_K) -> list:
+        self._maybe_refresh()
+        return self.index.search(query, k)
+
+    def lookup(self, topic: str, k: int = TOP_K) -> str:
+        passages = self.search(topic, k)
+        if not passages:
+            return "not found"
+        return "\n".join(passage.text for passage in passages)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_knowledge_base() -> KnowledgeBase:
+    """The shared KnowledgeBase over KNOWLEDGE_DIR, opened on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = KnowledgeBase(KNOWLEDGE_DIR, INDEX_DIR, RELOAD_INTERVAL)
+        return _default
+
+
 def lookup(topic: str) -> str:
-    return KB.get(topic.lower(), "not found")
+    return default_knowledge_base().lookup(topic)
+
+
+def knowledge_version() -> str:
+    """What lookup() answers from; register it as lookup's cache `version`."""
+    return default_knowledge_base().version
+
 
-#Tools must be pure & deterministic
-# No hidden side effects (yet)
\ No newline at end of file
+# Tools must be pure & deterministic: registries memoize tools registered with pure=True,
+# and lookup() is pure only for one version of the documents
+# No hidden side effects (yet)
@@ -0,0 +1,26 @@
+"""Shared test fixtures for ReAct pattern tests."""
+
+import pytest
+from registry.tool_cache import ToolCache
+from registry.tool_registry import ToolRegistry
+
+
+@pytest.fixture
+def tools():
+    """A ToolRegistry with its own cache, closed after the test."""
+    registry = ToolRegistry(max_workers=4, cache=ToolCache())
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path):
+    """A small document folder for the knowledge base."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "raft.md").write_text(
+        "# Raft\n\nRaft elects a leader by majority vote.\n\n"
+        "Followers replicate the leader's log entries.\n"
+    )
+    (docs / "paxos.txt").write_text("Paxos reaches consensus with proposers and acceptors.\n")
+    return docs
@@ -0,0 +1,130 @@
+"""Unit tests for the BM25 index and the knowledge base."""
+
+import math
+import random
+
+import pytest
+from tools.bm25_index import K1, B, BM25Index, build_index, tokenize
+from tools.knowledge_base import KnowledgeBase, split_passages
+
+WORDS = tokenize(
+    "raft paxos leader follower log quorum vote term commit replica partition "
+    "consistency availability latency clock lease snapshot gossip shard"
+)
+
+
+def brute_force(passages, query, k):
+    """Textbook BM25 over every passage, best first."""
+    documents = [tokenize(text) for _, text in passages]
+    average = sum(map(len, documents)) / len(documents)
+    terms = set(tokenize(query))
+    scores = []
+    for doc, tokens in enumerate(documents):
+        score = 0.0
+        for term in terms:
+            tf = tokens.count(term)
+            if not tf:
+                continue
+            df = sum(term in other for other in documents)
+            idf = math.log1p((len(documents) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(tokens) / average))
+        if score > 0:
+            scores.append((score, doc))
+    scores.sort(key=lambda pair: (-pair[0], pair[1]))
+    return scores[:k]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(7)
+    # Skewed word frequencies, so some terms are frequent enough to be pruned
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return [
+        (f"doc{i % 5}", " ".join(rng.choices(WORDS, weights, k=rng.randint(3, 40))))
+        for i in range(600)
+    ]
+
+
+@pytest.fixture(scope="module")
+def index(corpus, tmp_path_factory):
+    index_dir = tmp_path_factory.mktemp("index")
+    build_index(corpus, index_dir)
+    return BM25Index(index_dir)
+
+
+class TestBM25Index:
+    """Test suite for BM25Index against a brute-force scorer."""
+
+    @pytest.mark.parametrize(
+        "query",
+        ["raft", "raft leader", "gossip shard snapshot", "raft paxos leader follower log", "lease"],
+    )
+    @pytest.mark.parametrize("k", [1, 3, 10])
+    def test_matches_brute_force(self, corpus, index, query, k):
+        """Test that pruned search returns the exact top-k scores."""
+        expected = brute_force(corpus, query, k)
+
+        results = index.search(query, k)
+
+        assert [r.score for r in results] == pytest.approx([s for s, _ in expected], rel=1e-4)
+        # Tied scores may come back in either order; the text must still be a top passage
+        texts = {corpus[doc][1] for _, doc in brute_force(corpus, query, len(corpus))}
+        assert all(r.text in texts for r in results)
+
+    def test_unknown_and_stopword_queries(self, index):
+        """Test that queries without indexed terms return nothing."""
+        assert index.search("zebra", 3) == []
+        assert index.search("what is the", 3) == []
+        assert index.search("raft", 0) == []
+
+    def test_passage_source_and_text(self, tmp_path):
+        """Test that passages keep their text and source."""
+        build_index([("a.md", "Raft elects a leader."), ("b.md", "Paxos too.")], tmp_path)
+
+        (passage,) = BM25Index(tmp_path).search("leader", 3)
+
+        assert (passage.text, passage.source) == ("Raft elects a leader.", "a.md")
+
+    def test_empty_corpus(self, tmp_path):
+        """Test that an empty index opens and finds nothing."""
+        build_index([], tmp_path)
+
+        assert BM25Index(tmp_path).search("raft", 3) == []
+
+
+class TestKnowledgeBase:
+    """Test suite for KnowledgeBase."""
+
+    def test_split_passages_keeps_headings(self):
+        """Test that a heading is joined to the paragraph after it."""
+        text = "# Raft\n\nLeader election.\n\nLog replication."
+
+        assert list(split_passages(text)) == ["Raft: Leader election.", "Log replication."]
+
+    def test_lookup_searches_documents(self, knowledge_dir):
+        """Test lookup over the indexed folder."""
+        kb = KnowledgeBase(knowledge_dir)
+
+        assert "majority vote" in kb.lookup("raft leader election", k=1)
+        assert kb.search("acceptors", k=1)[0].source == "paxos.txt"
+        assert kb.lookup("zebra") == "not found"
+
+    def test_index_reused_until_documents_change(self, knowledge_dir):
+        """Test that the on-disk index is rebuilt only when documents change."""
+        version = KnowledgeBase(knowledge_dir).version
+        assert KnowledgeBase(knowledge_dir).version == version
+
+        (knowledge_dir / "new.md").write_text("Gossip spreads membership.\n")
+        kb = KnowledgeBase(knowledge_dir)
+
+        assert kb.version != version
+        assert kb.search("gossip", k=1)[0].source == "new.md"
+
+    def test_reload_interval_picks_up_changes(self, knowledge_dir):
+        """Test that searches see changed documents after the reload interval."""
+        kb = KnowledgeBase(knowledge_dir, reload_interval=0)
+        assert kb.lookup("gossip") == "not found"
+
+        (knowledge_dir / "new.md").write_text("Gossip spreads membership.\n")
+
+        assert "Gossip" in kb.lookup("gossip")
@@ -0,0 +1,61 @@
+"""Unit tests for the safe calculator tool."""
+
+import pytest
+from tools.calculator import calculate, calculate_many
+
+
+class TestCalculator:
+    """Test suite for calculate()."""
+
+    @pytest.mark.parametrize(
+        ("expression", "expected"),
+        [
+            ("2 + 2 * 5", "12"),
+            ("(2 + 2) * 5", "20"),
+            ("7 // 2", "3"),
+            ("7 % 4", "3"),
+            ("-3 ** 2", "-9"),
+            ("sqrt(16)", "4.0"),
+            ("max(1, 5, 3)", "5"),
+            ("round(pi, 2)", "3.14"),
+            ("2 ** 10", "1024"),
+        ],
+    )
+    def test_arithmetic(self, expression, expected):
+        """Test supported operators, functions and constants."""
+        assert calculate(expression) == expected
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "__import__('os')",
+            "open('/etc/passwd')",
+            "x + 1",
+            "(1).__class__",
+            "[1, 2]",
+            "'a' * 3",
+            "lambda: 1",
+            "sqrt(x=4)",
+        ],
+    )
+    def test_rejects_code(self, expression):
+        """Test that anything beyond arithmetic is refused, not evaluated."""
+        assert calculate(expression).startswith("error:")
+
+    @pytest.mark.parametrize(
+        "expression",
+        ["2 ** 100000", "10 ** 5000", "9" * 600, "+".join(["1"] * 300), "round(5, -1000000)"],
+    )
+    def test_rejects_expensive_expressions(self, expression):
+        """Test the size, length and exponent limits."""
+        assert calculate(expression).startswith("error:")
+
+    def test_math_errors_are_reported(self):
+        """Test that math errors become error strings."""
+        assert calculate("1 / 0") == "error: division by zero"
+        assert calculate("(-8) ** 0.5") == "error: result is not a real number"
+        assert calculate("1 +").startswith("error: invalid expression")
+
+    def test_calculate_many_keeps_order(self):
+        """Test batch evaluation with repeated expressions."""
+        assert calculate_many(["1 + 1", "2 * 3", "1 + 1"]) == ["2", "6", "2"]
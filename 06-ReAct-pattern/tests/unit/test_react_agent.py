@@ -0,0 +1,119 @@
+"""Unit tests for the native tool-calling ReActAgent."""
+
+import pytest
+from agent.react_agent import ReActAgent
+from tools.calculator import calculate
+
+
+class FakeClient:
+    """Replays scripted chat() turns and records the messages it was sent."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+
+    def chat(self, messages, tools=None, **kwargs):
+        self.requests.append({"messages": list(messages), "tools": tools, **kwargs})
+        calls = self.turns.pop(0)
+        if isinstance(calls, str):
+            return {
+                "output": calls,
+                "tool_calls": [],
+                "message": {"role": "assistant", "content": calls},
+            }
+        return {
+            "output": "",
+            "tool_calls": calls,
+            "message": {"role": "assistant", "content": None, "tool_calls": calls},
+        }
+
+
+def call(call_id, name, arguments):
+    """A parsed tool call as LLMClient.chat() returns it."""
+    return {"id": call_id, "name": name, "arguments": arguments}
+
+
+@pytest.fixture
+def agent_tools(tools):
+    """The registry with the calculator tool."""
+    tools.register("calculator", "Evaluate arithmetic", calculate, pure=True)
+    return tools
+
+
+class TestReActAgent:
+    """Test suite for the agent loop."""
+
+    def test_answer_without_tools(self, agent_tools):
+        """Test that a reply without tool calls ends the run."""
+        client = FakeClient(["Paris"])
+
+        answer = ReActAgent(client, agent_tools).run("Capital of France?")
+
+        assert answer == "Paris"
+        assert client.requests[0]["tools"] == agent_tools.schemas()
+
+    def test_parallel_calls_become_tool_messages(self, agent_tools):
+        """Test that one turn's calls are answered in order by their ids."""
+        client = FakeClient(
+            [
+                [
+                    call("a", "calculator", {"expression": "2 + 3"}),
+                    call("b", "calculator", {"expression": "6 * 7"}),
+                ],
+                "5 and 42",
+            ]
+        )
+        agent = ReActAgent(client, agent_tools)
+
+        answer = agent.run("2 + 3 and 6 * 7?")
+
+        messages = client.requests[1]["messages"]
+        assert answer == "5 and 42"
+        assert messages[2]["role"] == "assistant"
+        assert messages[3:] == [
+            {"role": "tool", "tool_call_id": "a", "content": "5"},
+            {"role": "tool", "tool_call_id": "b", "content": "42"},
+        ]
+        assert [(step, name) for step, name, _, _ in agent.trace] == [
+            (0, "calculator"),
+            (0, "calculator"),
+        ]
+
+    def test_invalid_arguments_and_failures_are_observations(self, agent_tools):
+        """Test that bad arguments and unknown tools are reported back to the model."""
+        client = FakeClient(
+            [
+                [
+                    call("a", "calculator", None),
+                    call("b", "search", {"query": "x"}),
+                    call("c", "calculator", {"expression": "1 / 0"}),
+                ],
+                "done",
+            ]
+        )
+
+        ReActAgent(client, agent_tools).run("?")
+
+        contents = [m["content"] for m in client.requests[1]["messages"][3:]]
+        assert contents == [
+            "Error: arguments are not valid JSON",
+            "Error: unknown tool 'search'",
+            "error: division by zero",
+        ]
+
+    def test_max_steps(self, agent_tools):
+        """Test that the run stops after max_steps model turns."""
+        client = FakeClient([[call(str(i), "calculator", {"expression": "1"})] for i in range(3)])
+
+        answer = ReActAgent(client, agent_tools, max_steps=3).run("loop")
+
+        assert answer == "Max steps exceeded"
+        assert len(client.requests) == 3
+
+    def test_model_and_settings_passed(self, agent_tools):
+        """Test that the configured model is used for every turn."""
+        client = FakeClient(["ok"])
+
+        ReActAgent(client, agent_tools, model="test-model").run("hi")
+
+        assert client.requests[0]["model"] == "test-model"
@@ -0,0 +1,121 @@
+"""Unit tests for ToolCache and call keys."""
+
+import time
+from concurrent.futures import Future
+
+from registry.tool_cache import ToolCache, call_key
+
+
+def lookup(query: str, k: int = 3):
+    """A stand-in tool."""
+    return query, k
+
+
+class TestCallKey:
+    """Test suite for call_key()."""
+
+    def test_equivalent_calls_share_a_key(self):
+        """Test that positional, keyword and default arguments are normalised."""
+        keys = {
+            call_key(lookup, ("raft",), {}),
+            call_key(lookup, (), {"query": "raft"}),
+            call_key(lookup, ("raft",), {"k": 3}),
+            call_key(lookup, (), {"k": 3, "query": "raft"}),
+        }
+
+        assert len(keys) == 1
+
+    def test_different_calls_differ(self):
+        """Test that arguments and versions distinguish keys."""
+        assert call_key(lookup, ("raft",), {}) != call_key(lookup, ("raft",), {"k": 4})
+        assert call_key(lookup, ("raft",), {}, 1) != call_key(lookup, ("raft",), {}, 2)
+
+    def test_uncacheable_calls(self):
+        """Test that unhashable arguments and calls that cannot bind have no key."""
+        assert call_key(lookup, (["raft"],), {}) is None
+        assert call_key(lookup, (), {"q": "raft"}) is None
+
+    def test_function_without_signature(self):
+        """Test that builtins without a signature are keyed on raw arguments."""
+        assert call_key(vars, (1,), {}) == (vars, None, (1,), ())
+
+
+class TestToolCache:
+    """Test suite for ToolCache."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ToolCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        cache.put("c", 3)
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Test that an entry past its ttl is a miss."""
+        cache = ToolCache()
+        cache.put("short", 1, ttl=0.01)
+        cache.put("forever", 2)
+
+        time.sleep(0.02)
+
+        assert cache.get("short") is None
+        assert cache.get("forever") == 2
+
+    def test_get_or_start(self):
+        """Test started, joined and cached lookups and the stats they count."""
+        cache = ToolCache()
+        future = Future()
+
+        started = cache.get_or_start("key", None, lambda: future)
+        joined = cache.get_or_start("key", None, Future)
+        future.set_result("value")
+        cached = cache.get_or_start("key", None, Future)
+
+        assert started == ("started", future)
+        assert joined == ("joined", future)
+        assert cached == ("cached", "value")
+        assert cache.stats() == {
+            "size": 1,
+            "hits": 1,
+            "misses": 1,
+            "joined": 1,
+            "hit_rate": 2 / 3,
+        }
+
+    def test_failures_not_stored(self):
+        """Test that a failed call leaves nothing behind."""
+        cache = ToolCache()
+        future = Future()
+        cache.get_or_start("key", None, lambda: future)
+
+        future.set_exception(RuntimeError("boom"))
+
+        assert cache.get_or_start("key", None, Future)[0] == "started"
+        assert len(cache) == 0
+
+    def test_abandon(self):
+        """Test that an abandoned call is not joined but its result is stored."""
+        cache = ToolCache()
+        slow = Future()
+        cache.get_or_start("key", None, lambda: slow)
+
+        cache.abandon("key", slow)
+        status, _ = cache.get_or_start("key", None, Future)
+        slow.set_result("late")
+
+        assert status == "started"
+        assert cache.get("key") == "late"
+
+    def test_clear(self):
+        """Test that clear() empties the cache."""
+        cache = ToolCache()
+        cache.put("a", 1)
+
+        cache.clear()
+
+        assert cache.get("a") is None
@@ -0,0 +1,270 @@
+"""Unit tests for ToolRegistry executors, timeouts and caching."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from registry.tool_registry import ToolRegistry, parameters_schema
+
+
+# Module-level, so the process executor can pickle them
+def square(x: int) -> int:
+    """A pure tool."""
+    return x * x
+
+
+def sleep_then_return(seconds: float) -> float:
+    """A tool that takes `seconds` to answer."""
+    time.sleep(seconds)
+    return seconds
+
+
+def fail(message: str):
+    """A tool that always raises."""
+    raise RuntimeError(message)
+
+
+async def async_sleep(seconds: float) -> float:
+    """An async tool that takes `seconds` to answer."""
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+class TestInvoke:
+    """Test suite for invoke() and invoke_many()."""
+
+    def test_ok_result(self, tools):
+        """Test a successful call and its observation."""
+        tools.register("square", "Square a number", square)
+
+        result = tools.invoke("square", 7)
+
+        assert (result.status, result.output, result.observation) == ("ok", 49, "49")
+        assert result.ok
+
+    def test_errors_are_results(self, tools):
+        """Test that failing and unknown tools return errors instead of raising."""
+        tools.register("fail", "Always fails", fail)
+
+        failed = tools.invoke("fail", "boom")
+        unknown = tools.invoke("missing")
+
+        assert failed.status == "error"
+        assert failed.observation == "Error: RuntimeError: boom"
+        assert unknown.error == "unknown tool 'missing'"
+
+    def test_invoke_many_runs_concurrently_in_order(self, tools):
+        """Test that independent calls overlap and keep call order."""
+        tools.register("sleep", "Sleep", sleep_then_return)
+        started = time.perf_counter()
+
+        results = tools.invoke_many([("sleep", 0.3), ("sleep", {"seconds": 0.2}), ("sleep", 0.1)])
+
+        assert [r.output for r in results] == [0.3, 0.2, 0.1]
+        assert time.perf_counter() - started < 0.55
+
+    def test_stats(self, tools):
+        """Test per-tool counts of calls, errors and timeouts."""
+        tools.register("fail", "Always fails", fail)
+        tools.register("sleep", "Sleep", sleep_then_return, timeout=0.05)
+
+        tools.invoke("fail", "x")
+        tools.invoke("sleep", 0.2)
+
+        stats = tools.stats()
+        assert stats["fail"]["errors"] == 1
+        assert stats["sleep"]["timeouts"] == 1
+        assert stats["sleep"]["calls"] == 1
+
+
+class TestTimeouts:
+    """Test suite for timeouts on each executor."""
+
+    def test_thread_timeout(self, tools):
+        """Test that a caller stops waiting for a slow thread tool."""
+        tools.register("sleep", "Sleep", sleep_then_return, timeout=0.1)
+        started = time.perf_counter()
+
+        result = tools.invoke("sleep", 1.0)
+
+        assert result.status == "timeout"
+        assert result.error == "timed out after 0.1s"
+        assert time.perf_counter() - started < 0.5
+
+    def test_timeout_includes_queueing(self, tools):
+        """Test that time spent behind max_concurrency counts towards the timeout."""
+        tools.register("sleep", "Sleep", sleep_then_return, timeout=0.3, max_concurrency=1)
+
+        first, second = tools.invoke_many([("sleep", 0.2), ("sleep", 0.2)])
+
+        assert first.status == "ok"
+        assert second.status == "timeout"
+
+    def test_async_timeout_cancels_call(self, tools):
+        """Test that a timed-out async call is cancelled on the loop."""
+        tools.register("sleep", "Sleep", async_sleep, timeout=0.1)
+
+        assert tools.get("sleep")["executor"] == "async"
+        assert tools.invoke("sleep", 5.0).status == "timeout"
+        assert tools.invoke("sleep", 0.01).output == 0.01
+
+    def test_process_timeout_replaces_pool(self, tools):
+        """Test that a hung process tool is killed and the next call gets a new pool."""
+        tools.register(
+            "sleep", "Sleep", sleep_then_return, timeout=0.5, executor="process", max_concurrency=1
+        )
+        assert tools.invoke("sleep", 0.01).output == 0.01
+
+        assert tools.invoke("sleep", 30.0).status == "timeout"
+        result = tools.invoke("sleep", 0.01)
+
+        assert result.status == "ok"
+
+    def test_executor_validation(self, tools):
+        """Test that impossible executor settings are rejected at registration."""
+        with pytest.raises(ValueError, match="executor must be one of"):
+            tools.register("square", "Square", square, executor="fiber")
+        with pytest.raises(ValueError, match="not `async def`"):
+            tools.register("square", "Square", square, executor="async")
+        with pytest.raises(ValueError, match="not pure"):
+            tools.register("square", "Square", square, ttl=10)
+
+
+class TestPureTools:
+    """Test suite for memoized pure tools."""
+
+    def test_results_cached_on_bound_arguments(self, tools):
+        """Test that equivalent calls share one cache entry."""
+        calls = []
+
+        def power(x: int, exponent: int = 2) -> int:
+            calls.append(x)
+            return x**exponent
+
+        tools.register("power", "Power", power, pure=True)
+
+        results = [
+            tools.invoke("power", 3),
+            tools.invoke("power", x=3),
+            tools.invoke("power", 3, exponent=2),
+        ]
+
+        assert [r.output for r in results] == [9, 9, 9]
+        assert [r.status for r in results] == ["ok", "cached", "cached"]
+        assert calls == [3]
+
+    def test_concurrent_misses_join_one_call(self, tools):
+        """Test that identical calls in flight run the tool once."""
+        calls = []
+
+        def slow(x: int) -> int:
+            calls.append(x)
+            time.sleep(0.1)
+            return x
+
+        tools.register("slow", "Slow", slow, pure=True)
+
+        results = tools.invoke_many([("slow", 1)] * 4)
+
+        assert [r.output for r in results] == [1] * 4
+        assert calls == [1]
+        assert tools.cache.stats()["joined"] == 3
+
+    def test_errors_not_cached(self, tools):
+        """Test that a failed pure call is retried."""
+        attempts = []
+
+        def flaky(x: int) -> int:
+            attempts.append(x)
+            if len(attempts) == 1:
+                raise RuntimeError("first call fails")
+            return x
+
+        tools.register("flaky", "Flaky", flaky, pure=True)
+
+        assert tools.invoke("flaky", 1).status == "error"
+        assert tools.invoke("flaky", 1).status == "ok"
+        assert tools.invoke("flaky", 1).status == "cached"
+
+    def test_version_change_misses(self, tools):
+        """Test that results are keyed on the tool's version."""
+        state = {"version": 1}
+        tools.register("square", "Square", square, pure=True, version=lambda: state["version"])
+
+        tools.invoke("square", 4)
+        cached = tools.invoke("square", 4)
+        state["version"] = 2
+        fresh = tools.invoke("square", 4)
+
+        assert (cached.status, fresh.status) == ("cached", "ok")
+
+    def test_failing_version_is_an_error(self, tools):
+        """Test that a version callable that raises is reported, not raised."""
+
+        def version():
+            raise OSError("index missing")
+
+        tools.register("square", "Square", square, pure=True, version=version)
+
+        assert tools.invoke("square", 2).observation == "Error: OSError: index missing"
+
+    def test_late_result_after_timeout_is_cached(self, tools):
+        """Test that a timed-out pure call is not joined again, but its result is kept."""
+        release = threading.Event()
+
+        def blocked(x: int) -> int:
+            release.wait(5)
+            return x
+
+        tools.register("blocked", "Blocked", blocked, pure=True, timeout=0.05)
+
+        assert tools.invoke("blocked", 1).status == "timeout"
+        release.set()
+        time.sleep(0.05)
+
+        assert tools.invoke("blocked", 1).status == "cached"
+
+
+class TestSchemas:
+    """Test suite for native tool-calling schemas."""
+
+    def test_parameters_from_signature(self):
+        """Test that annotations map to JSON types and defaults are optional."""
+
+        def tool(query, k: int = 3, *rest, strict: bool = False, **options):
+            return query
+
+        assert parameters_schema(tool) == {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string"},
+                "k": {"type": "integer"},
+                "strict": {"type": "boolean"},
+            },
+            "required": ["query"],
+        }
+
+    def test_schemas(self, tools):
+        """Test the function definitions handed to the model."""
+        parameters = {"type": "object", "properties": {"x": {"type": "number"}}}
+        tools.register("square", "Square a number", square, parameters=parameters)
+
+        assert tools.schemas() == [
+            {
+                "type": "function",
+                "function": {
+                    "name": "square",
+                    "description": "Square a number",
+                    "parameters": parameters,
+                },
+            }
+        ]
+
+    def test_registry_as_context_manager(self):
+        """Test that leaving the block closes the pools."""
+        with ToolRegistry() as registry:
+            registry.register("square", "Square", square)
+            assert registry.invoke("square", 3).output == 9
+
+        assert registry._shared_pool is None
@@ -32,7 +32,8 @@ class AgentLoop:
             if not tool:
                 return f"Error : Unknown tool {tool_name}"
             
-            observation = tool["func"](tool_input)
+            # Runs under the tool's timeout; failures come back as an observation
+            observation = self.tools.invoke(tool_name, tool_input).observation
 
             context += f"""
                 {response}
@@ -1,7 +1,7 @@
 from client.llm_client import LLMClient
 from agent.agent_loop import AgentLoop
 from tools.calculator import calculate
-from tools.knowledge_base import lookup
+from tools.knowledge_base import knowledge_version, lookup
 from registry.tool_registry import ToolRegistry
 
 if __name__ == "__main__":
@@ -10,13 +10,16 @@ if __name__ == "__main__":
     tools.register(
         name="calculator",
         description="Evaluate mathematical expressions",
-        fn=calculate
+        fn=calculate,
+        pure=True
     )
 
     tools.register(
         name="knowledge_base",
         description="Lookup basic distributed systems knowledge",
-        fn=lookup
+        fn=lookup,
+        pure=True,
+        version=knowledge_version
     )
 
     agent = AgentLoop(client, tools, max_steps=5)
@@ -27,7 +27,7 @@ class MemoryAgentLoop:
             tool = self.tools.get(tool_name)
             if not tool:
                 continue
-            observation = tool["func"](**tool_input)
+            observation = self.tools.invoke(tool_name, tool_input).observation
             self.memory.stm.add(
                 thought=response,
                 action=f"{tool_name}[{tool_input}]",
@@ -5,14 +5,14 @@ from memory.long_term_memory import LongTermMemory
 from memory.memory_manager import MemoryManager
 from agent.memory_agent_loop import MemoryAgentLoop
 from tools.calculator import calculate
-from tools.knowledge_base import lookup
+from tools.knowledge_base import knowledge_version, lookup
 
 if __name__ == "__main__":
     client = LLMClient()
     tools = ToolRegistry()
 
-    tools.register("calculator", "Math calculation", calculate)
-    tools.register("knowledge_base", "CAP theorem lookup", lookup)
+    tools.register("calculator", "Math calculation", calculate, pure=True)
+    tools.register("knowledge_base", "CAP theorem lookup", lookup, pure=True, version=knowledge_version)
 
     stm = ShortTermMemory()
     ltm = LongTermMemory()
@@ -20,7 +20,7 @@ if __name__ == "__main__":
     ltm.store("CAP theorem involves Consistency, Availability, and Partition tolerance.")
 
     memory = MemoryManager(stm, ltm)
-    agent = MemoryAgentLoop(client, tools.list_tools(), memory)
+    agent = MemoryAgentLoop(client, tools, memory)
 
     result = agent.run("Calculate 6*7 and explain CAP theorem?")
     print(result)
@@ -9,12 +9,15 @@ class ExecutorAgent:
             tool = self.tools.get(step['action'])
             if not tool:
                 raise Exception(f"Unknown tool: {step['action']}")
-            
-            output = tool["func"](step['input'])
+
+        # Steps only depend on the plan, not on each other's output, so they run concurrently
+        outputs = self.tools.invoke_many([(step['action'], step['input']) for step in plan['steps']])
+        for step, output in zip(plan['steps'], outputs):
             results.append({
                 "step_id": step['id'],
                 "action": step['action'],
                 "input": step['input'],
-                "output": output
+                "output": output.observation,
+                "latency_ms": round(output.latency_ms, 3)
             })
         return results
\ No newline at end of file
@@ -4,14 +4,14 @@ from executor.executor_agent import ExecutorAgent
 from workflow.workflow_agent import WorkflowEngine
 from registry.tool_registry import ToolRegistry
 from tools.calculator import calculate
-from tools.knowledge_base import lookup
+from tools.knowledge_base import knowledge_version, lookup
 
 if __name__ == "__main__":
     llm_client = LLMClient()
     tools_registry = ToolRegistry()
    
-    tools_registry.register("calculator","Math Calculation", calculate)
-    tools_registry.register("knowledge_base", "CAP theorem Lookup", lookup)
+    tools_registry.register("calculator","Math Calculation", calculate, pure=True)
+    tools_registry.register("knowledge_base", "CAP theorem Lookup", lookup, pure=True, version=knowledge_version)
     print(f"Tools registered")
  
     planner = PlannerAgent(llm_client, tools_registry)
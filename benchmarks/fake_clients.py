@@ -0,0 +1,52 @@
+"""Fake LLM clients for benchmarking framework overhead without network calls."""
+
+import threading
+import time
+
+USAGE = {"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70}
+
+
+class ZeroLatencyClient:
+    """Returns immediately, so any measured time is framework overhead."""
+
+    def __init__(self, output: str = "Consistency, availability and partition tolerance."):
+        self.output = output
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def execute(self, request):
+        with self._lock:
+            self.calls += 1
+        return {"output": self.output, "usage": USAGE, "latency_ms": 0.0, "model": request.model}
+
+
+class FixedLatencyClient(ZeroLatencyClient):
+    """Sleeps a fixed time per call, like an I/O-bound provider round trip."""
+
+    def __init__(self, latency_ms: float, output: str = "I don't know."):
+        super().__init__(output)
+        self.latency_s = latency_ms / 1000
+
+    def execute(self, request):
+        time.sleep(self.latency_s)
+        response = super().execute(request)
+        response["latency_ms"] = self.latency_s * 1000
+        return response
+
+
+class ScriptedAgentClient(ZeroLatencyClient):
+    """Replays an Action step then a Final answer, for agent loop benchmarks."""
+
+    def __init__(self, steps_before_final: int = 2):
+        super().__init__()
+        self.steps_before_final = steps_before_final
+        self._step = 0
+
+    def execute(self, request):
+        response = super().execute(request)
+        self._step += 1
+        if self._step % (self.steps_before_final + 1) == 0:
+            response["output"] = "Thought: done\nFinal: 42"
+        else:
+            response["output"] = "Thought: compute\nAction: calculator[6 * 7]"
+        return response
@@ -0,0 +1,280 @@
+"""Benchmark framework overhead and throughput of the evaluation runners and agent loops.
+
+Runs against zero-latency and fixed-latency fake clients, so results measure
+our code rather than the provider. Writes a JSON report that can be compared
+against a previous commit's report:
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Runs as a script, so its own directory is already on sys.path
+from fake_clients import FixedLatencyClient, ScriptedAgentClient, ZeroLatencyClient
+
+ROOT = Path(__file__).resolve().parent.parent
+PROJECT_SRCS = [
+    "03-prompt-evaluation",
+    "04-hallucination-lab",
+    "06-ReAct-pattern",
+    "07-agent-loop-and-multistep-planning",
+    "02-prompt-registry",
+    "01-llm-playground",
+]
+for project in reversed(PROJECT_SRCS):
+    sys.path.insert(0, str(ROOT / project / "src"))
+# Settings require a key at import time; fake clients never use it
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-no-network")
+
+# Metrics where a larger value is a regression; all others regress when they shrink
+LOWER_IS_BETTER = (
+    "overhead_us_per_case",
+    "bytes_per_case",
+    "peak_bytes",
+    "us_per_step",
+    "seconds",
+)
+
+
+class StaticRegistry:
+    def __init__(self, prompts: dict):
+        self.prompts = prompts
+
+    def load(self, prompt_name, version):
+        return self.prompts[version]
+
+
+def make_eval_runner(client, max_concurrency: int):
+    from renderer.prompt_renderer import PromptRenderer
+    from runner.evaluation_runner import EvaluationRunner
+
+    prompt = {
+        "system_prompt": "You are a precise assistant.",
+        "user_prompt": "Explain the CAP theorem in {{format}} format.",
+        "model-defaults": {"temperature": 0.2, "max_tokens": 150},
+    }
+    registry = StaticRegistry({"v1": prompt, "v2": dict(prompt)})
+    return EvaluationRunner(
+        registry, PromptRenderer(registry), client=client, max_concurrency=max_concurrency
+    )
+
+
+def make_dataset(n_cases: int) -> dict:
+    return {
+        "task": "benchmark",
+        "cases": [
+            {
+                "id": f"case_{i:06d}",
+                "input": {"format": f"{i % 7 + 1} bullet points"},
+                "expected_traits": ["mentions consistency", "concise"],
+            }
+            for i in range(n_cases)
+        ],
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds (least noisy estimate)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_eval_overhead(n_cases: int, repeat: int) -> dict:
+    dataset = make_dataset(n_cases)
+    results = {}
+    for concurrency in (1, 8):
+        runner = make_eval_runner(ZeroLatencyClient(), concurrency)
+        seconds = timed(lambda runner=runner: runner.run("p", ["v1", "v2"], dataset), repeat)
+        results[f"concurrency_{concurrency}"] = {
+            "cases": 2 * n_cases,
+            "seconds": seconds,
+            "overhead_us_per_case": seconds / (2 * n_cases) * 1e6,
+        }
+    return results
+
+
+def bench_eval_throughput(n_cases: int, latency_ms: float, levels) -> dict:
+    dataset = make_dataset(n_cases)
+    results = {}
+    for concurrency in levels:
+        runner = make_eval_runner(FixedLatencyClient(latency_ms), concurrency)
+        seconds = timed(lambda runner=runner: runner.run("p", ["v1", "v2"], dataset), 1)
+        throughput = 2 * n_cases / seconds
+        ideal = min(concurrency, 2 * n_cases) * 1000 / latency_ms
+        results[f"concurrency_{concurrency}"] = {
+            "cases_per_second": throughput,
+            "efficiency": throughput / ideal,
+        }
+    return results
+
+
+def bench_eval_memory(n_cases: int) -> dict:
+    dataset = make_dataset(n_cases)
+    runner = make_eval_runner(ZeroLatencyClient(), 8)
+    tracemalloc.start()
+    runner.run("p", ["v1", "v2"], dataset)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_bytes": peak, "bytes_per_case": peak / (2 * n_cases)}
+
+
+def bench_failure_runner(n_cases: int, repeat: int, latency_ms: float) -> dict:
+    from runner.failure_runner import FailureRunner
+
+    dataset = {
+        "category": "benchmark",
+        "cases": [{"id": f"h_{i}", "input": {"question": f"Q{i}?"}} for i in range(n_cases)],
+    }
+    zero = FailureRunner(ZeroLatencyClient())
+    seconds = timed(lambda: zero.run("system", dataset), repeat)
+    slow_cases = max(1, n_cases // 20)
+    slow_dataset = {"category": "benchmark", "cases": dataset["cases"][:slow_cases]}
+    slow = FailureRunner(FixedLatencyClient(latency_ms))
+    slow_seconds = timed(lambda: slow.run("system", slow_dataset), 1)
+    sampled = FailureRunner(FixedLatencyClient(latency_ms), samples=5)
+    sampled_seconds = timed(lambda: sampled.run("system", slow_dataset), 1)
+    return {
+        "overhead_us_per_case": seconds / n_cases * 1e6,
+        "fixed_latency": {"cases_per_second": slow_cases / slow_seconds},
+        "five_samples": {"cases_per_second": slow_cases / sampled_seconds},
+    }
+
+
+def bench_agent_loop(n_runs: int, repeat: int) -> dict:
+    from agent.agent_loop import AgentLoop
+    from registry.tool_registry import ToolRegistry
+    from tools.calculator import calculate
+
+    tools = ToolRegistry()
+    tools.register(name="calculator", description="Evaluate math", fn=calculate)
+    client = ScriptedAgentClient(steps_before_final=2)
+    agent = AgentLoop(client, tools, max_steps=5)
+
+    def run_all():
+        for _ in range(n_runs):
+            agent.run("What is 6 * 7?")
+
+    seconds = timed(run_all, repeat)
+    steps = n_runs * 3
+    return {"steps": steps, "us_per_step": seconds / steps * 1e6}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Return (metric, old, new, change) rows that regressed by more than `threshold`."""
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    regressions = []
+    for metric in sorted(old.keys() & new.keys()):
+        if not old[metric]:
+            continue
+        change = (new[metric] - old[metric]) / old[metric]
+        worse = change > threshold if metric.endswith(LOWER_IS_BETTER) else change < -threshold
+        marker = "REGRESSION" if worse else ""
+        print(f"{metric:70s} {old[metric]:14.2f} -> {new[metric]:14.2f} {change:+7.1%} {marker}")
+        if worse:
+            regressions.append((metric, old[metric], new[metric], change))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000, help="cases for overhead runs")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake provider latency")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N repetitions")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32],
+        help="concurrency levels for the throughput sweep",
+    )
+    parser.add_argument("--output", help="report path (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="previous report to diff against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="relative change counted as a regression"
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="exit 1 if any metric regressed"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    commit = git_commit()
+    benchmarks = {
+        "evaluation_overhead": lambda: bench_eval_overhead(args.cases, args.repeat),
+        "evaluation_throughput": lambda: bench_eval_throughput(
+            max(args.concurrency) * 4, args.latency_ms, args.concurrency
+        ),
+        "evaluation_memory": lambda: bench_eval_memory(args.cases),
+        "failure_runner": lambda: bench_failure_runner(args.cases, args.repeat, args.latency_ms),
+        "agent_loop": lambda: bench_agent_loop(max(1, args.cases // 10), args.repeat),
+    }
+    results = {}
+    for name, bench in benchmarks.items():
+        start = time.perf_counter()
+        results[name] = bench()
+        print(f"{name}: {time.perf_counter() - start:.2f}s")
+        print(json.dumps(results[name], indent=2))
+
+    report = {
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": vars(args),
+        "results": results,
+    }
+    output = Path(args.output or Path(__file__).parent / "results" / f"{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Saved {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nComparing against {baseline['commit']} (threshold {args.threshold:.0%})")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
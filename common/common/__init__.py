@@ -1,5 +1,6 @@
 """Common utilities for LLM Engineering Lab"""
 
-from .env.env_loader import load_env
+from .dataset_loader import Dataset, shard_of
+from .keyword_trie import KeywordTrie
 
-__all__ = ["load_env"]
+__all__ = ["Dataset", "KeywordTrie", "shard_of"]
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from itertools import islice
+from pathlib import Path
+
+import yaml
+
+# libyaml is several times faster; fall back to the pure-Python loader without it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+METADATA_KEY = "__metadata__"
+
+
+def shard_of(case_id: str, num_shards: int) -> int:
+    """Deterministic shard for a case id, identical across processes and hosts.
+
+    Uses sha1 rather than hash(), which is salted per interpreter.
+    """
+    digest = hashlib.sha1(str(case_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def _unit_interval(seed: int, case_id: str) -> float:
+    digest = hashlib.sha1(f"{seed}:{case_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+class Dataset:
+    """Lazily iterated evaluation dataset.
+
+    Sources:
+        *.jsonl           one case per line; an optional first line
+                          {"__metadata__": {...}} carries task/category fields
+        *.yaml / *.yml    either the classic single document with a `cases`
+                          list, or multi-document YAML with one case per document
+
+    YAML is parsed once with the C loader when available and converted to a
+    JSONL cache next to the source (keyed by path, size and mtime), so later
+    loads stream line by line. filter/sample/shard/take compose lazily and never
+    materialize the dataset. Cases without an `id` get their source position.
+
+    Supports the dict-style access the runners use: dataset["cases"],
+    dataset["category"], dataset.get("task").
+    """
+
+    def __init__(self, path, cache_dir=None, transforms=()):
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.path.parent / ".dataset_cache"
+        self.transforms = tuple(transforms)
+        self._metadata = None
+
+    # -- composition ---------------------------------------------------------
+
+    def _with(self, transform) -> "Dataset":
+        return Dataset(self.path, self.cache_dir, self.transforms + (transform,))
+
+    def filter(self, predicate) -> "Dataset":
+        return self._with(("filter", predicate))
+
+    def sample(self, fraction: float, seed: int = 0) -> "Dataset":
+        """Deterministic Bernoulli sample: a case is kept iff hash(seed, id) < fraction."""
+        return self._with(("sample", (fraction, seed)))
+
+    def shard(self, index: int, count: int) -> "Dataset":
+        return self._with(("shard", (index, count)))
+
+    def take(self, n: int) -> "Dataset":
+        return self._with(("take", n))
+
+    # -- iteration -----------------------------------------------------------
+
+    def __iter__(self):
+        cases = self._source_cases()
+        for kind, arg in self.transforms:
+            cases = self._apply(cases, kind, arg)
+        return iter(cases)
+
+    @staticmethod
+    def _apply(cases, kind, arg):
+        if kind == "filter":
+            return (case for case in cases if arg(case))
+        if kind == "sample":
+            fraction, seed = arg
+            return (case for case in cases if _unit_interval(seed, case["id"]) < fraction)
+        if kind == "shard":
+            index, count = arg
+            return (case for case in cases if shard_of(case["id"], count) == index)
+        if kind == "take":
+            return islice(cases, arg)
+        raise ValueError(f"Unknown dataset transform {kind}")
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __getitem__(self, key):
+        if key == "cases":
+            return self
+        return self.metadata[key]
+
+    def __contains__(self, key):
+        return key == "cases" or key in self.metadata
+
+    def get(self, key, default=None):
+        if key == "cases":
+            return self
+        return self.metadata.get(key, default)
+
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            self._metadata = self._read_metadata()
+        return self._metadata
+
+    # -- sources -------------------------------------------------------------
+
+    def _source_cases(self):
+        path = self._jsonl_path()
+        with open(path, "r", encoding="utf-8") as f:
+            index = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if METADATA_KEY in record:
+                    continue
+                record.setdefault("id", str(index))
+                index += 1
+                yield record
+
+    def _read_metadata(self) -> dict:
+        with open(self._jsonl_path(), "r", encoding="utf-8") as f:
+            first = f.readline()
+        record = json.loads(first) if first.strip() else {}
+        return record.get(METADATA_KEY, {})
+
+    def _jsonl_path(self) -> Path:
+        if self.path.suffix == ".jsonl":
+            return self.path
+        stat = self.path.stat()
+        fingerprint = f"{self.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+        cached = self.cache_dir / f"{self.path.stem}-{digest}.jsonl"
+        if not cached.exists():
+            self._convert_yaml(cached)
+        return cached
+
+    def _convert_yaml(self, target: Path):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {}
+        # Cases stream to a side file first; metadata can only be written once complete
+        fd, cases_path = tempfile.mkstemp(dir=target.parent, suffix=".cases")
+        with os.fdopen(fd, "w", encoding="utf-8") as cases_out, open(self.path, "r") as f:
+            for document in yaml.load_all(f, Loader=YAML_LOADER):
+                if not isinstance(document, dict):
+                    continue
+                if "cases" in document or "input" not in document:
+                    metadata.update({k: v for k, v in document.items() if k != "cases"})
+                    for case in document.get("cases") or []:
+                        cases_out.write(json.dumps(case, default=str) + "\n")
+                else:
+                    cases_out.write(json.dumps(document, default=str) + "\n")
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as out, open(cases_path, "r") as cases_in:
+            out.write(json.dumps({METADATA_KEY: metadata}, default=str) + "\n")
+            shutil.copyfileobj(cases_in, out)
+        os.remove(cases_path)
+        os.replace(tmp_path, target)
@@ -0,0 +1,62 @@
+import re
+
+
+def build_trie(keywords) -> dict:
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = keyword
+    return trie
+
+
+def trie_pattern(node: dict) -> str:
+    """Serialize a trie into a regex, so shared prefixes are tried once."""
+    branches = [
+        re.escape(char) + trie_pattern(child) for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if "" not in node and len(branches) == 1:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if "" in node else group
+
+
+class KeywordTrie:
+    """Finds every occurrence of many keywords in one scan, overlapping ones included.
+
+    The keywords share one prefix trie, compiled to a single regex that finds
+    candidate start positions; the trie is then walked from each start to collect
+    every keyword ending there. Matching is case-sensitive: pass lowercase
+    keywords and text for case-insensitive matching.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self._trie = build_trie(self.keywords)
+        self._scan = re.compile(trie_pattern(self._trie)) if self._trie else None
+        self.max_length = max(map(len, self.keywords), default=0)
+
+    def find_all(self, text: str, start: int = 0):
+        """(keyword, start, end) for every occurrence starting at `start` or later,
+        by start then end."""
+        if self._scan is None:
+            return
+        # Resume one character after each hit rather than after its end, so
+        # overlapping keywords are found; unlike a lookahead, search() keeps the
+        # regex engine's first-character skip
+        position = start
+        while (hit := self._scan.search(text, position)) is not None:
+            yield from self._walk(text, hit.start())
+            position = hit.start() + 1
+
+    def _walk(self, text: str, start: int):
+        node = self._trie
+        for position in range(start, len(text)):
+            node = node.get(text[position])
+            if node is None:
+                return
+            if "" in node:
+                yield node[""], start, position + 1